@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Limiter
+============================
+
+AIMD (additive increase, multiplicative decrease) limit on the number of
+Microsoft Graph requests in flight, shared by every worker thread.
+
+Graph does not publish a fixed rate limit; it throttles with 429 Too Many
+Requests or 503 Service Unavailable plus a Retry-After header once a tenant
+or app pushes too hard. The limiter probes for the highest parallelism the
+tenant allows:
+
+- every limit's worth of healthy responses raises the limit by one
+- a throttling response halves the limit (at most once per cooldown, so a
+  burst of 429s from requests already in flight counts as one signal) and
+  holds every new request until Retry-After has passed
+
+Author: AI Governance Team
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """Thread-safe AIMD limit on concurrent requests."""
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 32,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial: Concurrent requests allowed at start
+            minimum: Lowest the limit may fall to
+            maximum: Highest the limit may grow to
+            decrease_factor: Multiplier applied to the limit on throttling
+            cooldown: Seconds after a decrease during which further throttling
+                signals do not decrease the limit again
+            clock: Monotonic time source, injectable for tests
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.throttle_count = 0
+        self._last_decrease: Optional[float] = None
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent, then count it as in flight."""
+        with self._condition:
+            while True:
+                wait_time = self.blocked_until - self.clock()
+                if wait_time <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._condition.wait(timeout=wait_time if wait_time > 0 else None)
+
+    def release(self, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Mark a request as finished and adjust the limit.
+
+        Args:
+            throttled: The response was a 429/503 throttling signal
+            retry_after: Seconds the server asked us to wait, if any
+        """
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            if throttled:
+                self._on_throttled(retry_after)
+            elif self.limit < self.maximum:
+                # +1 per limit's worth of healthy responses (about one round trip)
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a throttling signal that did not come from a tracked request,
+        e.g. a 429 sub-response inside a $batch.
+        """
+        with self._condition:
+            self._on_throttled(retry_after)
+            self._condition.notify_all()
+
+    def _on_throttled(self, retry_after: Optional[float]) -> None:
+        """Decrease the limit and pause new requests. Must hold the lock."""
+        now = self.clock()
+        self.throttle_count += 1
+        if self._last_decrease is None or now - self._last_decrease >= self.cooldown:
+            self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+            self._last_decrease = now
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
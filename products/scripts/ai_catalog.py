@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+AI Keyword and Vendor Catalog
+=============================
+
+Terms used by the Atlassian scanner to classify apps and content as
+AI-related, and a compiled matcher for them.
+
+Each list of terms is compiled once into a single case-insensitive regular
+expression. Terms are merged into a character trie first, so alternatives
+that share a prefix (e.g. "gpt", "gpt-4", "gpt-4o") are tested together and
+matching cost grows with the length of the text rather than with the size
+of the catalog. Terms only match as whole words: "ai" matches "AI Assistant"
+or "ai-helper", but not "maintain" or "email".
+
+The defaults can be replaced with a JSON catalog file:
+
+    {
+        "keywords": ["copilot", "chatgpt", "machine learning"],
+        "vendors": ["OpenAI", "Anthropic"],
+        "confluence_macros": ["ai-summary"],
+        "confluence_terms": ["ChatGPT"]
+    }
+
+Missing keys keep their defaults.
+
+Author: AI Governance Team
+"""
+
+import json
+import re
+from typing import Dict, Iterable, Optional, Sequence
+
+# App name keywords
+DEFAULT_KEYWORDS = (
+    'ai', 'copilot', 'assistant', 'intelligent', 'smart',
+    'automation', 'ml', 'machine learning', 'nlp', 'natural language',
+    'gpt', 'chatgpt', 'openai', 'llm', 'genai', 'generative'
+)
+
+# App vendors that only ship AI products
+DEFAULT_VENDORS = (
+    'OpenAI', 'Anthropic', 'Cohere', 'Mistral AI', 'Hugging Face'
+)
+
+# Macros added by Atlassian Intelligence and common marketplace AI apps
+DEFAULT_CONFLUENCE_MACROS = (
+    'ai-summary', 'ai-assistant', 'ai-writer', 'ai-content-generator',
+    'chatgpt', 'openai', 'gpt', 'copilot', 'smart-suggestions'
+)
+
+# Page text that indicates content was produced with or pasted into AI tools
+DEFAULT_CONFLUENCE_TERMS = (
+    'ChatGPT', 'OpenAI', 'GitHub Copilot', 'Atlassian Intelligence', 'Rovo'
+)
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace, so multi-word terms match any spacing."""
+    return ' '.join(text.lower().split())
+
+
+def trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a regular expression alternation for terms, factored as a trie.
+
+    Args:
+        terms: Normalized terms
+
+    Returns:
+        Pattern matching exactly the given terms
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if ends_here:
+            # Try the longer terms first; the shorter one is the fallback
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Whole-word, case-insensitive matcher for a set of terms."""
+
+    def __init__(self, terms: Iterable[str]):
+        """
+        Compile the matcher.
+
+        Args:
+            terms: Terms to look for; blank terms are ignored
+        """
+        # normalized -> term as written in the catalog, for reporting
+        self.terms: Dict[str, str] = {}
+        for term in terms:
+            key = normalize(term)
+            if key:
+                self.terms.setdefault(key, term)
+
+        self.pattern: Optional[re.Pattern] = None
+        if self.terms:
+            self.pattern = re.compile(rf"(?<!\w){trie_pattern(self.terms)}(?!\w)", re.IGNORECASE)
+
+    def search(self, text: Optional[str]) -> Optional[str]:
+        """
+        Find the first catalog term in text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            The matching term as written in the catalog, or None
+        """
+        if not text or self.pattern is None:
+            return None
+        match = self.pattern.search(normalize(text))
+        return self.terms[match.group(0).lower()] if match else None
+
+
+class AICatalog:
+    """Keyword and vendor catalog with its compiled matchers."""
+
+    def __init__(self, keywords: Sequence[str] = DEFAULT_KEYWORDS,
+                 vendors: Sequence[str] = DEFAULT_VENDORS,
+                 confluence_macros: Sequence[str] = DEFAULT_CONFLUENCE_MACROS,
+                 confluence_terms: Sequence[str] = DEFAULT_CONFLUENCE_TERMS):
+        """
+        Initialize the catalog and compile its matchers.
+
+        Args:
+            keywords: Terms that mark an app name as AI-related
+            vendors: Vendors whose apps are AI-related
+            confluence_macros: Confluence macro names that indicate AI features
+            confluence_terms: Phrases whose presence in page text indicates AI tool use
+        """
+        self.keywords = list(keywords)
+        self.vendors = list(vendors)
+        self.confluence_macros = list(confluence_macros)
+        self.confluence_terms = list(confluence_terms)
+
+        self.keyword_matcher = KeywordMatcher(self.keywords)
+        self.vendor_matcher = KeywordMatcher(self.vendors)
+
+    @classmethod
+    def load(cls, path: str) -> "AICatalog":
+        """
+        Load a catalog from a JSON file; missing keys keep their defaults.
+
+        Args:
+            path: Path of the JSON catalog
+
+        Returns:
+            The loaded catalog
+
+        Raises:
+            ValueError: If a catalog entry is not a list of strings
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        lists = {}
+        for key in ('keywords', 'vendors', 'confluence_macros', 'confluence_terms'):
+            if key not in data:
+                continue
+            values = data[key]
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                raise ValueError(f"catalog entry '{key}' must be a list of strings")
+            lists[key] = values
+        return cls(**lists)
+
+    def classify_app(self, name: Optional[str], vendor: Optional[str]) -> Optional[str]:
+        """
+        Decide whether an app is AI-related.
+
+        Args:
+            name: App name
+            vendor: App vendor name
+
+        Returns:
+            The rule that matched ('keyword:<term>' or 'vendor:<vendor>'), or None
+        """
+        term = self.keyword_matcher.search(name)
+        if term:
+            return f"keyword:{term}"
+        vendor_name = self.vendor_matcher.search(vendor)
+        if vendor_name:
+            return f"vendor:{vendor_name}"
+        return None
@@ -19,115 +19,191 @@ import requests
 import csv
 import argparse
 import sys
-import base64
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterator, Tuple
 from datetime import datetime
 
+from ai_catalog import AICatalog
+from atlassian_client import AtlassianClient, DEFAULT_CACHE_TTL
+from columnar_export import ColumnarWriter, is_available as columnar_export_available
+from concurrent_map import ordered_map
+from findings_store import FindingsStore, PLATFORM_ATLASSIAN
+from http_cache import HTTPCache
+from http_client import DEFAULT_POOL_SIZE
+from request_metrics import reporting_metrics
+
+DEFAULT_WORKERS = 8
+CONFLUENCE_PAGE_SIZE = 100
+DEFAULT_PARALLEL_SITES = 4
+
+REPORT_FIELDNAMES = ['site', 'type', 'name', 'key', 'vendor', 'ai_related', 'matched_rule', 'status', 'risk_level']
+
+
+def cql_quote(value: str) -> str:
+    """Escape a value for use inside a double-quoted CQL string."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
 
 class AtlassianAIScanner:
     """Scanner for Atlassian AI features and add-ons."""
     
-    def __init__(self, domain: str, email: str, api_token: str):
+    def __init__(self, domain: str, email: Optional[str] = None, api_token: Optional[str] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, workers: int = DEFAULT_WORKERS,
+                 catalog: Optional[AICatalog] = None, client: Optional[AtlassianClient] = None):
         """
         Initialize the scanner.
         
         Args:
             domain: Atlassian domain (e.g., 'mycompany.atlassian.net')
-            email: Atlassian account email
-            api_token: Atlassian API token
+            email: Atlassian account email (not needed with a client)
+            api_token: Atlassian API token (not needed with a client)
+            pool_size: Maximum number of pooled connections to the site
+            workers: Confluence spaces scanned concurrently
+            catalog: AI keyword/vendor catalog (defaults to the built-in one)
+            client: Client shared with scanners of other sites; one is
+                created from email/api_token if not given
         """
         self.domain = domain
-        self.email = email
-        self.api_token = api_token
+        self.base_url = f"https://{domain}"
+        self.client = client or AtlassianClient(email, api_token, pool_size=max(pool_size, workers))
+        self.workers = max(1, workers)
+        self.catalog = catalog or AICatalog()
         
-        # Base64 encode credentials for Basic Auth
-        credentials = f"{email}:{api_token}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
+        # Built once; each space reuses them in its CQL queries (None if the list is empty)
+        macros = self.catalog.confluence_macros
+        terms = self.catalog.confluence_terms
+        self.macro_cql = "macro in ({})".format(", ".join(f'"{cql_quote(m)}"' for m in macros)) if macros else None
+        self.content_cql = "({})".format(
+            " OR ".join(f'text ~ "\\"{cql_quote(t)}\\""' for t in terms)) if terms else None
+        self.results: List[Dict] = []
+        # Set when Jira or Confluence could not be read, so the scan is known to be incomplete
+        self.fetch_error: Optional[Exception] = None
+    
+    def iter_confluence_spaces(self) -> Iterator[Dict]:
+        """
+        Yield every current Confluence space, following the API's next links.
         
-        self.headers = {
-            "Authorization": f"Basic {encoded_credentials}",
-            "Accept": "application/json",
-            "Content-Type": "application/json"
-        }
+        Yields:
+            Space dictionaries with key and name
+        """
+        return self.client.iter_pages(f"{self.base_url}/wiki/rest/api/space", 'results',
+                                      {"limit": CONFLUENCE_PAGE_SIZE, "status": "current"})
+    
+    def count_cql(self, cql: str) -> int:
+        """Return how many pages match a CQL query, without fetching them."""
+        data = self.client.get_json(f"{self.base_url}/wiki/rest/api/search", {"cql": cql, "limit": 1})
+        return int(data.get('totalSize', data.get('size', 0)))
+    
+    def scan_confluence_space(self, space: Dict) -> Optional[Dict]:
+        """
+        Look for AI macros and AI tool mentions in one space with two CQL counts.
         
-        self.base_url = f"https://{domain}"
-        self.results: List[Dict] = []
+        Args:
+            space: Space dictionary with key and name
+            
+        Returns:
+            Result row if the space has AI-related content, otherwise None
+        """
+        space_key = space.get('key', '')
+        space_filter = f'space = "{cql_quote(space_key)}" AND type = page'
+        macro_pages = self.count_cql(f"{space_filter} AND {self.macro_cql}") if self.macro_cql else 0
+        content_pages = self.count_cql(f"{space_filter} AND {self.content_cql}") if self.content_cql else 0
+        
+        if not (macro_pages or content_pages):
+            return None
+        
+        return {
+            'type': 'Confluence Space',
+            'name': space.get('name', space_key),
+            'key': space_key,
+            'ai_related': 'Yes',
+            'status': f"{macro_pages} pages with AI macros, {content_pages} pages mentioning AI tools",
+            # Pages with AI macros send their content to an AI service
+            'risk_level': 'HIGH' if macro_pages else 'MEDIUM'
+        }
     
     def check_confluence_ai_features(self) -> List[Dict]:
-        """Check for AI features in Confluence."""
+        """
+        Check for AI features in Confluence.
+        
+        Every space is listed page by page and scanned as soon as it is
+        listed, on a pool of self.workers threads with a bounded window of
+        in-flight spaces. Each space costs two CQL count queries, one for
+        AI macros and one for AI tool mentions, however many pages it has.
+        A space whose queries fail is reported and skipped.
+        """
         print("🔍 Scanning Confluence for AI features...")
         results = []
-        
-        # Check for AI-powered features
-        # Note: Specific endpoints may vary based on Confluence version
-        ai_features = [
-            "AI Content Generator",
-            "Smart Suggestions",
-            "AI Writing Assistant",
-            "Intelligent Search"
-        ]
-        
+        space_count = 0
+        failed_spaces = 0
+        spaces = ordered_map(self._scan_space_safely, self.iter_confluence_spaces(), self.workers)
         try:
-            # Check Confluence REST API
-            url = f"{self.base_url}/wiki/rest/api/space"
-            response = requests.get(url, headers=self.headers, params={"limit": 100})
+            for space_key, result, error in spaces:
+                space_count += 1
+                if error:
+                    failed_spaces += 1
+                    self.fetch_error = error
+                    print(f"   ⚠️  Could not scan space {space_key}: {error}")
+                if not result:
+                    continue
+                results.append(result)
+                print(f"   ⚠️  AI-related content in space {result['key']}: {result['status']}")
             
-            if response.status_code == 200:
-                spaces = response.json().get('results', [])
-                print(f"   Found {len(spaces)} spaces")
-                
-                # Check for AI-related content/macros
-                for space in spaces[:10]:  # Limit to first 10 for performance
-                    space_key = space.get('key', '')
-                    # Additional checks can be added here
-                    
+            print(f"   Found {space_count} spaces, {len(results)} with AI-related content")
+            if failed_spaces:
+                print(f"   ⚠️  {failed_spaces} spaces could not be scanned")
         except requests.exceptions.RequestException as e:
+            # Listing the spaces failed; the spaces scanned so far are kept
             print(f"   ⚠️  Could not access Confluence: {e}")
+            self.fetch_error = e
+        finally:
+            spaces.close()
         
         return results
     
+    def _scan_space_safely(self, space: Dict) -> Tuple[str, Optional[Dict], Optional[Exception]]:
+        """Scan one space, returning (key, result, error) so one failing space does not stop the rest."""
+        try:
+            return space.get('key', ''), self.scan_confluence_space(space), None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return space.get('key', ''), None, e
+    
     def check_jira_ai_addons(self) -> List[Dict]:
         """Check for AI-related add-ons in Jira."""
         print("🔍 Scanning Jira for AI add-ons...")
         results = []
         
-        ai_addon_keywords = [
-            'ai', 'copilot', 'assistant', 'intelligent', 'smart',
-            'automation', 'ml', 'machine learning', 'nlp', 'natural language'
-        ]
-        
         try:
-            # Get installed apps/add-ons
+            # Get installed apps/add-ons, page by page
             url = f"{self.base_url}/rest/api/3/app/metadata"
-            response = requests.get(url, headers=self.headers)
+            app_count = 0
             
-            if response.status_code == 200:
-                apps = response.json()
-                installed_apps = apps.get('installedApps', [])
+            for app in self.client.iter_pages(url, 'installedApps'):
+                app_count += 1
+                app_key = app.get('key', '')
+                vendor = app.get('vendor', {}).get('name', 'Unknown')
                 
-                print(f"   Found {len(installed_apps)} installed apps")
+                # Whole-word match of the app name / vendor against the catalog
+                matched_rule = self.catalog.classify_app(app.get('name'), vendor)
                 
-                for app in installed_apps:
-                    app_name = app.get('name', '').lower()
-                    app_key = app.get('key', '')
-                    
-                    # Check if app name contains AI-related keywords
-                    is_ai_related = any(keyword in app_name for keyword in ai_addon_keywords)
-                    
-                    if is_ai_related:
-                        result = {
-                            'type': 'Jira Add-on',
-                            'name': app.get('name', 'Unknown'),
-                            'key': app_key,
-                            'vendor': app.get('vendor', {}).get('name', 'Unknown'),
-                            'ai_related': 'Yes',
-                            'risk_level': 'MEDIUM'  # Add-ons typically have limited access
-                        }
-                        results.append(result)
-                        print(f"   ⚠️  Found AI-related add-on: {app.get('name')}")
-                        
+                if matched_rule:
+                    result = {
+                        'type': 'Jira Add-on',
+                        'name': app.get('name', 'Unknown'),
+                        'key': app_key,
+                        'vendor': vendor,
+                        'ai_related': 'Yes',
+                        'matched_rule': matched_rule,
+                        'risk_level': 'MEDIUM'  # Add-ons typically have limited access
+                    }
+                    results.append(result)
+                    print(f"   ⚠️  Found AI-related add-on: {app.get('name')} ({matched_rule})")
+            
+            print(f"   Found {app_count} installed apps")
+            
         except requests.exceptions.RequestException as e:
             print(f"   ⚠️  Could not access Jira: {e}")
+            self.fetch_error = e
         
         return results
     
@@ -142,21 +218,18 @@ class AtlassianAIScanner:
             # This would require admin API access
             # Check for AI-related settings or features
             url = f"{self.base_url}/rest/api/3/instance/license"
-            response = requests.get(url, headers=self.headers)
+            license_data = self.client.get_json(url)
+            # Check license type and features
+            
+            # Note: Direct Intelligence check may require different endpoints
+            result = {
+                'type': 'Atlassian Intelligence',
+                'name': 'Built-in AI Features',
+                'status': 'Unknown',  # Would need specific endpoint
+                'risk_level': 'MEDIUM'
+            }
+            results.append(result)
             
-            if response.status_code == 200:
-                license_data = response.json()
-                # Check license type and features
-                
-                # Note: Direct Intelligence check may require different endpoints
-                result = {
-                    'type': 'Atlassian Intelligence',
-                    'name': 'Built-in AI Features',
-                    'status': 'Unknown',  # Would need specific endpoint
-                    'risk_level': 'MEDIUM'
-                }
-                results.append(result)
-                
         except requests.exceptions.RequestException as e:
             print(f"   ⚠️  Could not check Intelligence features: {e}")
         
@@ -170,34 +243,111 @@ class AtlassianAIScanner:
         print()
         
         all_results = []
+        self.fetch_error = None
         
         # Scan different components
         all_results.extend(self.check_jira_ai_addons())
         all_results.extend(self.check_confluence_ai_features())
         all_results.extend(self.check_atlassian_intelligence())
         
+        for result in all_results:
+            result['site'] = self.domain
+        
         self.results = all_results
         return all_results
     
-    def generate_report(self, output_file: str = None) -> None:
-        """Generate CSV report."""
+    def generate_report(self, output_file: str = None, store: Optional[FindingsStore] = None,
+                        export_file: Optional[str] = None) -> None:
+        """
+        Generate CSV report.
+        
+        Args:
+            output_file: Output CSV file path (default: auto-generated)
+            store: Optional findings store that also records the results as one scan
+            export_file: Optional typed Parquet/Arrow copy of the report (needs pyarrow)
+        """
         if not output_file:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"atlassian_ai_scan_{self.domain.replace('.', '_')}_{timestamp}.csv"
         
-        if not self.results:
-            print("⚠️  No results to report.")
-            return
+        write_report(self.results, output_file)
+        if store:
+            self.record(store)
+        if export_file:
+            export_report(self.results, export_file)
+    
+    def record(self, store: FindingsStore) -> int:
+        """
+        Record the results of the last scan() in a findings store.
         
-        fieldnames = ['type', 'name', 'key', 'vendor', 'ai_related', 'status', 'risk_level']
+        An empty scan, or one where Jira or Confluence could not be read, is
+        stored but not marked complete, so it never becomes the latest scan
+        that later scans are diffed against.
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(self.results)
+        Returns:
+            The scan_id
+        """
+        recorder = store.open_scan(PLATFORM_ATLASSIAN, self.domain)
+        try:
+            recorder.add_all(self.results)
+            recorder.flush()
+            if self.results and not self.fetch_error:
+                recorder.complete()
+        finally:
+            recorder.close()
         
-        print(f"\n✅ Report generated: {output_file}")
-        print(f"   Total AI features/add-ons found: {len(self.results)}")
+        if self.fetch_error or not self.results:
+            print(f"   ⚠️  {self.domain} was not fully scanned; scan {recorder.scan_id} in {store.path} "
+                  f"is not marked complete")
+        else:
+            print(f"   Recorded {self.domain} as scan {recorder.scan_id} in {store.path}")
+        return recorder.scan_id
+
+
+def write_report(results: List[Dict], output_file: str) -> None:
+    """
+    Write scan results (of one or several sites) to a CSV report.
+    
+    Args:
+        results: Result rows from AtlassianAIScanner.scan()
+        output_file: Path to the CSV file
+    """
+    if not results:
+        print("⚠️  No results to report.")
+        return
+    
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+    
+    print(f"\n✅ Report generated: {output_file}")
+    print(f"   Total AI features/add-ons found: {len(results)}")
+
+
+def export_report(results: List[Dict], export_file: str) -> None:
+    """
+    Write scan results (of one or several sites) to a typed Parquet/Arrow file.
+    
+    Args:
+        results: Result rows from AtlassianAIScanner.scan()
+        export_file: Path of the .parquet or .arrow file
+    """
+    with ColumnarWriter(export_file, PLATFORM_ATLASSIAN) as writer:
+        for row in results:
+            writer.add(row)
+    print(f"   Exported to {export_file}")
+
+
+def parse_domains(domain_args: List[str]) -> List[str]:
+    """Split comma-separated --domain values and drop duplicates, keeping order."""
+    domains = []
+    for value in domain_args:
+        for domain in value.split(','):
+            domain = domain.strip()
+            if domain and domain not in domains:
+                domains.append(domain)
+    return domains
 
 
 def main():
@@ -209,34 +359,94 @@ def main():
 Example usage:
     python atlassian_ai_scanner.py --domain mycompany.atlassian.net --email user@example.com --api_token YOUR_API_TOKEN
 
+    # Several sites in one run, reusing cached responses for an hour
+    python atlassian_ai_scanner.py --domain team-a.atlassian.net,team-b.atlassian.net \\
+        --email user@example.com --api_token YOUR_API_TOKEN --cache-dir .atlassian_cache
+
 Note: You need to create an API token at:
     https://id.atlassian.com/manage-profile/security/api-tokens
         """
     )
     
-    parser.add_argument('--domain', required=True, help='Atlassian domain (e.g., mycompany.atlassian.net)')
+    parser.add_argument('--domain', required=True, nargs='+',
+                        help='Atlassian domain(s) (e.g., mycompany.atlassian.net); '
+                             'several may be given, space- or comma-separated')
     parser.add_argument('--email', required=True, help='Atlassian account email')
     parser.add_argument('--api_token', required=True, help='Atlassian API token')
     parser.add_argument('--output', '-o', help='Output CSV file path')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f'Maximum pooled HTTP connections (default: {DEFAULT_POOL_SIZE})')
+    parser.add_argument('--catalog', metavar='FILE',
+                        help='JSON catalog of AI keywords, vendors and Confluence macros/terms '
+                             '(replaces the built-in lists for the keys it contains)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Confluence spaces scanned concurrently (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--store', metavar='DB',
+                        help='Also record the findings in this SQLite findings store (see findings_store.py)')
+    parser.add_argument('--export', metavar='FILE',
+                        help='Also write a typed Parquet (.parquet) or Arrow IPC (.arrow) copy of the report '
+                             '(needs pyarrow)')
+    parser.add_argument('--parallel-sites', type=int, default=DEFAULT_PARALLEL_SITES,
+                        help=f'Sites scanned at the same time (default: {DEFAULT_PARALLEL_SITES})')
+    parser.add_argument('--cache-dir', help='Directory for cached API responses (enables caching)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                        help=f'Seconds cached responses are reused (default: {DEFAULT_CACHE_TTL})')
+    parser.add_argument('--cache-max-mb', type=int, default=100,
+                        help='Maximum size of the response cache in MB (default: 100)')
     
-    args = parser.parse_args()
-    
-    scanner = AtlassianAIScanner(args.domain, args.email, args.api_token)
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Also write per-endpoint HTTP metrics to FILE (.json, otherwise Prometheus text format)')
     
-    try:
-        scanner.scan()
-        scanner.generate_report(args.output)
+    args = parser.parse_args()
+    with reporting_metrics(args.metrics_out):
+        try:
+            catalog = AICatalog.load(args.catalog) if args.catalog else None
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load catalog {args.catalog}: {e}")
+            sys.exit(1)
+        
+        if args.export and not columnar_export_available():
+            print("❌ Error: --export needs pyarrow. Run: pip install pyarrow")
+            sys.exit(1)
         
-        print("\n✅ Scan complete!")
+        domains = parse_domains(args.domain)
+        cache = HTTPCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+        # One client (session, credentials and cache) shared by every site
+        client = AtlassianClient(args.email, args.api_token, pool_size=max(args.pool_size, args.workers),
+                                 cache=cache, cache_ttl=args.cache_ttl)
+        scanners = [AtlassianAIScanner(domain, workers=args.workers, catalog=catalog, client=client)
+                    for domain in domains]
+        store = FindingsStore(args.store) if args.store else None
         
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Scan interrupted by user.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ Error during scan: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        try:
+            if len(scanners) == 1:
+                scanners[0].scan()
+                scanners[0].generate_report(args.output, store=store, export_file=args.export)
+            else:
+                with ThreadPoolExecutor(max_workers=max(1, args.parallel_sites)) as executor:
+                    site_results = list(executor.map(lambda scanner: scanner.scan(), scanners))
+                
+                output_file = args.output or f"atlassian_ai_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                write_report([row for results in site_results for row in results], output_file)
+                if store:
+                    # One scan per site, so each site's history can be queried on its own
+                    for scanner in scanners:
+                        scanner.record(store)
+                if args.export:
+                    export_report([row for results in site_results for row in results], args.export)
+                print(f"   Sites scanned: {len(scanners)}")
+            
+            print(f"   API requests: {client.request_count}, served from cache: {client.cache_hits}")
+            print("\n✅ Scan complete!")
+            
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Scan interrupted by user.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ Error during scan: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
 
 
 if __name__ == "__main__":
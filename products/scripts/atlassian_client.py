@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Atlassian Cloud Client
+======================
+
+HTTP client shared by every Atlassian site scanned in one run.
+
+- One pooled requests session (and one set of credentials) for all sites,
+  so connections are reused instead of re-established per request
+- Pagination for both styles the Atlassian REST APIs use: offset
+  (startAt/maxResults/total in Jira, start/limit in Confluence) and cursor
+  (_links.next in Confluence, nextPage in Jira)
+- Optional on-disk response cache with a time-to-live, so repeated scans of
+  the same sites within the TTL make no requests at all
+- 429 responses are retried after Retry-After (seconds or an HTTP date)
+
+Author: AI Governance Team
+"""
+
+import base64
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from http_cache import HTTPCache
+from http_client import create_session, retry_after_seconds, DEFAULT_POOL_SIZE
+
+MAX_RETRIES = 5
+DEFAULT_CACHE_TTL = 3600  # 1 hour
+
+
+class AtlassianClient:
+    """Pooled, caching, paginating client for Atlassian Cloud REST APIs."""
+
+    def __init__(self, email: str, api_token: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 cache: Optional[HTTPCache] = None, cache_ttl: float = DEFAULT_CACHE_TTL):
+        """
+        Initialize the client.
+
+        Args:
+            email: Atlassian account email
+            api_token: Atlassian API token
+            pool_size: Maximum number of pooled connections per site
+            cache: On-disk response cache; None disables caching
+            cache_ttl: Seconds a cached response is served without a request
+        """
+        self.email = email
+
+        # Base64 encode credentials for Basic Auth
+        credentials = f"{email}:{api_token}"
+        encoded_credentials = base64.b64encode(credentials.encode()).decode()
+
+        self.headers = {
+            "Authorization": f"Basic {encoded_credentials}",
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+
+        self.session = create_session(self.headers, pool_size=pool_size)
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+
+        self.request_count = 0
+        self.cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def get_json(self, url: str, params: Optional[Dict] = None, use_cache: bool = True) -> Any:
+        """
+        GET a JSON resource, from the cache when a fresh copy is there.
+
+        Args:
+            url: Absolute URL
+            params: Query parameters
+            use_cache: Set False to always go to the network
+
+        Returns:
+            Parsed JSON body
+
+        Raises:
+            requests.exceptions.RequestException: On network errors or error statuses
+        """
+        key = None
+        if self.cache and use_cache:
+            # Keyed by account too: different users may see different content
+            key = HTTPCache.make_key(url, params, namespace=self.email)
+            entry = self.cache.get(key)
+            if HTTPCache.is_fresh(entry, self.cache_ttl):
+                with self._stats_lock:
+                    self.cache_hits += 1
+                return json.loads(entry['body'])
+
+        for attempt in range(MAX_RETRIES + 1):
+            with self._stats_lock:
+                self.request_count += 1
+            response = self.session.get(url, params=params)
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                break
+            wait_time = retry_after_seconds(response.headers, default=2 ** attempt)
+            print(f"   ⚠️  Rate limited. Retrying in {wait_time:.0f} seconds...")
+            time.sleep(wait_time)
+
+        response.raise_for_status()
+        if key:
+            self.cache.store(key, response, require_validator=False)
+        return response.json()
+
+    @staticmethod
+    def resolve_next_link(url: str, links: Dict[str, str]) -> str:
+        """
+        Turn a Confluence _links.next value into an absolute URL.
+
+        v1 next links are relative to _links.base (the /wiki context);
+        v2 next links already start with /wiki.
+        """
+        next_link = links['next']
+        if next_link.startswith(('http://', 'https://')):
+            return next_link
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if next_link.startswith('/wiki/'):
+            return f"{origin}{next_link}"
+        return f"{links.get('base', origin)}{next_link}"
+
+    def iter_pages(self, url: str, items_key: Optional[str], params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Yield every item of a paginated collection.
+
+        Follows Confluence _links.next and Jira nextPage cursors, and
+        otherwise advances startAt (Jira offset pagination) until isLast or
+        total is reached. A response without paging fields is one page.
+
+        Args:
+            url: Absolute URL of the first page
+            items_key: Key holding the page's items (None if the body is a list)
+            params: Query parameters for the first page
+
+        Yields:
+            Collection items
+        """
+        params = dict(params or {})
+        while url:
+            data = self.get_json(url, params or None)
+            if not isinstance(data, dict):
+                yield from data
+                return
+
+            items = data.get(items_key, []) if items_key else []
+            yield from items
+
+            links = data.get('_links') or {}
+            if links.get('next'):
+                url = self.resolve_next_link(url, links)
+                params = {}
+            elif data.get('nextPage'):
+                url = data['nextPage']
+                params = {}
+            elif 'startAt' in data and items:
+                next_start = data['startAt'] + len(items)
+                total = data.get('total')
+                if data.get('isLast') or (total is not None and next_start >= total) or \
+                        ('isLast' not in data and total is None):
+                    return
+                params['startAt'] = next_start
+                if 'maxResults' in data:
+                    params['maxResults'] = data['maxResults']
+            else:
+                return
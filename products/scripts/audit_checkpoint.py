@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Audit Checkpoint
+================
+
+Local state file that lets a long GitHub audit resume after a failure.
+
+Audit results are streamed straight into the CSV report, so the checkpoint
+only needs to remember where the audit stopped: the next repository page to
+fetch, the repositories fetched but not yet checked, and how many rows have
+already been written to the report. Its size stays flat no matter how large
+the organization is.
+
+The file is written atomically (temp file + rename) so a crash while saving
+never corrupts it.
+
+Author: AI Governance Team
+"""
+
+import json
+import os
+from collections import deque
+from typing import Dict, List, Optional, Union
+
+DEFAULT_SAVE_INTERVAL = 100
+
+
+class AuditCheckpoint:
+    """Periodically saved progress of a single organization audit."""
+
+    def __init__(self, path: str, org_name: str, output_file: Optional[str] = None,
+                 save_interval: int = DEFAULT_SAVE_INTERVAL, enumeration: str = 'rest'):
+        """
+        Initialize an empty checkpoint.
+
+        Args:
+            path: Path of the JSON state file
+            org_name: Organization being audited
+            output_file: CSV report the audit is streaming into
+            save_interval: Save after this many completed repository checks
+            enumeration: Repository listing backend the page tokens belong to
+        """
+        self.path = path
+        self.org_name = org_name
+        self.output_file = output_file
+        self.save_interval = max(1, save_interval)
+        self.enumeration = enumeration
+
+        # REST page number or GraphQL cursor; None means the first page
+        self.next_page: Optional[Union[int, str]] = None
+        self.repos_complete = False
+        self.pending_repos = deque()
+        self.checked_count = 0
+
+    @classmethod
+    def load(cls, path: str, org_name: str, enumeration: str = 'rest',
+             save_interval: int = DEFAULT_SAVE_INTERVAL) -> "AuditCheckpoint":
+        """
+        Load a checkpoint saved by a previous run.
+
+        Args:
+            path: Path of the JSON state file
+            org_name: Organization being audited; must match the checkpoint
+            enumeration: Repository listing backend; must match the checkpoint
+            save_interval: Save after this many completed repository checks
+
+        Returns:
+            The restored checkpoint
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different organization or backend
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        if state.get('org_name') != org_name:
+            raise ValueError(
+                f"checkpoint is for organization '{state.get('org_name')}', not '{org_name}'"
+            )
+
+        if state.get('enumeration', 'rest') != enumeration:
+            raise ValueError(
+                f"checkpoint was taken with --enumeration {state.get('enumeration', 'rest')}"
+            )
+
+        checkpoint = cls(path, org_name, state.get('output_file'), save_interval, enumeration)
+        checkpoint.next_page = state.get('next_page')
+        checkpoint.repos_complete = state.get('repos_complete', False)
+        checkpoint.pending_repos = deque(state.get('pending_repos', []))
+        checkpoint.checked_count = state.get('checked_count', 0)
+        return checkpoint
+
+    def record_page(self, page_repos: List[Dict], next_page: Union[int, str]) -> None:
+        """Record a fetched page of repositories awaiting checks and save."""
+        self.pending_repos.extend(page_repos)
+        self.next_page = next_page
+        self.save()
+
+    def mark_repos_complete(self) -> None:
+        """Record that every repository page has been fetched and save."""
+        self.repos_complete = True
+        self.save()
+
+    def record_result(self, result: Dict) -> None:
+        """
+        Record a repository check whose row has been written to the report.
+
+        Checks complete in repository order, so the oldest pending repository
+        is the one just checked. Saves every save_interval results.
+        """
+        if self.pending_repos:
+            self.pending_repos.popleft()
+        self.checked_count += 1
+        if self.checked_count % self.save_interval == 0:
+            self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint to disk atomically."""
+        state = {
+            'org_name': self.org_name,
+            'output_file': self.output_file,
+            'enumeration': self.enumeration,
+            'next_page': self.next_page,
+            'repos_complete': self.repos_complete,
+            'pending_repos': list(self.pending_repos),
+            'checked_count': self.checked_count
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Delete the checkpoint once the audit has finished."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+GitHub Copilot Auditor Benchmark
+================================
+
+Measures auditor throughput against the local mock GitHub API
+(mock_github_server.py). No token or network access is required.
+
+For every worker count given, a full audit (repository listing, Copilot
+checks and streaming CSV report) is run against a fresh mock server and
+the following are reported:
+
+- wall time and repos/sec
+- requests made to the mock API, per endpoint
+- peak resident memory of the audit process
+- optionally, peak Python heap memory (--trace-memory; tracemalloc slows the run)
+
+The mock server and every audit run in separate processes, so the server
+does not compete with the auditor for the GIL and each run's peak memory
+is measured from a clean start.
+
+Usage:
+    python benchmark_auditor.py --repos 10000 --latency-ms 20 --workers 1 8 32
+    python benchmark_auditor.py --repos 1000 --json-out bench.json --fail-below 200
+
+Author: AI Governance Team
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import requests
+
+from github_copilot_auditor import GitHubCopilotAuditor, ENUMERATION_BACKENDS
+from mock_github_server import MockGitHubConfig, MockGitHubServer
+
+# Longest a single audit run may take before the benchmark gives up on it
+DEFAULT_RUN_TIMEOUT = 1800
+
+
+class BenchmarkError(Exception):
+    """Raised when an audit run fails, dies or times out, so no measurement exists."""
+
+
+def _serve(config: MockGitHubConfig, port_queue) -> None:
+    """Child process entry point: run the mock server until terminated."""
+    server = MockGitHubServer(config)
+    port_queue.put(server.server.server_address[1])
+    server.server.serve_forever()
+
+
+@contextlib.contextmanager
+def mock_server_process(config: MockGitHubConfig):
+    """Start the mock server in a child process and yield its base URL."""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(config, port_queue), daemon=True)
+    process.start()
+    try:
+        port = port_queue.get(timeout=10)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.join()
+
+
+def _run_audit(base_url: str, org_name: str, workers: int, enumeration: str,
+               trace_memory: bool, result_queue) -> None:
+    """Child process entry point: run one streaming audit and report its measurements."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auditor = GitHubCopilotAuditor('mock-token', org_name, workers=workers, enumeration=enumeration)
+        auditor.base_url = base_url
+        output_file = os.path.join(tmp_dir, 'bench.csv')
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        # Per-repository progress lines would dominate the timing
+        with contextlib.redirect_stdout(io.StringIO()):
+            risk_counts = auditor.generate_report(auditor.iter_audit(), output_file)
+        wall_time = time.perf_counter() - start
+        heap_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+
+    # ru_maxrss is reported in KB on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_bytes = max_rss if platform.system() == 'Darwin' else max_rss * 1024
+
+    result_queue.put({
+        'audited': sum(risk_counts.values()),
+        'wall_time': wall_time,
+        'peak_rss_bytes': rss_bytes,
+        'peak_heap_bytes': heap_peak,
+    })
+
+
+def _wait_for_result(process: multiprocessing.Process, result_queue, timeout: float) -> Dict:
+    """
+    Wait for an audit process's measurements, noticing if it dies first.
+
+    Raises:
+        BenchmarkError: If the process exits without a result, fails, or runs past timeout
+    """
+    deadline = time.monotonic() + timeout
+    run = None
+    while run is None:
+        try:
+            run = result_queue.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                # A result put just before exiting may still be in flight
+                try:
+                    run = result_queue.get(timeout=1)
+                except queue.Empty:
+                    process.join()
+                    raise BenchmarkError(f"audit process exited with status {process.exitcode} "
+                                         f"without a result")
+            elif time.monotonic() > deadline:
+                process.terminate()
+                process.join()
+                raise BenchmarkError(f"audit did not finish within {timeout:.0f} seconds")
+
+    process.join()
+    if process.exitcode != 0:
+        raise BenchmarkError(f"audit process exited with status {process.exitcode}")
+    return run
+
+
+def run_benchmark(config: MockGitHubConfig, workers: int, enumeration: str = 'rest',
+                  org_name: str = 'bench-org', trace_memory: bool = False,
+                  timeout: float = DEFAULT_RUN_TIMEOUT) -> Dict:
+    """
+    Run one audit in a fresh process against a fresh mock server.
+
+    Args:
+        config: Mock server behaviour (org size, latency, errors)
+        workers: Concurrent Copilot checks
+        enumeration: Repository listing backend
+        org_name: Organization name to audit
+        trace_memory: Also measure peak Python heap with tracemalloc
+        timeout: Seconds the audit may take before it is stopped
+
+    Returns:
+        Benchmark result dictionary
+
+    Raises:
+        BenchmarkError: If the audit process fails, dies or times out
+    """
+    with mock_server_process(config) as base_url:
+        result_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=_run_audit,
+            args=(base_url, org_name, workers, enumeration, trace_memory, result_queue)
+        )
+        process.start()
+        run = _wait_for_result(process, result_queue, timeout)
+
+        stats = requests.get(f"{base_url}/_stats").json()
+
+    mb = 1024 * 1024
+    wall_time = run['wall_time']
+    return {
+        'repos': config.org_size,
+        'audited': run['audited'],
+        'workers': workers,
+        'enumeration': enumeration,
+        'latency_ms': config.latency * 1000,
+        'error_rate': config.error_rate,
+        'wall_time_s': round(wall_time, 3),
+        'repos_per_sec': round(run['audited'] / wall_time, 1) if wall_time else 0.0,
+        'requests': sum(stats['requests'].values()),
+        'requests_by_endpoint': stats['requests'],
+        'response_bytes': stats['bytes_sent'],
+        'peak_rss_mb': round(run['peak_rss_bytes'] / mb, 1),
+        'peak_heap_mb': round(run['peak_heap_bytes'] / mb, 2) if run['peak_heap_bytes'] is not None else None,
+    }
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print benchmark results as a table."""
+    print(f"\n{'workers':>8} {'enum':>8} {'wall (s)':>10} {'repos/s':>10} {'requests':>10} "
+          f"{'RSS MB':>8} {'heap MB':>8}")
+    print("-" * 68)
+    for r in results:
+        heap = r['peak_heap_mb'] if r['peak_heap_mb'] is not None else '-'
+        print(f"{r['workers']:>8} {r['enumeration']:>8} {r['wall_time_s']:>10} {r['repos_per_sec']:>10} "
+              f"{r['requests']:>10} {r['peak_rss_mb']:>8} {heap:>8}")
+    print()
+    for r in results:
+        endpoints = ", ".join(f"{k}: {v}" for k, v in sorted(r['requests_by_endpoint'].items()))
+        print(f"   workers={r['workers']}: {endpoints}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the GitHub Copilot Auditor against a local mock API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+    python benchmark_auditor.py --repos 10000 --latency-ms 20 --workers 1 8 32
+    python benchmark_auditor.py --repos 100000 --enumeration graphql --workers 64
+        """
+    )
+    parser.add_argument('--repos', type=int, default=1000, help='Repositories in the mock organization (default: 1000)')
+    parser.add_argument('--latency-ms', type=float, default=10.0, help='Added latency per response in ms (default: 10)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of Copilot checks that fail (default: 0)')
+    parser.add_argument('--rate-limit', type=int, default=1_000_000,
+                        help='Core rate limit reported by the mock (default: 1000000, effectively unlimited)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32],
+                        help='Worker counts to benchmark (default: 1 8 32)')
+    parser.add_argument('--enumeration', choices=ENUMERATION_BACKENDS, default='rest',
+                        help='Repository listing backend (default: rest)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Also measure peak Python heap with tracemalloc (slows the run)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_RUN_TIMEOUT,
+                        help=f'Seconds one audit run may take before the benchmark fails '
+                             f'(default: {DEFAULT_RUN_TIMEOUT})')
+    parser.add_argument('--json-out', help='Write results as JSON to this file')
+    parser.add_argument('--fail-below', type=float,
+                        help='Exit with status 1 if the best repos/sec is below this (regression gate)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GitHub Copilot Auditor - Benchmark")
+    print("=" * 60)
+    print(f"   Mock org: {args.repos} repos, {args.latency_ms} ms latency, {args.error_rate:.1%} errors")
+
+    config = MockGitHubConfig(org_size=args.repos, latency=args.latency_ms / 1000,
+                              error_rate=args.error_rate, rate_limit=args.rate_limit)
+
+    results = []
+    for workers in args.workers:
+        print(f"   ⏱️  Running with {workers} worker(s)...")
+        try:
+            results.append(run_benchmark(config, workers, args.enumeration, trace_memory=args.trace_memory,
+                                         timeout=args.timeout))
+        except BenchmarkError as e:
+            print(f"\n❌ Benchmark failed with {workers} worker(s): {e}")
+            sys.exit(1)
+
+    print_results(results)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to: {args.json_out}")
+
+    if args.fail_below is not None:
+        best = max(r['repos_per_sec'] for r in results)
+        if best < args.fail_below:
+            print(f"\n❌ Regression: best throughput {best} repos/sec is below {args.fail_below}")
+            sys.exit(1)
+        print(f"\n✅ Throughput {best} repos/sec meets the {args.fail_below} repos/sec gate")
+
+
+if __name__ == "__main__":
+    main()
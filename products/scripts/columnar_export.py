@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Columnar Export
+===============
+
+Optional Parquet / Arrow IPC export of scan results, for loading audit
+history into analytics tools without parsing CSV.
+
+Unlike the CSV reports, columns are typed:
+
+- 'Yes'/'No' flags (is_private, copilot_enabled, copilot_licensed,
+  ai_related) become booleans; anything else ('Error', 'Unknown') is null
+- risk_level is categorical (dictionary-encoded over the fixed risk levels)
+- created_at / updated_at / pushed_at and the added scan_time column are
+  UTC timestamps
+- counts and scores are integers
+
+Rows are buffered and written one row group (Parquet) or record batch
+(Arrow) at a time as results stream in, so memory stays bounded however
+large the audit is. The format follows the file extension: .arrow, .ipc or
+.feather for Arrow IPC, anything else for Parquet.
+
+Requirements:
+    pip install pyarrow
+
+Author: AI Governance Team
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from findings_store import PLATFORM_ATLASSIAN, PLATFORM_GITHUB, PLATFORM_M365
+
+DEFAULT_ROW_GROUP_SIZE = 50000
+
+RISK_LEVELS = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+ARROW_EXTENSIONS = ('.arrow', '.ipc', '.feather')
+
+# Report columns and their types per platform; every export also gets scan_time
+PLATFORM_COLUMNS = {
+    PLATFORM_GITHUB: [
+        ('repo_name', 'string'), ('is_private', 'bool'), ('copilot_enabled', 'bool'),
+        ('risk_level', 'risk'), ('url', 'string'),
+        ('created_at', 'timestamp'), ('updated_at', 'timestamp'), ('pushed_at', 'timestamp'),
+    ],
+    PLATFORM_M365: [
+        ('type', 'string'), ('name', 'string'), ('email', 'string'), ('copilot_licensed', 'bool'),
+        ('license_count', 'int'), ('url', 'string'), ('id', 'string'),
+        ('anonymous_links', 'int'), ('everyone_grants', 'int'), ('organization_links', 'int'),
+        ('risk_score', 'int'), ('risk_level', 'risk'),
+    ],
+    PLATFORM_ATLASSIAN: [
+        ('site', 'string'), ('type', 'string'), ('name', 'string'), ('key', 'string'),
+        ('vendor', 'string'), ('ai_related', 'bool'), ('matched_rule', 'string'),
+        ('status', 'string'), ('risk_level', 'risk'),
+    ],
+}
+
+
+def is_available() -> bool:
+    """Whether pyarrow is installed."""
+    return pa is not None
+
+
+def to_bool(value) -> Optional[bool]:
+    """Map report flags ('Yes'/'No', True/False) to booleans; anything else is None."""
+    if isinstance(value, bool):
+        return value
+    if value in ('Yes', 'True'):
+        return True
+    if value in ('No', 'False'):
+        return False
+    return None
+
+
+def to_int(value) -> Optional[int]:
+    """Parse a count or score; blanks are None."""
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+def to_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp (e.g. '2024-06-01T12:00:00Z') as UTC; blanks are None."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def to_string(value) -> Optional[str]:
+    return None if value is None or value == '' else str(value)
+
+
+CONVERTERS = {'string': to_string, 'bool': to_bool, 'int': to_int, 'timestamp': to_timestamp}
+
+
+def export_format(path: str) -> str:
+    """'arrow' for .arrow/.ipc/.feather files, otherwise 'parquet'."""
+    return 'arrow' if path.lower().endswith(ARROW_EXTENSIONS) else 'parquet'
+
+
+class ColumnarWriter:
+    """Streams one platform's report rows into a typed Parquet or Arrow IPC file."""
+
+    def __init__(self, path: str, platform: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 scan_time: Optional[datetime] = None):
+        """
+        Open the export file.
+
+        Args:
+            path: Output file (.parquet, or .arrow/.ipc/.feather for Arrow IPC)
+            platform: One of the findings store platforms; selects the columns
+            row_group_size: Rows buffered before a row group / record batch is written
+            scan_time: Value of the scan_time column (default: now)
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+            ValueError: If the platform is unknown
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Parquet/Arrow export. Run: pip install pyarrow")
+        if platform not in PLATFORM_COLUMNS:
+            raise ValueError(f"platform must be one of {tuple(PLATFORM_COLUMNS)}, not '{platform}'")
+
+        self.path = path
+        self.format = export_format(path)
+        self.columns = PLATFORM_COLUMNS[platform] + [('scan_time', 'timestamp')]
+        self.row_group_size = max(1, row_group_size)
+        self.scan_time = scan_time or datetime.now(timezone.utc)
+        self.count = 0
+        self.schema = pa.schema([(name, self._arrow_type(kind)) for name, kind in self.columns])
+        self._pending: Dict[str, List] = {name: [] for name, _ in self.columns}
+        self._pending_rows = 0
+
+        if self.format == 'arrow':
+            self._writer = ipc.new_file(path, self.schema)
+        else:
+            self._writer = pq.ParquetWriter(path, self.schema)
+
+    @staticmethod
+    def _arrow_type(kind: str):
+        if kind == 'bool':
+            return pa.bool_()
+        if kind == 'int':
+            return pa.int64()
+        if kind == 'timestamp':
+            return pa.timestamp('ms', tz='UTC')
+        if kind == 'risk':
+            return pa.dictionary(pa.int8(), pa.string())
+        return pa.string()
+
+    def add(self, row: Dict) -> None:
+        """Convert and buffer one report row, writing a row group when the buffer is full."""
+        for name, kind in self.columns:
+            if name == 'scan_time':
+                value = self.scan_time
+            elif kind == 'risk':
+                value = row.get(name) if row.get(name) in RISK_LEVELS else None
+            else:
+                value = CONVERTERS[kind](row.get(name))
+            self._pending[name].append(value)
+        self._pending_rows += 1
+        if self._pending_rows >= self.row_group_size:
+            self.flush()
+
+    def _column(self, name: str, kind: str):
+        values = self._pending[name]
+        if kind == 'risk':
+            # One fixed dictionary, so every batch encodes risk levels identically
+            indices = pa.array([None if v is None else RISK_LEVELS.index(v) for v in values], type=pa.int8())
+            return pa.DictionaryArray.from_arrays(indices, pa.array(RISK_LEVELS, type=pa.string()))
+        return pa.array(values, type=self._arrow_type(kind))
+
+    def flush(self) -> None:
+        """Write the buffered rows as one row group / record batch."""
+        if not self._pending_rows:
+            return
+        batch = pa.record_batch([self._column(name, kind) for name, kind in self.columns], schema=self.schema)
+        if self.format == 'arrow':
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_table(pa.Table.from_batches([batch]), row_group_size=self.row_group_size)
+        self.count += self._pending_rows
+        self._pending = {name: [] for name, _ in self.columns}
+        self._pending_rows = 0
+
+    def complete(self) -> None:
+        """Write the remaining buffered rows."""
+        self.flush()
+
+    def close(self) -> None:
+        """Write any buffered rows and finish the file (a partial export stays readable)."""
+        if self._writer is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Ordered Concurrent Map
+======================
+
+Runs one function over a stream of items on a thread pool and yields the
+results in input order, shared by the scanners that fan out per item
+(repositories, SharePoint sites, Confluence spaces).
+
+Items are pulled lazily with a bounded window of in-flight work (by
+default twice the number of workers), so a paged or streaming source is
+read only as fast as results are consumed and memory stays flat however
+many items there are. If the consumer stops early (an exception, Ctrl-C or
+simply closing the generator), work not yet started is cancelled.
+
+Author: AI Governance Team
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def ordered_map(func: Callable[[T], R], items: Iterable[T], workers: int,
+                window: Optional[int] = None) -> Iterator[R]:
+    """
+    Apply func to every item concurrently and yield the results in input order.
+
+    Args:
+        func: Called once per item on a worker thread
+        items: Any iterable, including a generator
+        workers: Size of the thread pool; with 1, items are processed inline
+        window: Maximum items submitted but not yet yielded (default: workers * 2)
+
+    Yields:
+        func(item) for each item, in the order of items
+
+    Raises:
+        Whatever func raised for the first failing item, when its turn comes
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    window = max(window or workers * 2, 1)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
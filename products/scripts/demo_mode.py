@@ -10,10 +10,11 @@ Usage:
     python demo_mode.py your-org-name
 """
 
-import requests
 import csv
 import sys
 
+from http_client import create_session
+
 ORG_NAME = sys.argv[1] if len(sys.argv) > 1 else None
 
 if not ORG_NAME:
@@ -21,6 +22,9 @@ if not ORG_NAME:
     print("Note: This demo mode only checks PUBLIC repositories")
     sys.exit(1)
 
+# One keep-alive session for every page request
+SESSION = create_session({"Accept": "application/vnd.github.v3+json"})
+
 def get_public_repos(org):
     """Fetch public repositories for the organization (no auth required)."""
     repos = []
@@ -31,7 +35,7 @@ def get_public_repos(org):
     
     while True:
         url = f"https://api.github.com/orgs/{org}/repos?type=public&page={page}&per_page=100"
-        response = requests.get(url)
+        response = SESSION.get(url)
         
         if response.status_code != 200:
             print(f"❌ Error: {response.status_code} - {response.json().get('message', 'Unknown error')}")
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Findings Store
+==============
+
+Local SQLite history of every scan's findings, so questions such as "which
+repositories went from LOW to CRITICAL this month" are one query instead of
+a diff over hundreds of timestamped CSV reports.
+
+Each generate_report() call can record its rows as one scan:
+
+- scans:    one row per platform scan (platform, scope, scan_time)
+- findings: one row per finding (entity, risk_level and the full report row
+            as JSON), indexed on (platform, entity, scan_time, risk_level)
+
+Rows are inserted in bulk (executemany, several thousand rows per
+transaction), so recording streams alongside the CSV report and never holds
+the write lock for a whole audit. A scan is marked complete only when its
+report finished; interrupted scans are ignored by every query.
+
+Query from the command line:
+
+    python findings_store.py --db findings.db scans
+    python findings_store.py --db findings.db trend --platform github --since 2024-06-01
+    python findings_store.py --db findings.db changes --platform github --since 2024-06-01 \\
+        --from-risk LOW --to-risk CRITICAL
+    python findings_store.py --db findings.db history --platform github --entity my-org/my-repo
+
+Author: AI Governance Team
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+PLATFORM_GITHUB = 'github'
+PLATFORM_M365 = 'm365'
+PLATFORM_ATLASSIAN = 'atlassian'
+PLATFORMS = (PLATFORM_GITHUB, PLATFORM_M365, PLATFORM_ATLASSIAN)
+
+# Rows per INSERT transaction
+BATCH_SIZE = 5000
+
+# Report columns that identify an entity, in order of preference. Display
+# names come last: SharePoint sites and Teams often share them, their ids do not.
+ENTITY_KEYS = ('repo_name', 'email', 'key', 'id', 'url', 'name')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    scan_time TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    finding_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_scans_platform_scope_time ON scans (platform, scope, scan_time);
+
+CREATE TABLE IF NOT EXISTS findings (
+    scan_id INTEGER NOT NULL REFERENCES scans (scan_id),
+    platform TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    scan_time TEXT NOT NULL,
+    risk_level TEXT,
+    type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_platform_entity_time_risk
+    ON findings (platform, entity, scan_time, risk_level);
+CREATE INDEX IF NOT EXISTS idx_findings_scan_entity ON findings (scan_id, entity);
+"""
+
+
+def entity_of(row: Dict) -> str:
+    """Identify the entity a report row is about (repo_name, email, key, id, url or name)."""
+    for key in ENTITY_KEYS:
+        if row.get(key):
+            return str(row[key])
+    return ''
+
+
+def utc_timestamp() -> str:
+    """Current time as a sortable ISO 8601 UTC string."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ScanRecorder:
+    """Buffers one scan's rows and inserts them in batches."""
+
+    def __init__(self, store: "FindingsStore", platform: str, scope: str, scan_time: str):
+        self.store = store
+        self.platform = platform
+        self.scope = scope
+        self.scan_time = scan_time
+        self.count = 0
+        self._pending: List[tuple] = []
+        self._conn = store.connect()
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO scans (platform, scope, scan_time) VALUES (?, ?, ?)",
+                (platform, scope, scan_time))
+        self.scan_id = cursor.lastrowid
+
+    def add(self, row: Dict) -> None:
+        """Queue one report row, inserting a batch when enough have built up."""
+        self._pending.append((self.scan_id, self.platform, self.scope, entity_of(row), self.scan_time,
+                              row.get('risk_level'), row.get('type'), json.dumps(row, default=str)))
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def add_all(self, rows: Iterable[Dict]) -> None:
+        """Queue every row of an iterable."""
+        for row in rows:
+            self.add(row)
+
+    def flush(self) -> None:
+        """Insert the queued rows in one transaction."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO findings (scan_id, platform, scope, entity, scan_time, risk_level, type, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+        self.count += len(self._pending)
+        self._pending = []
+
+    def complete(self) -> None:
+        """Insert the remaining rows and mark the scan complete."""
+        self.flush()
+        with self._conn:
+            self._conn.execute("UPDATE scans SET completed = 1, finding_count = ? WHERE scan_id = ?",
+                               (self.count, self.scan_id))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ScanRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.complete()
+        finally:
+            self.close()
+
+
+class FindingsStore:
+    """SQLite history of scan findings."""
+
+    def __init__(self, path: str):
+        """
+        Open (and if needed create) the store.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        conn = self.connect()
+        try:
+            # WAL lets queries run while a scan is being recorded
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a new connection; each recorder and query uses its own."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def open_scan(self, platform: str, scope: str, scan_time: Optional[str] = None) -> ScanRecorder:
+        """
+        Start recording a scan; use as a context manager.
+
+        Args:
+            platform: One of PLATFORMS
+            scope: Organization, tenant or site the scan covered
+            scan_time: ISO 8601 UTC time of the scan (default: now)
+
+        Returns:
+            Recorder that completes the scan on a clean exit
+        """
+        if platform not in PLATFORMS:
+            raise ValueError(f"platform must be one of {PLATFORMS}, not '{platform}'")
+        return ScanRecorder(self, platform, scope, scan_time or utc_timestamp())
+
+    def record(self, platform: str, scope: str, rows: Iterable[Dict], scan_time: Optional[str] = None) -> int:
+        """
+        Record a complete scan.
+
+        Returns:
+            The new scan_id
+        """
+        with self.open_scan(platform, scope, scan_time) as recorder:
+            recorder.add_all(rows)
+        return recorder.scan_id
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        conn = self.connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, tuple(params))]
+        finally:
+            conn.close()
+
+    def scans(self, platform: Optional[str] = None, scope: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """List completed scans, oldest first."""
+        sql = "SELECT scan_id, platform, scope, scan_time, finding_count FROM scans WHERE completed = 1"
+        params: List = []
+        for column, op, value in (('platform', '=', platform), ('scope', '=', scope),
+                                  ('scan_time', '>=', since), ('scan_time', '<=', until)):
+            if value is not None:
+                sql += f" AND {column} {op} ?"
+                params.append(value)
+        return self._query(sql + " ORDER BY scan_time, scan_id", params)
+
+    def latest_scan(self, platform: str, scope: str, until: Optional[str] = None) -> Optional[Dict]:
+        """The most recent completed scan of a scope (at or before until)."""
+        scans = self.scans(platform, scope, until=until)
+        return scans[-1] if scans else None
+
+    def scan_rows(self, scan_id: int) -> Iterator[Dict]:
+        """Stream the report rows recorded for one scan."""
+        conn = self.connect()
+        try:
+            for row in conn.execute("SELECT data FROM findings WHERE scan_id = ?", (scan_id,)):
+                yield json.loads(row['data'])
+        finally:
+            conn.close()
+
+    def snapshot(self, scan_id: int) -> Dict[str, Dict]:
+        """All findings of one scan as {entity: report row}."""
+        return {entity_of(row): row for row in self.scan_rows(scan_id)}
+
+    def risk_trend(self, platform: str, scope: Optional[str] = None,
+                   since: Optional[str] = None) -> List[Dict]:
+        """Findings per risk level for every completed scan, oldest first."""
+        sql = ("SELECT s.scan_time, s.scope, f.risk_level, COUNT(*) AS count "
+               "FROM scans s JOIN findings f ON f.scan_id = s.scan_id "
+               "WHERE s.completed = 1 AND s.platform = ?")
+        params: List = [platform]
+        if scope is not None:
+            sql += " AND s.scope = ?"
+            params.append(scope)
+        if since is not None:
+            sql += " AND s.scan_time >= ?"
+            params.append(since)
+        return self._query(sql + " GROUP BY s.scan_id, f.risk_level ORDER BY s.scan_time, s.scope, f.risk_level",
+                           params)
+
+    def risk_changes(self, platform: str, since: str, until: Optional[str] = None,
+                     from_risk: Optional[str] = None, to_risk: Optional[str] = None) -> List[Dict]:
+        """
+        Entities whose risk level differs between the first and last scan of a period.
+
+        For every scope, the first completed scan at or after since is
+        compared with the last one at or before until.
+
+        Args:
+            platform: One of PLATFORMS
+            since: Start of the period (ISO 8601, e.g. '2024-06-01')
+            until: End of the period (default: latest scan)
+            from_risk: Only changes away from this risk level
+            to_risk: Only changes to this risk level
+
+        Returns:
+            Rows with scope, entity, old_risk, new_risk, old_scan_time and new_scan_time
+        """
+        pairs: Dict[str, List[Dict]] = {}
+        for scan in self.scans(platform, since=since, until=until):
+            pairs.setdefault(scan['scope'], []).append(scan)
+
+        sql = ("SELECT a.scope, a.entity, a.risk_level AS old_risk, b.risk_level AS new_risk, "
+               "a.scan_time AS old_scan_time, b.scan_time AS new_scan_time "
+               "FROM findings a JOIN findings b ON b.scan_id = ? AND b.entity = a.entity AND b.type IS a.type "
+               "WHERE a.scan_id = ? AND a.risk_level IS NOT b.risk_level")
+        extra: List = []
+        if from_risk:
+            sql += " AND a.risk_level = ?"
+            extra.append(from_risk)
+        if to_risk:
+            sql += " AND b.risk_level = ?"
+            extra.append(to_risk)
+
+        changes: List[Dict] = []
+        for scope, scans in sorted(pairs.items()):
+            if len(scans) < 2:
+                continue
+            changes.extend(self._query(sql + " ORDER BY a.entity",
+                                       [scans[-1]['scan_id'], scans[0]['scan_id'], *extra]))
+        return changes
+
+    def entity_history(self, platform: str, entity: str) -> List[Dict]:
+        """Risk level of one entity in every completed scan, oldest first."""
+        return self._query(
+            "SELECT f.scan_time, f.scope, f.risk_level FROM findings f "
+            "JOIN scans s ON s.scan_id = f.scan_id AND s.completed = 1 "
+            "WHERE f.platform = ? AND f.entity = ? ORDER BY f.scan_time",
+            (platform, entity))
+
+
+def print_table(rows: List[Dict], columns: List[str]) -> None:
+    """Print rows as aligned columns."""
+    if not rows:
+        print("   (no results)")
+        return
+    widths = {c: max(len(c), *(len(str(row.get(c, ''))) for row in rows)) for c in columns}
+    print("   " + "  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("   " + "  ".join(str(row.get(c, '')).ljust(widths[c]) for c in columns))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Query the history of recorded scan findings',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+    # Record scans by passing --store to any scanner
+    python github_copilot_auditor.py --org my-org --store findings.db
+
+    # Which repositories went from LOW to CRITICAL this month?
+    python findings_store.py --db findings.db changes --platform github --since 2024-06-01 \\
+        --from-risk LOW --to-risk CRITICAL
+
+    # Risk levels over time, and the history of one repository
+    python findings_store.py --db findings.db trend --platform github
+    python findings_store.py --db findings.db history --platform github --entity my-org/my-repo
+        """
+    )
+    parser.add_argument('--db', required=True, help='Findings store (SQLite file)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scans_cmd = commands.add_parser('scans', help='List recorded scans')
+    scans_cmd.add_argument('--platform', choices=PLATFORMS)
+    scans_cmd.add_argument('--scope', help='Organization, tenant or site')
+
+    trend_cmd = commands.add_parser('trend', help='Findings per risk level per scan')
+    trend_cmd.add_argument('--platform', choices=PLATFORMS, required=True)
+    trend_cmd.add_argument('--scope', help='Organization, tenant or site')
+    trend_cmd.add_argument('--since', help='Only scans at or after this date (YYYY-MM-DD)')
+
+    changes_cmd = commands.add_parser('changes', help='Entities whose risk level changed in a period')
+    changes_cmd.add_argument('--platform', choices=PLATFORMS, required=True)
+    changes_cmd.add_argument('--since', required=True, help='Start of the period (YYYY-MM-DD)')
+    changes_cmd.add_argument('--until', help='End of the period (default: latest scan)')
+    changes_cmd.add_argument('--from-risk', help='Only changes away from this risk level')
+    changes_cmd.add_argument('--to-risk', help='Only changes to this risk level')
+
+    history_cmd = commands.add_parser('history', help='Risk level of one entity over time')
+    history_cmd.add_argument('--platform', choices=PLATFORMS, required=True)
+    history_cmd.add_argument('--entity', required=True, help='repo_name, email, key or id')
+
+    args = parser.parse_args()
+
+    try:
+        store = FindingsStore(args.db)
+        if args.command == 'scans':
+            print_table(store.scans(args.platform, args.scope),
+                        ['scan_id', 'platform', 'scope', 'scan_time', 'finding_count'])
+        elif args.command == 'trend':
+            print_table(store.risk_trend(args.platform, args.scope, args.since),
+                        ['scan_time', 'scope', 'risk_level', 'count'])
+        elif args.command == 'changes':
+            # A bare date as --until means the whole day
+            until = f"{args.until}T23:59:59Z" if args.until and len(args.until) == 10 else args.until
+            print_table(store.risk_changes(args.platform, args.since, until, args.from_risk, args.to_risk),
+                        ['scope', 'entity', 'old_risk', 'new_risk', 'old_scan_time', 'new_scan_time'])
+        elif args.command == 'history':
+            print_table(store.entity_history(args.platform, args.entity), ['scan_time', 'scope', 'risk_level'])
+    except sqlite3.Error as e:
+        print(f"❌ Could not query {args.db}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
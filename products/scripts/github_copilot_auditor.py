@@ -24,21 +24,192 @@ import csv
 import argparse
 import sys
 import os
-import time
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from audit_checkpoint import AuditCheckpoint
+from columnar_export import ColumnarWriter, is_available as columnar_export_available
+from concurrent_map import ordered_map
+from findings_store import FindingsStore, PLATFORM_GITHUB
+from http_cache import HTTPCache
+from http_client import create_session, DEFAULT_POOL_SIZE
+from rate_limiter import RateLimitBudget
+from request_metrics import reporting_metrics
+from scan_diff import CHANGE_ADDED, CHANGE_REMOVED, CHANGE_RISK, diff_scans, iter_csv_rows, write_changes
+
+
+class AuditAbortedError(Exception):
+    """Raised when an audit stops on a recoverable error (403, network failure)."""
+
+
+# The only repository fields the audit uses; everything else in the API payload is dropped
+REPO_FIELDS = ('full_name', 'private', 'html_url', 'created_at', 'updated_at', 'pushed_at')
+
+# GraphQL enumeration asks only for the fields in REPO_FIELDS
+GRAPHQL_REPOS_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { nameWithOwner isPrivate url createdAt updatedAt pushedAt }
+    }
+  }
+}
+"""
+
+ENUMERATION_BACKENDS = ('rest', 'graphql')
+
+REPORT_FIELDNAMES = ['repo_name', 'is_private', 'copilot_enabled', 'risk_level', 'url',
+                     'created_at', 'updated_at', 'pushed_at']
+
+
+def load_previous_results(path: str) -> Dict[str, Dict]:
+    """
+    Load a previous audit report for incremental runs.
+    
+    Args:
+        path: Path to a CSV report written by generate_report()
+        
+    Returns:
+        Previous result rows keyed by repo_name
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return {row['repo_name']: row for row in csv.DictReader(f) if row.get('repo_name')}
+
+
+def parse_org_list(org_args: Optional[List[str]], org_file: Optional[str] = None) -> List[str]:
+    """
+    Build the list of organizations to audit.
+    
+    Args:
+        org_args: Values given to --org; each may hold several comma-separated names
+        org_file: Optional file with one organization per line (# starts a comment)
+        
+    Returns:
+        Organization names, de-duplicated, in the order given
+    """
+    names = []
+    for value in org_args or []:
+        names.extend(value.split(','))
+    
+    if org_file:
+        with open(org_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                names.append(line.split('#', 1)[0])
+    
+    orgs = []
+    for name in names:
+        name = name.strip()
+        if name and name not in orgs:
+            orgs.append(name)
+    return orgs
+
+
+def truncate_report(path: str, keep_rows: int) -> int:
+    """
+    Cut a partial report back to its header and first keep_rows rows.
+    
+    Rows are flushed one at a time but the checkpoint is saved only every
+    few results, so after a crash the report can hold rows the checkpoint
+    does not count. Those repositories are checked again on resume; cutting
+    their rows first keeps them from being written twice.
+    
+    Args:
+        path: Partial CSV report of the interrupted run
+        keep_rows: Rows counted by the checkpoint (its checked_count)
+        
+    Returns:
+        Number of rows dropped
+    """
+    dropped = 0
+    tmp_path = f"{path}.tmp"
+    with open(path, 'r', newline='', encoding='utf-8') as src, \
+            open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+        writer = csv.writer(dst)
+        for index, row in enumerate(csv.reader(src)):
+            # Index 0 is the header
+            if index <= keep_rows:
+                writer.writerow(row)
+            else:
+                dropped += 1
+    
+    if dropped:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+    return dropped
+
+
+def merge_reports(report_files: List[str], output_file: str) -> int:
+    """
+    Concatenate per-organization CSV reports into one merged report.
+    
+    Rows are copied one at a time, so merging stays flat in memory.
+    
+    Args:
+        report_files: Per-organization reports written by generate_report()
+        output_file: Path of the merged report
+        
+    Returns:
+        Number of rows written
+    """
+    rows = 0
+    with open(output_file, 'w', newline='', encoding='utf-8') as merged:
+        writer = csv.DictWriter(merged, fieldnames=REPORT_FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        for report_file in report_files:
+            with open(report_file, 'r', newline='', encoding='utf-8') as csvfile:
+                for row in csv.DictReader(csvfile):
+                    writer.writerow(row)
+                    rows += 1
+    return rows
+
+
+def report_changes(previous_file: str, report_file: str) -> str:
+    """
+    Write the repositories added, removed or changed in risk since a previous report.
+    
+    Args:
+        previous_file: Earlier audit CSV
+        report_file: Audit CSV just generated
+        
+    Returns:
+        Path of the change report (REPORT_changes.csv)
+    """
+    changes_file = f"{os.path.splitext(report_file)[0]}_changes.csv"
+    with open(changes_file, 'w', newline='', encoding='utf-8') as csvfile:
+        counts = write_changes(diff_scans(iter_csv_rows(previous_file), iter_csv_rows(report_file)), csvfile)
+    
+    print(f"\n🔀 Changes since {previous_file}: {changes_file}")
+    print(f"   Added: {counts[CHANGE_ADDED]}, removed: {counts[CHANGE_REMOVED]}, "
+          f"risk changed: {counts[CHANGE_RISK]}")
+    return changes_file
+
 
 class GitHubCopilotAuditor:
     """Main class for auditing GitHub organizations for Copilot usage."""
     
-    def __init__(self, token: str, org_name: str):
+    def __init__(self, token: str, org_name: str, workers: int = 1,
+                 budget: Optional[RateLimitBudget] = None,
+                 cache: Optional[HTTPCache] = None,
+                 previous_results: Optional[Dict[str, Dict]] = None,
+                 checkpoint: Optional[AuditCheckpoint] = None,
+                 enumeration: str = 'rest'):
         """
         Initialize the auditor.
         
         Args:
             token: GitHub Personal Access Token (PAT)
             org_name: Name of the GitHub organization to audit
+            workers: Number of concurrent Copilot checks (1 = sequential)
+            budget: Rate limit budget to share (default: a new one per auditor)
+            cache: Optional on-disk cache for conditional (ETag) requests
+            previous_results: Rows from a previous audit keyed by repo_name;
+                unchanged repositories are carried forward without a Copilot check
+            checkpoint: Optional state file for saving and resuming progress
+            enumeration: Repository listing backend, 'rest' or 'graphql'
         """
         self.token = token
         self.org_name = org_name
@@ -48,40 +219,154 @@ class GitHubCopilotAuditor:
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "GitHub-Copilot-Auditor/1.0"
         }
-        self.repos: List[Dict] = []
-        self.rate_limit_remaining = None
-        self.rate_limit_reset = None
+        self.workers = max(1, workers)
+        # One budget shared by every request and worker thread
+        self.budget = budget or RateLimitBudget()
+        # Pooled keep-alive session, sized so every worker gets a connection
+        self.session = create_session(self.headers, pool_size=max(DEFAULT_POOL_SIZE, self.workers))
+        self.cache = cache
+        self.previous_results = previous_results or {}
+        self.unchanged_count = 0
+        self.checkpoint = checkpoint
+        if enumeration not in ENUMERATION_BACKENDS:
+            raise ValueError(f"enumeration must be one of {ENUMERATION_BACKENDS}, not '{enumeration}'")
+        self.enumeration = enumeration
+        self._stats_lock = threading.Lock()
+        self._cancelled = threading.Event()
     
     def check_rate_limit(self) -> None:
-        """Check and handle GitHub API rate limits."""
-        response = requests.get(f"{self.base_url}/rate_limit", headers=self.headers)
+        """
+        Seed the rate limit budget from GET /rate_limit.
+        
+        Only needed once per run; afterwards the budget is kept current from
+        the rate limit headers returned on every API response.
+        """
+        response = self.session.get(f"{self.base_url}/rate_limit")
         if response.status_code == 200:
-            data = response.json()
-            self.rate_limit_remaining = data['resources']['core']['remaining']
-            self.rate_limit_reset = data['resources']['core']['reset']
+            core = response.json()['resources']['core']
+            self.budget.update_from_headers({
+                'X-RateLimit-Remaining': str(core['remaining']),
+                'X-RateLimit-Reset': str(core['reset'])
+            })
+    
+    def api_get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Send a GET request paced by the shared rate limit budget.
+        
+        When a cache is configured, the request is made conditional on the
+        cached ETag/Last-Modified. A 304 reply is served from the cache and
+        its request is refunded to the budget.
+        
+        Args:
+            url: Full request URL
+            params: Optional query parameters
             
-            if self.rate_limit_remaining < 10:
-                wait_time = self.rate_limit_reset - time.time()
-                if wait_time > 0:
-                    print(f"⚠️  Rate limit approaching. Waiting {int(wait_time)} seconds...")
-                    time.sleep(wait_time + 1)
+        Returns:
+            The HTTP response
+        """
+        cache_key = None
+        cached = None
+        headers = None
+        if self.cache:
+            cache_key = self.cache.make_key(url, params)
+            cached = self.cache.get(cache_key)
+            headers = self.cache.conditional_headers(cached)
+        
+        self.budget.acquire()
+        response = self.session.get(url, params=params, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            self.budget.refund()
+            self.budget.update_from_headers(response.headers)
+            return self.cache.to_response(cached, response)
+        
+        self.budget.update_from_headers(response.headers)
+        if self.cache:
+            self.cache.store(cache_key, response)
+        return response
     
-    def get_all_repos(self) -> List[Dict]:
+    def api_post(self, url: str, payload: Dict) -> requests.Response:
         """
-        Fetch all repositories for the organization.
+        Send a JSON POST request (used for the GraphQL API).
         
+        GraphQL has its own rate limit, separate from the REST budget that
+        api_get paces, so these requests do not draw on it.
+        
+        Args:
+            url: Full request URL
+            payload: JSON body
+            
         Returns:
-            List of repository dictionaries
+            The HTTP response
         """
-        repos = []
-        page = 1
-        per_page = 100
+        return self.session.post(url, json=payload)
+    
+    def iter_repos(self) -> Iterator[Dict]:
+        """
+        Stream the organization's repositories page by page.
+        
+        Pages come from the REST or GraphQL backend (see ``enumeration``).
+        Each repository is trimmed to REPO_FIELDS, so only one page of full
+        API payloads is ever held in memory. With a checkpoint, each page is
+        saved as it arrives and a resumed run first replays the repositories
+        fetched but not yet checked, then continues from the next page.
+        
+        Yields:
+            Trimmed repository dictionaries
+            
+        Raises:
+            AuditAbortedError: On a 403 or network error; fetched pages stay checkpointed
+        """
+        start = None
+        total = 0
         
         print(f"🔍 Fetching repositories for organization: {self.org_name}")
         
-        while True:
+        if self.checkpoint:
+            if self.checkpoint.pending_repos:
+                print(f"   Resuming with {len(self.checkpoint.pending_repos)} repositories fetched but not yet checked")
+                yield from list(self.checkpoint.pending_repos)
+            if self.checkpoint.repos_complete:
+                return
+            start = self.checkpoint.next_page
+            if start is not None:
+                print("   Resuming after the last fetched page")
+        
+        if self.budget.remaining is None:
             self.check_rate_limit()
+        
+        if self.enumeration == 'graphql':
+            pages = self.iter_repo_pages_graphql(start)
+        else:
+            pages = self.iter_repo_pages_rest(start)
+        
+        for page_number, (page_repos, next_page) in enumerate(pages, 1):
+            total += len(page_repos)
+            if self.checkpoint:
+                self.checkpoint.record_page(page_repos, next_page)
+            print(f"   Found {len(page_repos)} repositories (page {page_number})...")
             
+            yield from page_repos
+        
+        if self.checkpoint:
+            self.checkpoint.mark_repos_complete()
+        
+        print(f"✅ Finished fetching repositories ({total} found this run)")
+    
+    def iter_repo_pages_rest(self, start: Optional[int] = None) -> Iterator[Tuple[List[Dict], int]]:
+        """
+        Page through GET /orgs/{org}/repos.
+        
+        Args:
+            start: Page number to start from (default: 1)
+            
+        Yields:
+            (trimmed repositories on the page, number of the next page)
+        """
+        page = start or 1
+        per_page = 100
+        
+        while True:
             url = f"{self.base_url}/orgs/{self.org_name}/repos"
             params = {
                 "page": page,
@@ -90,7 +375,7 @@ class GitHubCopilotAuditor:
             }
             
             try:
-                response = requests.get(url, headers=self.headers, params=params)
+                response = self.api_get(url, params=params)
                 
                 if response.status_code == 401:
                     print("❌ Authentication failed. Please check your GitHub token.")
@@ -99,30 +384,98 @@ class GitHubCopilotAuditor:
                     print(f"❌ Organization '{self.org_name}' not found.")
                     sys.exit(1)
                 elif response.status_code == 403:
-                    print("❌ Access forbidden. Check token permissions and rate limits.")
-                    sys.exit(1)
+                    raise AuditAbortedError("Access forbidden. Check token permissions and rate limits.")
                 
                 response.raise_for_status()
                 data = response.json()
                 
-                if not data:
-                    break
-                
-                repos.extend(data)
-                print(f"   Found {len(data)} repositories (page {page})...")
+            except requests.exceptions.RequestException as e:
+                raise AuditAbortedError(f"Error fetching repositories: {e}") from e
+            
+            if not data:
+                return
+            
+            page_repos = [{field: repo.get(field) for field in REPO_FIELDS} for repo in data]
+            del data
+            
+            yield page_repos, page + 1
+            
+            # Check if there are more pages
+            if len(page_repos) < per_page:
+                return
+            
+            page += 1
+    
+    def iter_repo_pages_graphql(self, start: Optional[str] = None) -> Iterator[Tuple[List[Dict], str]]:
+        """
+        Page through the organization's repositories with the GraphQL API.
+        
+        Only the handful of fields the audit needs are requested, so each
+        page is a small fraction of the size of the REST payload.
+        
+        Args:
+            start: Cursor to continue after (default: first page)
+            
+        Yields:
+            (trimmed repositories on the page, cursor for the next page)
+        """
+        cursor = start
+        
+        while True:
+            try:
+                response = self.api_post(
+                    f"{self.base_url}/graphql",
+                    {"query": GRAPHQL_REPOS_QUERY, "variables": {"org": self.org_name, "cursor": cursor}}
+                )
                 
-                # Check if there are more pages
-                if len(data) < per_page:
-                    break
+                if response.status_code == 401:
+                    print("❌ Authentication failed. Please check your GitHub token.")
+                    sys.exit(1)
+                elif response.status_code == 403:
+                    raise AuditAbortedError("Access forbidden. Check token permissions and rate limits.")
                 
-                page += 1
+                response.raise_for_status()
+                data = response.json()
                 
             except requests.exceptions.RequestException as e:
-                print(f"❌ Error fetching repositories: {e}")
-                sys.exit(1)
+                raise AuditAbortedError(f"Error fetching repositories: {e}") from e
+            
+            errors = data.get('errors')
+            if errors:
+                if any(error.get('type') == 'NOT_FOUND' for error in errors):
+                    print(f"❌ Organization '{self.org_name}' not found.")
+                    sys.exit(1)
+                raise AuditAbortedError(f"GraphQL error: {errors[0].get('message', errors[0])}")
+            
+            connection = data['data']['organization']['repositories']
+            page_repos = [
+                {
+                    'full_name': node['nameWithOwner'],
+                    'private': node['isPrivate'],
+                    'html_url': node['url'],
+                    'created_at': node.get('createdAt'),
+                    'updated_at': node.get('updatedAt'),
+                    'pushed_at': node.get('pushedAt')
+                }
+                for node in connection['nodes']
+            ]
+            page_info = connection['pageInfo']
+            cursor = page_info['endCursor']
+            
+            if page_repos:
+                yield page_repos, cursor
+            
+            if not page_info['hasNextPage']:
+                return
+    
+    def get_all_repos(self) -> List[Dict]:
+        """
+        Fetch all repositories for the organization.
         
-        print(f"✅ Total repositories found: {len(repos)}")
-        return repos
+        Returns:
+            List of trimmed repository dictionaries (see REPO_FIELDS)
+        """
+        return list(self.iter_repos())
     
     def check_copilot_access(self, repo_full_name: str) -> bool:
         """
@@ -133,12 +486,16 @@ class GitHubCopilotAuditor:
             
         Returns:
             True if Copilot is enabled, False if not, or "Error" if check failed
+            
+        Raises:
+            AuditAbortedError: If the API could not be reached; the audit can be resumed
         """
-        self.check_rate_limit()
-        
         # Use the Copilot API endpoint
         url = f"{self.base_url}/repos/{repo_full_name}/copilot"
-        response = requests.get(url, headers=self.headers)
+        try:
+            response = self.api_get(url)
+        except requests.exceptions.RequestException as e:
+            raise AuditAbortedError(f"Error checking Copilot for {repo_full_name}: {e}") from e
         
         if response.status_code == 200:
             data = response.json()
@@ -172,74 +529,234 @@ class GitHubCopilotAuditor:
         
         return "LOW"
     
-    def audit_organization(self) -> List[Dict]:
+    def carry_forward(self, repo: Dict) -> Optional[Dict]:
         """
-        Perform complete audit of the organization.
+        Reuse the previous audit row for a repository whose metadata is unchanged.
+        
+        A repository is unchanged when its visibility, updated_at and pushed_at
+        match the previous audit. Missing timestamps (e.g. pushedAt: null for a
+        repository never pushed to) are written to the report as empty
+        strings and compared as such. Rows whose Copilot check failed are
+        always re-checked. Older reports without a pushed_at column are
+        compared on updated_at only.
         
+        Args:
+            repo: Repository dictionary from the GitHub API
+            
         Returns:
-            List of audit results
+            The carried-forward result row, or None if the repo must be re-checked
         """
-        repos = self.get_all_repos()
-        results = []
+        previous = self.previous_results.get(repo['full_name'])
+        if not previous or previous.get('copilot_enabled') == 'Error':
+            return None
         
-        print(f"\n🔎 Auditing {len(repos)} repositories for Copilot usage...")
+        if previous.get('is_private') != ('Yes' if repo['private'] else 'No'):
+            return None
+        if (previous.get('updated_at') or '') != (repo.get('updated_at') or ''):
+            return None
+        if 'pushed_at' in previous and (previous['pushed_at'] or '') != (repo.get('pushed_at') or ''):
+            return None
         
-        for i, repo in enumerate(repos, 1):
-            repo_name = repo['full_name']
-            is_private = repo['private']
-            
-            print(f"   [{i}/{len(repos)}] Checking {repo_name}...", end=" ")
-            
-            copilot_enabled = self.check_copilot_access(repo_name)
-            risk_level = self.assess_risk_level(is_private, copilot_enabled)
-            
-            result = {
-                'repo_name': repo_name,
-                'is_private': 'Yes' if is_private else 'No',
-                'copilot_enabled': 'Yes' if copilot_enabled else 'No' if copilot_enabled is False else 'Error',
-                'risk_level': risk_level,
-                'url': repo['html_url'],
-                'created_at': repo.get('created_at', ''),
-                'updated_at': repo.get('updated_at', '')
-            }
+        result = {field: previous.get(field, '') for field in REPORT_FIELDNAMES}
+        result['url'] = repo['html_url']
+        result['pushed_at'] = repo.get('pushed_at') or ''
+        return result
+    
+    def audit_repo(self, repo: Dict) -> Dict:
+        """
+        Check a single repository and build its audit result row.
+        
+        Args:
+            repo: Repository dictionary from the GitHub API
             
-            results.append(result)
-            print(f"Risk: {risk_level}")
+        Returns:
+            Audit result dictionary
+        """
+        repo_name = repo['full_name']
+        is_private = repo['private']
+        
+        if self.previous_results:
+            result = self.carry_forward(repo)
+            if result:
+                with self._stats_lock:
+                    self.unchanged_count += 1
+                return result
+        
+        copilot_enabled = self.check_copilot_access(repo_name)
+        risk_level = self.assess_risk_level(is_private, copilot_enabled)
+        
+        # "Error" is truthy, so it must be told apart before the Yes/No test
+        if copilot_enabled == "Error":
+            copilot_flag = 'Error'
+        else:
+            copilot_flag = 'Yes' if copilot_enabled else 'No'
+        
+        return {
+            'repo_name': repo_name,
+            'is_private': 'Yes' if is_private else 'No',
+            'copilot_enabled': copilot_flag,
+            'risk_level': risk_level,
+            'url': repo['html_url'],
+            'created_at': repo.get('created_at', ''),
+            'updated_at': repo.get('updated_at', ''),
+            'pushed_at': repo.get('pushed_at', '')
+        }
+    
+    def iter_checks(self, repos: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Check repositories and yield their results in the original order.
+        
+        Repositories are pulled lazily, so a streaming source is consumed
+        only as fast as checks complete. With more than one worker, checks
+        run on a thread pool with a small bounded window of in-flight
+        repositories. Checks not yet started are cancelled if the caller
+        stops early (e.g. Ctrl-C).
+        
+        Args:
+            repos: Repository dictionaries (any iterable, including a generator)
             
-            # Small delay to be respectful of API rate limits
-            time.sleep(0.1)
+        Yields:
+            Audit result dictionaries
+        """
+        yield from ordered_map(self.audit_repo, repos, self.workers)
+    
+    def cancel(self) -> None:
+        """Ask a running audit (possibly on another thread) to stop after the current repository."""
+        self._cancelled.set()
+    
+    def iter_audit(self) -> Iterator[Dict]:
+        """
+        Stream the complete audit: repository pages feed Copilot checks.
+        
+        Results are yielded in repository order as soon as they are ready.
+        With a checkpoint, a result is recorded only after the consumer has
+        handled it (e.g. written it to the report), and progress is saved
+        periodically and on any interruption.
+        
+        Yields:
+            Audit result dictionaries
+        """
+        print(f"\n🔎 Auditing repositories for Copilot usage...")
+        if self.previous_results:
+            print(f"   Incremental mode: {len(self.previous_results)} repositories in previous audit")
+        if self.checkpoint and self.checkpoint.checked_count:
+            print(f"   Resuming after {self.checkpoint.checked_count} repositories already checked")
+        if self.workers > 1:
+            print(f"   Using {self.workers} concurrent workers")
+        
+        checked = self.checkpoint.checked_count if self.checkpoint else 0
+        try:
+            for result in self.iter_checks(self.iter_repos()):
+                if self._cancelled.is_set():
+                    raise AuditAbortedError(f"Audit of {self.org_name} cancelled")
+                checked += 1
+                print(f"   [{checked}] Checked {result['repo_name']}... Risk: {result['risk_level']}")
+                yield result
+                if self.checkpoint:
+                    self.checkpoint.record_result(result)
+        except BaseException:
+            if self.checkpoint:
+                self.checkpoint.save()
+            raise
         
-        return results
+        if self.checkpoint:
+            self.checkpoint.save()
+        
+        if self.previous_results:
+            print(f"   ♻️  Carried forward {self.unchanged_count} unchanged repositories")
     
-    def generate_report(self, results: List[Dict], output_file: str = None) -> None:
+    def audit_organization(self) -> List[Dict]:
+        """
+        Perform complete audit of the organization.
+        
+        Collects iter_audit() into a list. Prefer streaming iter_audit()
+        into generate_report() for large organizations. When resuming from
+        a checkpoint, only the repositories checked in this run are returned.
+        
+        Returns:
+            List of audit results
+        """
+        return list(self.iter_audit())
+    
+    def default_output_file(self) -> str:
+        """Build the default timestamped report file name."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"github_copilot_audit_{self.org_name}_{timestamp}.csv"
+    
+    def generate_report(self, results: Iterable[Dict], output_file: str = None,
+                        append: bool = False, store: Optional[FindingsStore] = None,
+                        export_file: Optional[str] = None) -> Dict[str, int]:
         """
         Generate CSV report from audit results.
         
+        Rows are written and flushed one at a time, so results can be
+        streamed in from iter_audit() and a partial report survives a crash.
+        
         Args:
-            results: List of audit result dictionaries
+            results: Audit result dictionaries (a list or a generator)
             output_file: Optional output file path (default: auto-generated)
+            append: Append to an existing partial report (used when resuming)
+            store: Optional findings store that also records the rows as one scan
+            export_file: Optional typed Parquet/Arrow copy of the report (needs pyarrow)
+            
+        Returns:
+            Number of repositories per risk level
         """
         if not output_file:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"github_copilot_audit_{self.org_name}_{timestamp}.csv"
+            output_file = self.default_output_file()
         
-        fieldnames = ['repo_name', 'is_private', 'copilot_enabled', 'risk_level', 'url', 'created_at', 'updated_at']
+        risk_counts = {}
+        total = 0
+        # Every row also goes to these (add/complete/close)
+        recorder = store.open_scan(PLATFORM_GITHUB, self.org_name) if store else None
+        sinks = [recorder] if recorder else []
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
+        try:
+            if export_file:
+                sinks.append(ColumnarWriter(export_file, PLATFORM_GITHUB))
+            
+            if append and os.path.exists(output_file):
+                if self.checkpoint:
+                    dropped = truncate_report(output_file, self.checkpoint.checked_count)
+                    if dropped:
+                        print(f"   Dropped {dropped} rows written after the last checkpoint; checking them again")
+                # Count rows written by the interrupted run for the summary
+                with open(output_file, 'r', newline='', encoding='utf-8') as csvfile:
+                    for row in csv.DictReader(csvfile):
+                        risk_counts[row['risk_level']] = risk_counts.get(row['risk_level'], 0) + 1
+                        total += 1
+                        for sink in sinks:
+                            sink.add(row)
+            else:
+                append = False
+            
+            with open(output_file, 'a' if append else 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDNAMES)
+                if not append:
+                    writer.writeheader()
+                for result in results:
+                    writer.writerow(result)
+                    csvfile.flush()
+                    for sink in sinks:
+                        sink.add(result)
+                    risk = result['risk_level']
+                    risk_counts[risk] = risk_counts.get(risk, 0) + 1
+                    total += 1
+            
+            for sink in sinks:
+                sink.complete()
+        finally:
+            for sink in sinks:
+                sink.close()
         
         print(f"\n✅ Report generated: {output_file}")
-        print(f"   Total repositories audited: {len(results)}")
-        
-        # Print summary
-        risk_counts = {}
-        for result in results:
-            risk = result['risk_level']
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
+        if recorder:
+            print(f"   Recorded as scan {recorder.scan_id} in {store.path}")
+        if export_file:
+            print(f"   Exported to {export_file}")
+        print(f"   Total repositories audited: {total}")
         
-        print("\n📊 Risk Summary:")
+        print(f"\n📊 Risk Summary ({self.org_name}):")
         for risk, count in sorted(risk_counts.items(), key=lambda x: ['CRITICAL', 'HIGH', 'LOW'].index(x[0]) if x[0] in ['CRITICAL', 'HIGH', 'LOW'] else 99):
             print(f"   {risk}: {count}")
         
@@ -255,6 +772,8 @@ class GitHubCopilotAuditor:
             if high_count > 0:
                 print(f"   {high_count} HIGH risk repositories found (Copilot enabled on PRIVATE repos)")
                 print(f"   Review these repositories for potential IP/code leakage risks.")
+        
+        return risk_counts
 
 
 def main():
@@ -271,6 +790,9 @@ Example usage:
     export GITHUB_TOKEN=ghp_xxxxxxxxxxxx
     python github_copilot_auditor.py --org my-organization
     
+    # Several organizations under one rate limit budget, with a merged report
+    python github_copilot_auditor.py --org org-one org-two --org-file more_orgs.txt
+    
 Note: Your GitHub token needs the following permissions:
     - repo (read access to repositories)
     - read:org (read organization data)
@@ -290,46 +812,271 @@ Note: Your GitHub token needs the following permissions:
         '--org',
         '--organization',
         dest='org',
-        required=True,
-        help='GitHub organization name'
+        nargs='+',
+        help='GitHub organization name(s); several may be given, space- or comma-separated'
+    )
+    
+    parser.add_argument(
+        '--org-file',
+        help='File listing organizations to audit, one per line'
+    )
+    
+    parser.add_argument(
+        '--parallel-orgs',
+        type=int,
+        default=4,
+        help='Number of organizations audited concurrently (default: 4)'
     )
     
     parser.add_argument(
         '--output',
         '-o',
-        help='Output CSV file path (default: auto-generated)'
+        help='Output CSV file path; the merged report when auditing several organizations (default: auto-generated)'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=1,
+        help='Number of concurrent Copilot checks (default: 1, sequential)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for the ETag response cache (default: caching disabled)'
+    )
+    
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=100,
+        help='Maximum size of the response cache in MB (default: 100)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        metavar='PREVIOUS_AUDIT',
+        help='Previous audit CSV report; only new or changed repositories are re-checked'
+    )
+    
+    parser.add_argument(
+        '--checkpoint',
+        help='Checkpoint state file (default: github_copilot_audit_ORG.checkpoint.json)'
+    )
     
-    # Validate token
-    if not args.token:
-        print("❌ ERROR: GitHub token is required.")
-        print("   Set it via --token argument or GITHUB_TOKEN environment variable.")
-        print("   Example: export GITHUB_TOKEN=your_token_here")
-        sys.exit(1)
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume from the checkpoint left by an interrupted or failed audit'
+    )
+    
+    parser.add_argument(
+        '--store',
+        metavar='DB',
+        help='Also record the findings in this SQLite findings store (see findings_store.py)'
+    )
     
-    print("=" * 60)
-    print("GitHub Copilot Auditor")
-    print("=" * 60)
-    print()
+    parser.add_argument(
+        '--diff',
+        metavar='PREVIOUS_REPORT',
+        help='Also write REPORT_changes.csv with only the repositories added, removed or changed in risk '
+             'since this earlier audit CSV'
+    )
     
-    auditor = GitHubCopilotAuditor(args.token, args.org)
+    parser.add_argument(
+        '--export',
+        metavar='FILE',
+        help='Also write a typed Parquet (.parquet) or Arrow IPC (.arrow) copy of the report (needs pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--enumeration',
+        choices=ENUMERATION_BACKENDS,
+        default='rest',
+        help='Repository listing backend: REST pages or the smaller GraphQL payloads (default: rest)'
+    )
+    
+    parser.add_argument(
+        '--metrics-out',
+        metavar='FILE',
+        help='Also write per-endpoint HTTP metrics to FILE (.json, otherwise Prometheus text format)'
+    )
     
-    try:
-        results = auditor.audit_organization()
-        auditor.generate_report(results, args.output)
+    args = parser.parse_args()
+    with reporting_metrics(args.metrics_out):
+        # Validate token
+        if not args.token:
+            print("❌ ERROR: GitHub token is required.")
+            print("   Set it via --token argument or GITHUB_TOKEN environment variable.")
+            print("   Example: export GITHUB_TOKEN=your_token_here")
+            sys.exit(1)
         
-        print("\n✅ Audit complete!")
+        try:
+            orgs = parse_org_list(args.org, args.org_file)
+        except OSError as e:
+            print(f"❌ ERROR: Could not read organization file: {e}")
+            sys.exit(1)
+        if not orgs:
+            print("❌ ERROR: At least one organization is required (--org or --org-file).")
+            sys.exit(1)
+        
+        print("=" * 60)
+        print("GitHub Copilot Auditor")
+        print("=" * 60)
+        print()
+        
+        if args.workers < 1 or args.parallel_orgs < 1:
+            print("❌ ERROR: --workers and --parallel-orgs must be at least 1.")
+            sys.exit(1)
+        if args.checkpoint and len(orgs) > 1:
+            print("❌ ERROR: --checkpoint applies to single-organization audits only.")
+            print("   Multi-organization audits keep one default checkpoint file per organization.")
+            sys.exit(1)
+        
+        if args.export and not columnar_export_available():
+            print("❌ ERROR: --export needs pyarrow. Run: pip install pyarrow")
+            sys.exit(1)
+        if args.diff and not os.path.exists(args.diff):
+            print(f"❌ ERROR: Previous report '{args.diff}' not found.")
+            sys.exit(1)
+        if args.export and len(orgs) > 1:
+            print("❌ ERROR: --export applies to single-organization audits only.")
+            sys.exit(1)
+        
+        cache = HTTPCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+        store = FindingsStore(args.store) if args.store else None
+        
+        previous_results = None
+        if args.incremental:
+            try:
+                previous_results = load_previous_results(args.incremental)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"❌ ERROR: Could not load previous audit '{args.incremental}': {e}")
+                sys.exit(1)
+        
+        # Every organization draws on the same token, so they share one budget
+        budget = RateLimitBudget()
+        auditors = {}
+        checkpoint_paths = {}
+        jobs = {}
+        
+        for org in orgs:
+            checkpoint_path = args.checkpoint or f"github_copilot_audit_{org}.checkpoint.json"
+            checkpoint = None
+            if args.resume:
+                if os.path.exists(checkpoint_path):
+                    try:
+                        checkpoint = AuditCheckpoint.load(checkpoint_path, org, args.enumeration)
+                    except (OSError, ValueError) as e:
+                        print(f"❌ ERROR: Could not load checkpoint '{checkpoint_path}': {e}")
+                        sys.exit(1)
+                    print(f"♻️  Resuming {org} from checkpoint: {checkpoint_path}")
+                else:
+                    print(f"⚠️  No checkpoint found at {checkpoint_path}. Starting a new audit of {org}.")
+            
+            auditor = GitHubCopilotAuditor(args.token, org, workers=args.workers, budget=budget,
+                                           cache=cache, previous_results=previous_results,
+                                           enumeration=args.enumeration)
+            
+            # Resumed audits keep appending to the report the interrupted run started
+            resuming = checkpoint is not None and checkpoint.output_file is not None
+            if resuming:
+                output_file = checkpoint.output_file
+            else:
+                if len(orgs) == 1 and args.output:
+                    output_file = args.output
+                else:
+                    output_file = auditor.default_output_file()
+                checkpoint = AuditCheckpoint(checkpoint_path, org, output_file,
+                                             enumeration=args.enumeration)
+            auditor.checkpoint = checkpoint
+            
+            auditors[org] = auditor
+            checkpoint_paths[org] = checkpoint_path
+            jobs[org] = (auditor, output_file, resuming)
+        
+        def run_audit(auditor, output_file, resuming):
+            risk_counts = auditor.generate_report(auditor.iter_audit(), output_file, append=resuming, store=store,
+                                                  export_file=args.export)
+            auditor.checkpoint.clear()
+            return risk_counts
         
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Audit interrupted by user.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ Error during audit: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        if len(orgs) == 1:
+            try:
+                run_audit(*jobs[orgs[0]])
+                if args.diff:
+                    report_changes(args.diff, jobs[orgs[0]][1])
+                print("\n✅ Audit complete!")
+                
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Audit interrupted by user.")
+                print(f"   Progress saved to {checkpoint_paths[orgs[0]]}. Re-run with --resume to continue.")
+                sys.exit(1)
+            except AuditAbortedError as e:
+                print(f"\n❌ {e}")
+                print(f"   Progress saved to {checkpoint_paths[orgs[0]]}. Re-run with --resume to continue.")
+                sys.exit(1)
+            except Exception as e:
+                print(f"\n❌ Error during audit: {e}")
+                import traceback
+                traceback.print_exc()
+                sys.exit(1)
+            return
+        
+        print(f"🏢 Auditing {len(orgs)} organizations, {min(args.parallel_orgs, len(orgs))} at a time")
+        
+        org_reports = {}
+        failures = {}
+        executor = ThreadPoolExecutor(max_workers=min(args.parallel_orgs, len(orgs)))
+        futures = {org: executor.submit(run_audit, *jobs[org]) for org in orgs}
+        try:
+            for org, future in futures.items():
+                try:
+                    org_reports[org] = (future.result(), jobs[org][1])
+                except (AuditAbortedError, SystemExit) as e:
+                    failures[org] = str(e) or "organization could not be audited"
+                except Exception as e:
+                    failures[org] = f"Error during audit: {e}"
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Audit interrupted by user. Stopping all organizations...")
+            for auditor in auditors.values():
+                auditor.cancel()
+            executor.shutdown(wait=True)
+            print("   Progress saved per organization. Re-run with --resume to continue.")
+            sys.exit(1)
+        executor.shutdown(wait=True)
+        
+        merged_file = args.output or f"github_copilot_audit_merged_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        merged_rows = merge_reports([output for _, output in org_reports.values()], merged_file)
+        
+        print("\n" + "=" * 60)
+        print("📊 Multi-Organization Summary")
+        print("=" * 60)
+        totals = {}
+        for org in orgs:
+            if org in org_reports:
+                risk_counts = org_reports[org][0]
+                for risk, count in risk_counts.items():
+                    totals[risk] = totals.get(risk, 0) + count
+                summary = ", ".join(f"{risk}: {risk_counts.get(risk, 0)}" for risk in ('CRITICAL', 'HIGH', 'LOW'))
+                print(f"   {org}: {summary}")
+            else:
+                print(f"   {org}: ❌ {failures[org]}")
+        
+        print(f"\n✅ Merged report generated: {merged_file}")
+        print(f"   Total repositories audited: {merged_rows}")
+        for risk in ('CRITICAL', 'HIGH', 'LOW'):
+            print(f"   {risk}: {totals.get(risk, 0)}")
+        
+        if args.diff:
+            report_changes(args.diff, merged_file)
+        
+        if failures:
+            print(f"\n⚠️  {len(failures)} organization(s) did not finish. Re-run with --resume to continue.")
+            sys.exit(1)
+        
+        print("\n✅ Audit complete!")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Unified AI Governance Scan
+==========================
+
+Runs the GitHub Copilot auditor, the Microsoft 365 Copilot checker and the
+Atlassian AI scanner concurrently and writes one combined findings report.
+
+The scanners are blocking clients that already parallelize their own
+requests, each under its own rate-limit policy:
+
+- GitHub: one RateLimitBudget shared by every organization (same token)
+- Microsoft 365: an AIMD concurrency limiter driven by Graph throttling
+- Atlassian: 429 Retry-After backoff on a client shared by every site
+
+The orchestrator leaves those policies alone. Each platform scan runs on its
+own worker thread, scheduled from one asyncio event loop, and its findings
+are handed back to the loop as they are produced, where a single writer
+appends them to the combined report. Total wall time is therefore that of
+the slowest platform rather than the sum of all three. A platform that fails
+is reported without stopping the others.
+
+Usage:
+    python governance_scan.py --github-org my-org \\
+        --m365-tenant-id TENANT --m365-client-id CLIENT --m365-client-secret SECRET \\
+        --atlassian-domain mycompany.atlassian.net --atlassian-email me@example.com
+
+Author: AI Governance Team
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from adaptive_concurrency import AdaptiveConcurrencyLimiter
+from atlassian_ai_scanner import AtlassianAIScanner
+from atlassian_client import AtlassianClient
+from github_copilot_auditor import GitHubCopilotAuditor
+from m365_copilot_checker import M365CopilotChecker, DEFAULT_MAX_CONCURRENCY
+from rate_limiter import RateLimitBudget
+from request_metrics import reporting_metrics
+
+# Rows buffered between the scanner threads and the report writer
+QUEUE_SIZE = 1000
+
+COMBINED_FIELDNAMES = ['platform', 'scope', 'type', 'entity', 'risk_level', 'url', 'details']
+
+RISK_ORDER = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+# Combined-report columns; everything else a scanner reports goes into 'details'
+_COMMON_KEYS = {'type', 'name', 'email', 'key', 'repo_name', 'risk_level', 'url', 'site'}
+
+
+class ScanCancelledError(Exception):
+    """Raised inside a platform scan when the orchestrator is stopping."""
+
+
+def format_details(row: Dict, skip: Iterable[str] = ()) -> str:
+    """Join a row's remaining non-empty fields as 'key=value; ...'."""
+    skipped = _COMMON_KEYS.union(skip)
+    return '; '.join(f"{key}={value}" for key, value in row.items()
+                     if key not in skipped and value not in (None, ''))
+
+
+def github_finding(org: str, result: Dict) -> Dict:
+    """Convert a GitHub auditor result into a combined-report row."""
+    return {
+        'platform': 'GitHub',
+        'scope': org,
+        'type': 'Repository',
+        'entity': result.get('repo_name'),
+        'risk_level': result.get('risk_level'),
+        'url': result.get('url'),
+        'details': format_details(result),
+    }
+
+
+def m365_finding(tenant_id: str, row: Dict) -> Dict:
+    """Convert a Microsoft 365 report row into a combined-report row."""
+    return {
+        'platform': 'Microsoft 365',
+        'scope': tenant_id,
+        'type': row.get('type'),
+        'entity': row.get('email') or row.get('name'),
+        'risk_level': row.get('risk_level'),
+        'url': row.get('url'),
+        'details': format_details(row),
+    }
+
+
+def atlassian_finding(row: Dict) -> Dict:
+    """Convert an Atlassian scanner row into a combined-report row."""
+    return {
+        'platform': 'Atlassian',
+        'scope': row.get('site'),
+        'type': row.get('type'),
+        'entity': row.get('key') or row.get('name'),
+        'risk_level': row.get('risk_level'),
+        'url': None,
+        'details': format_details(row),
+    }
+
+
+class PlatformScan:
+    """One platform's scan: a blocking function producing combined-report rows."""
+
+    def __init__(self, platform: str, run: Callable[[], Iterable[Dict]],
+                 cancel: Optional[Callable[[], None]] = None):
+        """
+        Initialize the scan.
+
+        Args:
+            platform: Platform name shown in the summary
+            run: Blocking function returning (or yielding) combined-report rows
+            cancel: Optional function asking a running scan to stop early
+        """
+        self.platform = platform
+        self.run = run
+        self.cancel = cancel
+        self.row_count = 0
+        self.risk_counts: Dict[str, int] = {}
+        self.elapsed = 0.0
+        self.error: Optional[BaseException] = None
+
+
+class GovernanceScanner:
+    """Runs several platform scans concurrently into one combined report."""
+
+    def __init__(self, scans: List[PlatformScan], queue_size: int = QUEUE_SIZE):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            scans: Platform scans to run
+            queue_size: Rows buffered before scanner threads wait for the writer
+        """
+        self.scans = scans
+        self.queue_size = queue_size
+        self.elapsed = 0.0
+        self._stopping = threading.Event()
+
+    def _produce(self, scan: PlatformScan, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+        """Run one scan on a worker thread, handing each row to the event loop."""
+        for row in scan.run():
+            if self._stopping.is_set():
+                raise ScanCancelledError(f"{scan.platform} scan cancelled")
+            # Blocks this thread (not the loop) while the writer catches up
+            asyncio.run_coroutine_threadsafe(queue.put(row), loop).result()
+            scan.row_count += 1
+            risk = row.get('risk_level') or 'UNKNOWN'
+            scan.risk_counts[risk] = scan.risk_counts.get(risk, 0) + 1
+
+    async def _run_scan(self, scan: PlatformScan, queue: asyncio.Queue) -> None:
+        start = time.monotonic()
+        try:
+            await asyncio.to_thread(self._produce, scan, asyncio.get_running_loop(), queue)
+        except Exception as e:
+            scan.error = e
+            print(f"\n❌ {scan.platform} scan failed: {e}")
+        except SystemExit as e:
+            # The scanners exit on fatal errors (bad credentials, unknown organization);
+            # that ends this platform's scan, not the whole run
+            scan.error = RuntimeError(f"scanner exited with status {e.code}")
+            print(f"\n❌ {scan.platform} scan failed: {scan.error}")
+        finally:
+            scan.elapsed = time.monotonic() - start
+
+    async def _write(self, queue: asyncio.Queue, writer: csv.DictWriter, csvfile) -> None:
+        while True:
+            row = await queue.get()
+            if row is None:
+                return
+            writer.writerow(row)
+            csvfile.flush()
+
+    async def run_async(self, output_file: str) -> int:
+        """
+        Run every scan concurrently, streaming findings into output_file.
+
+        Args:
+            output_file: Path of the combined CSV report
+
+        Returns:
+            Number of findings written
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        start = time.monotonic()
+        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=COMBINED_FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+            writer_task = asyncio.create_task(self._write(queue, writer, csvfile))
+            try:
+                await asyncio.gather(*(self._run_scan(scan, queue) for scan in self.scans))
+            finally:
+                # Stop producers that are still running (e.g. on Ctrl+C)
+                self._stopping.set()
+                for scan in self.scans:
+                    if scan.cancel:
+                        scan.cancel()
+                await queue.put(None)
+                await writer_task
+        self.elapsed = time.monotonic() - start
+        return sum(scan.row_count for scan in self.scans)
+
+    def run(self, output_file: str) -> int:
+        """Blocking wrapper around run_async() on a new event loop."""
+        return asyncio.run(self.run_async(output_file))
+
+    def print_summary(self) -> None:
+        """Print findings, risk levels and wall time per platform."""
+        print("\n" + "=" * 60)
+        print("📊 Governance Scan Summary")
+        print("=" * 60)
+        for scan in self.scans:
+            if scan.error:
+                print(f"   {scan.platform}: ❌ {scan.error} ({scan.elapsed:.1f}s)")
+                continue
+            risks = ", ".join(f"{risk}: {scan.risk_counts[risk]}" for risk in
+                              sorted(scan.risk_counts, key=lambda r: RISK_ORDER.index(r) if r in RISK_ORDER else 99))
+            print(f"   {scan.platform}: {scan.row_count} findings in {scan.elapsed:.1f}s"
+                  + (f" ({risks})" if risks else ""))
+        print(f"   Wall time: {self.elapsed:.1f}s "
+              f"(sum of platforms: {sum(scan.elapsed for scan in self.scans):.1f}s)")
+
+
+def github_scans(token: str, orgs: List[str], workers: int) -> List[PlatformScan]:
+    """Build one scan per GitHub organization, all drawing on one rate limit budget."""
+    budget = RateLimitBudget()
+    scans = []
+    for org in orgs:
+        auditor = GitHubCopilotAuditor(token, org, workers=workers, budget=budget)
+
+        def run(auditor=auditor):
+            auditor.check_rate_limit()
+            return (github_finding(auditor.org_name, result) for result in auditor.iter_audit())
+
+        scans.append(PlatformScan(f"GitHub ({org})", run, cancel=auditor.cancel))
+    return scans
+
+
+def m365_scan(tenant_id: str, client_id: str, client_secret: str, max_concurrency: int,
+              scan_sites: bool) -> PlatformScan:
+    """Build the Microsoft 365 scan."""
+    checker = M365CopilotChecker(tenant_id, client_id, client_secret, pool_size=max_concurrency,
+                                 limiter=AdaptiveConcurrencyLimiter(maximum=max_concurrency))
+    if scan_sites:
+        checker.enable_site_scan()
+
+    def run():
+        checker.check(stream=True)
+        return (m365_finding(tenant_id, row) for row in checker.iter_report_rows())
+
+    return PlatformScan("Microsoft 365", run)
+
+
+def atlassian_scan(domains: List[str], email: str, api_token: str, workers: int) -> PlatformScan:
+    """Build one Atlassian scan covering every site, on one shared client."""
+    client = AtlassianClient(email, api_token, pool_size=workers)
+
+    def run():
+        for domain in domains:
+            for row in AtlassianAIScanner(domain, workers=workers, client=client).scan():
+                yield atlassian_finding(row)
+
+    return PlatformScan("Atlassian", run)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Run the GitHub, Microsoft 365 and Atlassian AI scans concurrently into one report',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+    export GITHUB_TOKEN=ghp_xxxxxxxxxxxx
+    export M365_CLIENT_SECRET=xxxxxxxx
+    export ATLASSIAN_API_TOKEN=xxxxxxxx
+    python governance_scan.py --github-org my-org \\
+        --m365-tenant-id TENANT_ID --m365-client-id CLIENT_ID \\
+        --atlassian-domain mycompany.atlassian.net --atlassian-email admin@mycompany.com
+
+A platform is scanned when its arguments are given; any combination works.
+        """
+    )
+
+    parser.add_argument('--output', '-o', help='Combined CSV report path (default: auto-generated)')
+
+    github = parser.add_argument_group('GitHub')
+    github.add_argument('--github-org', nargs='+', help='GitHub organization(s) to audit')
+    github.add_argument('--github-token', default=os.getenv('GITHUB_TOKEN'),
+                        help='GitHub token (default: GITHUB_TOKEN environment variable)')
+    github.add_argument('--github-workers', type=int, default=8,
+                        help='Concurrent Copilot checks per organization (default: 8)')
+
+    m365 = parser.add_argument_group('Microsoft 365')
+    m365.add_argument('--m365-tenant-id', help='Azure AD Tenant ID')
+    m365.add_argument('--m365-client-id', help='Azure AD Application (Client) ID')
+    m365.add_argument('--m365-client-secret', default=os.getenv('M365_CLIENT_SECRET'),
+                      help='Client secret (default: M365_CLIENT_SECRET environment variable)')
+    m365.add_argument('--m365-max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                      help=f'Upper bound for concurrent Graph requests (default: {DEFAULT_MAX_CONCURRENCY})')
+    m365.add_argument('--m365-scan-sites', action='store_true',
+                      help='Also scan SharePoint site sharing and score its exposure')
+
+    atlassian = parser.add_argument_group('Atlassian')
+    atlassian.add_argument('--atlassian-domain', nargs='+', help='Atlassian site domain(s)')
+    atlassian.add_argument('--atlassian-email', help='Atlassian account email')
+    atlassian.add_argument('--atlassian-token', default=os.getenv('ATLASSIAN_API_TOKEN'),
+                           help='Atlassian API token (default: ATLASSIAN_API_TOKEN environment variable)')
+    atlassian.add_argument('--atlassian-workers', type=int, default=8,
+                           help='Confluence spaces scanned concurrently (default: 8)')
+
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Also write per-endpoint HTTP metrics of all platforms to FILE '
+                             '(.json, otherwise Prometheus text format)')
+
+    args = parser.parse_args()
+    with reporting_metrics(args.metrics_out):
+        scans: List[PlatformScan] = []
+        if args.github_org:
+            if not args.github_token:
+                parser.error("--github-org needs --github-token or GITHUB_TOKEN")
+            scans.extend(github_scans(args.github_token, args.github_org, args.github_workers))
+        if args.m365_tenant_id:
+            if not (args.m365_client_id and args.m365_client_secret):
+                parser.error("--m365-tenant-id needs --m365-client-id and --m365-client-secret "
+                             "(or M365_CLIENT_SECRET)")
+            scans.append(m365_scan(args.m365_tenant_id, args.m365_client_id, args.m365_client_secret,
+                                   args.m365_max_concurrency, args.m365_scan_sites))
+        if args.atlassian_domain:
+            if not (args.atlassian_email and args.atlassian_token):
+                parser.error("--atlassian-domain needs --atlassian-email and --atlassian-token "
+                             "(or ATLASSIAN_API_TOKEN)")
+            scans.append(atlassian_scan(args.atlassian_domain, args.atlassian_email, args.atlassian_token,
+                                        args.atlassian_workers))
+        if not scans:
+            parser.error("nothing to scan: give --github-org, --m365-tenant-id and/or --atlassian-domain")
+
+        output_file = args.output or f"ai_governance_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        orchestrator = GovernanceScanner(scans)
+
+        print("=" * 60)
+        print(f"AI Governance Scan: {', '.join(scan.platform for scan in scans)}")
+        print("=" * 60)
+
+        try:
+            total = orchestrator.run(output_file)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Scan interrupted by user. Partial report kept in " + output_file)
+            sys.exit(1)
+
+        orchestrator.print_summary()
+        print(f"\n✅ Combined report generated: {output_file}")
+        print(f"   Total findings: {total}")
+
+        if any(scan.error for scan in scans):
+            print("\n⚠️  Some platforms did not finish; their findings are missing or partial.")
+            sys.exit(1)
+        print("\n✅ Scan complete!")
+
+
+if __name__ == "__main__":
+    main()
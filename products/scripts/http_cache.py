@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+HTTP Conditional Request Cache
+==============================
+
+Small on-disk cache for GitHub API responses, keyed by request URL.
+
+Each entry stores the response body together with its ETag / Last-Modified
+validators. On the next run the stored validators are sent back as
+If-None-Match / If-Modified-Since; a 304 Not Modified reply is then served
+from disk. GitHub does not count 304 replies to conditional requests
+against the primary rate limit.
+
+Responses without validators (e.g. from the Atlassian APIs) can be stored
+too and served for a fixed time-to-live instead; see is_fresh().
+
+The cache is bounded by total size on disk and evicts the least recently
+used entries first.
+
+Author: AI Governance Team
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+
+
+class HTTPCache:
+    """Size-bounded, LRU on-disk cache of validated HTTP responses."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached URL
+            max_bytes: Maximum total size of the cache directory
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from the files on disk, oldest first."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name[:-5], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None, namespace: str = '') -> str:
+        """
+        Build the cache key for a request URL and its query parameters.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            namespace: Kept apart from other namespaces, e.g. the account
+                the response was fetched for
+        """
+        prepared = requests.Request('GET', url, params=params).prepare()
+        source = f"{namespace}\n{prepared.url}" if namespace else prepared.url
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached entry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Entry dictionary, or None if not cached
+        """
+        with self._lock:
+            if key not in self._index:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._forget(key)
+                return None
+            self._index.move_to_end(key)
+            os.utime(path)
+            return entry
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Return the If-None-Match / If-Modified-Since headers for an entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def is_fresh(entry: Optional[Dict], ttl: float) -> bool:
+        """Whether an entry was stored less than ttl seconds ago."""
+        return bool(entry) and time.time() - entry.get('stored_at', 0) < ttl
+
+    def store(self, key: str, response: requests.Response, require_validator: bool = True) -> None:
+        """
+        Cache a response if it carries an ETag or Last-Modified validator.
+
+        Args:
+            key: Cache key from make_key()
+            response: Successful (200) HTTP response
+            require_validator: Set False to also cache responses without
+                validators, to be served by age (see is_fresh())
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or (require_validator and not (etag or last_modified)):
+            return
+
+        entry = {
+            'url': response.url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'status_code': response.status_code,
+            'content_type': response.headers.get('Content-Type', ''),
+            'stored_at': time.time(),
+            'body': response.text
+        }
+        data = json.dumps(entry).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _forget(self, key: str) -> None:
+        """Drop an entry from the index and disk. Must hold the lock."""
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under max_bytes. Must hold the lock."""
+        while self._total_bytes > self.max_bytes and self._index:
+            oldest = next(iter(self._index))
+            self._forget(oldest)
+
+    @staticmethod
+    def to_response(entry: Dict, not_modified: requests.Response) -> requests.Response:
+        """
+        Build a response from a cached entry for a 304 Not Modified reply.
+
+        The 304's headers (including current rate limit headers) are kept,
+        while status code and body come from the cache.
+        """
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(not_modified.headers)
+        response.headers.pop('Content-Length', None)
+        response.headers.pop('Content-Encoding', None)
+        response.headers['Content-Type'] = entry.get('content_type', '')
+        response.encoding = 'utf-8'
+        response._content = entry['body'].encode('utf-8')
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
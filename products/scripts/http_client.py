@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+==================
+
+Builds pooled, keep-alive requests sessions for all of the scanners so that
+large audits reuse TCP/TLS connections instead of opening a new one for
+every repository, user or space. Every session reports its responses to
+the per-endpoint request metrics (see request_metrics.py).
+
+retry_after_seconds() reads the Retry-After header that GitHub, Graph and
+Atlassian send with throttling responses, in either of its HTTP forms.
+
+Author: AI Governance Team
+"""
+
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from request_metrics import METRICS, RequestMetrics
+
+DEFAULT_POOL_SIZE = 10
+
+
+def create_session(headers: Optional[Dict[str, str]] = None,
+                   pool_size: int = DEFAULT_POOL_SIZE,
+                   metrics: Optional[RequestMetrics] = METRICS) -> requests.Session:
+    """
+    Create a pooled HTTP session.
+
+    Args:
+        headers: Default headers sent with every request
+        pool_size: Maximum number of connections kept open per host.
+            Should be at least the number of concurrent workers.
+        metrics: Registry timing every response (default: the process-wide
+            one); None disables instrumentation
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive"
+    })
+    if headers:
+        session.headers.update(headers)
+
+    if metrics is not None:
+        metrics.instrument(session)
+
+    return session
+
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]], default: float) -> float:
+    """
+    Read the Retry-After header of a response or Graph batch sub-response.
+
+    Args:
+        headers: Response headers; the name is matched case-insensitively
+        default: Seconds to wait if the header is missing or unreadable
+
+    Returns:
+        Seconds to wait, never negative. The header may hold a delay in
+        seconds ('120') or an HTTP date ('Wed, 21 Oct 2015 07:28:00 GMT').
+    """
+    value = None
+    for name, header_value in (headers or {}).items():
+        if name.lower() == 'retry-after':
+            value = header_value
+            break
+    if not value:
+        return default
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return default
+    if retry_at.tzinfo is None:
+        # HTTP dates are always GMT
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - time.time())
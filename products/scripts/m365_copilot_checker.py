@@ -20,21 +20,67 @@ Author: AI Governance Team
 import requests
 import csv
 import argparse
+import os
+import queue
 import sys
-from typing import List, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, FrozenSet, Iterator, Iterable, Callable
 from datetime import datetime
 
+from adaptive_concurrency import AdaptiveConcurrencyLimiter
+from columnar_export import ColumnarWriter, is_available as columnar_export_available
+from findings_store import FindingsStore, PLATFORM_M365
+from http_client import create_session, retry_after_seconds, DEFAULT_POOL_SIZE
+from request_metrics import reporting_metrics
+from site_exposure_scanner import (
+    SiteExposureScanner, ExposureCache, FINDING_KEYS, DEFAULT_SCAN_WORKERS, DEFAULT_MAX_DEPTH
+)
+from user_delta_store import UserDeltaStore
+
 try:
-    from msal import ConfidentialClientApplication
+    from msal import ConfidentialClientApplication, SerializableTokenCache
 except ImportError:
     print("❌ Error: msal library not installed. Run: pip install msal")
     sys.exit(1)
 
+from token_cache import EncryptedTokenCache
+
+
+# Microsoft Graph accepts at most 20 sub-requests per JSON $batch request
+BATCH_LIMIT = 20
+BATCH_MAX_RETRIES = 3
+
+# Graph throttling responses; both may carry Retry-After
+THROTTLE_STATUSES = (429, 503)
+GRAPH_MAX_RETRIES = 5
+# Upper bound for the adaptive number of concurrent Graph requests
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Refresh access tokens this many seconds before they expire (MSAL treats
+# cached tokens as expired within the same margin)
+TOKEN_REFRESH_MARGIN = 300
+
+# Largest page size accepted for /sites and /teams
+GRAPH_PAGE_SIZE = 999
+# Exposure point rows buffered between the enumeration threads and the report
+EXPOSURE_QUEUE_ROWS = 1000
+
+USER_SELECT = "id,displayName,userPrincipalName,assignedLicenses"
+
+# Subscribed SKUs whose part number contains this are Copilot licenses
+# (e.g. Microsoft_365_Copilot, Microsoft_365_Copilot_EDU)
+COPILOT_SKU_MARKER = "copilot"
+
 
 class M365CopilotChecker:
     """Checker for Microsoft 365 Copilot usage."""
     
-    def __init__(self, tenant_id: str, client_id: str, client_secret: str):
+    def __init__(self, tenant_id: str, client_id: str, client_secret: str,
+                 pool_size: int = DEFAULT_POOL_SIZE, delta_state: Optional[str] = None,
+                 token_cache: Optional[str] = None,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None):
         """
         Initialize the checker.
         
@@ -42,6 +88,11 @@ class M365CopilotChecker:
             tenant_id: Azure AD Tenant ID
             client_id: Azure AD Application (Client) ID
             client_secret: Client secret value
+            pool_size: Maximum number of pooled connections to Graph
+            delta_state: JSON file holding the cached user table and deltaLink;
+                when set, users are synced incrementally with /users/delta
+            token_cache: Encrypted file to keep MSAL tokens in between runs
+            limiter: Adaptive concurrency limit shared by all Graph requests
         """
         self.tenant_id = tenant_id
         self.client_id = client_id
@@ -52,169 +103,482 @@ class M365CopilotChecker:
         
         self.graph_endpoint = "https://graph.microsoft.com/v1.0"
         self.access_token = None
+        self.token_expires_at = 0.0
+        self.token_cache = EncryptedTokenCache(token_cache, client_secret) if token_cache else SerializableTokenCache()
+        self.app: Optional[ConfidentialClientApplication] = None
+        self._token_lock = threading.RLock()
+        self.session = create_session(pool_size=pool_size)
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(maximum=pool_size)
+        self.delta_state = delta_state
+        self.copilot_sku_ids: Optional[FrozenSet[str]] = None
+        self.site_scanner: Optional[SiteExposureScanner] = None
         self.results: List[Dict] = []
+        # Set when the user listing failed, so the report is known to be incomplete
+        self.user_fetch_error: Optional[Exception] = None
     
     def get_access_token(self) -> str:
-        """Get OAuth2 access token using client credentials flow."""
-        print("🔐 Authenticating with Microsoft Graph API...")
-        
-        app = ConfidentialClientApplication(
-            client_id=self.client_id,
-            client_credential=self.client_secret,
-            authority=self.authority
-        )
-        
-        result = app.acquire_token_for_client(scopes=self.scope)
+        """
+        Get OAuth2 access token using client credentials flow.
         
-        if "access_token" in result:
-            self.access_token = result["access_token"]
-            print("✅ Authentication successful")
-            return self.access_token
-        else:
-            error = result.get("error_description", result.get("error", "Unknown error"))
-            print(f"❌ Authentication failed: {error}")
-            sys.exit(1)
+        The MSAL application is created once and reuses its token cache, so
+        a valid cached token (including one from the encrypted on-disk cache
+        of an earlier run) is returned without a round trip to Azure AD.
+        Safe to call from several worker threads.
+        """
+        with self._token_lock:
+            if self.app is None:
+                print("🔐 Authenticating with Microsoft Graph API...")
+                self.app = ConfidentialClientApplication(
+                    client_id=self.client_id,
+                    client_credential=self.client_secret,
+                    authority=self.authority,
+                    token_cache=self.token_cache
+                )
+            
+            result = self.app.acquire_token_for_client(scopes=self.scope)
+            
+            if "access_token" in result:
+                refreshed = self.access_token is not None
+                self.access_token = result["access_token"]
+                self.token_expires_at = time.time() + int(result.get("expires_in", 0))
+                if isinstance(self.token_cache, EncryptedTokenCache):
+                    self.token_cache.save()
+                
+                if refreshed:
+                    print("   🔄 Access token refreshed")
+                elif result.get("token_source") == "cache":
+                    print("✅ Authentication successful (cached token)")
+                else:
+                    print("✅ Authentication successful")
+                return self.access_token
+            else:
+                error = result.get("error_description", result.get("error", "Unknown error"))
+                print(f"❌ Authentication failed: {error}")
+                sys.exit(1)
+    
+    def token_needs_refresh(self) -> bool:
+        """Whether there is no token yet or it expires within TOKEN_REFRESH_MARGIN."""
+        return not self.access_token or time.time() >= self.token_expires_at - TOKEN_REFRESH_MARGIN
     
     def get_headers(self) -> Dict[str, str]:
-        """Get request headers with authentication."""
-        if not self.access_token:
-            self.get_access_token()
+        """
+        Get request headers with authentication.
+        
+        The token is refreshed TOKEN_REFRESH_MARGIN seconds before it
+        expires, so requests late in a long scan never carry an expired token.
+        """
+        if self.token_needs_refresh():
+            with self._token_lock:
+                # Another worker may have refreshed it while we waited
+                if self.token_needs_refresh():
+                    self.get_access_token()
         
         return {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
     
+    def graph_request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      **kwargs) -> requests.Response:
+        """
+        Send a Graph request through the shared adaptive concurrency limiter.
+        
+        Throttling responses (429/503) lower the limiter's concurrency and
+        pause new requests for Retry-After seconds (exponential backoff if
+        absent); the request is then retried, up to GRAPH_MAX_RETRIES times.
+        Healthy responses let the limiter raise concurrency again.
+        
+        Args:
+            method: HTTP method
+            url: Absolute Graph URL
+            headers: Extra request headers (e.g. Prefer), added to the auth headers
+            **kwargs: Passed on to requests (params, json, ...)
+            
+        Returns:
+            The last response received
+        """
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.session.request(method, url, headers={**self.get_headers(), **(headers or {})},
+                                                **kwargs)
+            except requests.exceptions.RequestException:
+                self.limiter.release()
+                raise
+            
+            throttled = response.status_code in THROTTLE_STATUSES
+            retry_after = retry_after_seconds(response.headers, default=2.0 ** attempt) if throttled else None
+            self.limiter.release(throttled, retry_after)
+            
+            if not throttled or attempt >= GRAPH_MAX_RETRIES:
+                return response
+            
+            print(f"   ⚠️  Graph throttled ({response.status_code}). Retrying in {retry_after:.0f} seconds "
+                  f"(concurrency now {int(self.limiter.limit)})...")
+            attempt += 1
+    
+    def graph_batch(self, relative_urls: List[str]) -> List[Dict]:
+        """
+        Send GET requests through Graph JSON batching.
+        
+        URLs are grouped into $batch requests of up to BATCH_LIMIT
+        sub-requests, each sent through graph_request(). Sub-requests
+        throttled with a 429/503 are reported to the concurrency limiter and
+        retried on their own once Retry-After has passed, up to
+        BATCH_MAX_RETRIES times; the rest of the batch is not repeated.
+        
+        Args:
+            relative_urls: Graph URLs relative to the API version, e.g. '/teams'
+            
+        Returns:
+            One sub-response per URL, in the same order, each a dictionary
+            with 'status', 'headers' and 'body'
+        """
+        responses: List[Optional[Dict]] = [None] * len(relative_urls)
+        pending = list(range(len(relative_urls)))
+        attempt = 0
+        
+        while pending:
+            throttled = []
+            
+            for start in range(0, len(pending), BATCH_LIMIT):
+                chunk = pending[start:start + BATCH_LIMIT]
+                payload = {
+                    "requests": [
+                        {"id": str(i), "method": "GET", "url": relative_urls[i]} for i in chunk
+                    ]
+                }
+                
+                # A throttled batch as a whole is retried inside graph_request()
+                response = self.graph_request('POST', f"{self.graph_endpoint}/$batch", json=payload)
+                response.raise_for_status()
+                
+                for sub_response in response.json().get('responses', []):
+                    index = int(sub_response['id'])
+                    if sub_response.get('status') in THROTTLE_STATUSES and attempt < BATCH_MAX_RETRIES:
+                        throttled.append(index)
+                        self.limiter.throttled(retry_after_seconds(sub_response.get('headers'), default=5.0))
+                    else:
+                        responses[index] = sub_response
+            
+            if throttled:
+                # The limiter holds the retry until the longest Retry-After has passed
+                print(f"   ⚠️  Graph throttled {len(throttled)} batched request(s). Retrying...")
+            pending = sorted(throttled)
+            attempt += 1
+        
+        return responses
+    
+    def get_copilot_sku_ids(self) -> Optional[FrozenSet[str]]:
+        """
+        Resolve the tenant's Copilot SKU IDs from its subscribed SKUs.
+        
+        SKU IDs differ between offers (enterprise, education, add-ons), so
+        rather than hardcoding them, every subscribed SKU whose part number
+        mentions Copilot is treated as a Copilot license. The result is
+        fetched once and cached.
+        
+        Returns:
+            Frozenset of Copilot SKU IDs, or None if subscribed SKUs cannot be read
+        """
+        if self.copilot_sku_ids is not None:
+            return self.copilot_sku_ids
+        
+        response = self.graph_request(
+            'GET', f"{self.graph_endpoint}/subscribedSkus",
+            params={"$select": "skuId,skuPartNumber"}
+        )
+        if response.status_code != 200:
+            print("   ⚠️  Could not read subscribed SKUs (requires Organization.Read.All); "
+                  "Copilot licensing will be reported as Unknown")
+            return None
+        
+        skus = response.json().get('value', [])
+        self.copilot_sku_ids = frozenset(
+            sku['skuId'] for sku in skus
+            if COPILOT_SKU_MARKER in (sku.get('skuPartNumber') or '').lower()
+        )
+        part_numbers = sorted(sku.get('skuPartNumber') for sku in skus if sku['skuId'] in self.copilot_sku_ids)
+        print(f"   Copilot SKUs: {', '.join(part_numbers) or 'none subscribed'}")
+        return self.copilot_sku_ids
+    
+    def check_users_response(self, response: requests.Response) -> None:
+        """Exit with a clear message on authentication or permission errors."""
+        if response.status_code == 401:
+            print("❌ Authentication failed. Please check your credentials.")
+            sys.exit(1)
+        elif response.status_code == 403:
+            print("❌ Insufficient permissions. Ensure the app has 'User.Read.All' permission.")
+            sys.exit(1)
+    
+    def fetch_all_users(self) -> List[Dict]:
+        """Page through every user in the tenant."""
+        users = []
+        url = f"{self.graph_endpoint}/users"
+        params = {
+            "$select": USER_SELECT,
+            "$top": 999
+        }
+        
+        while url:
+            response = self.graph_request('GET', url, params=params)
+            self.check_users_response(response)
+            response.raise_for_status()
+            data = response.json()
+            
+            users.extend(data.get('value', []))
+            
+            # Check for next page
+            url = data.get('@odata.nextLink')
+            params = None  # nextLink already has params
+            
+            print(f"   Processed {len(users)} users...")
+        
+        return users
+    
+    def sync_users_delta(self) -> List[Dict]:
+        """
+        Bring the cached user table up to date with a Graph delta query.
+        
+        The first run pages through /users/delta like a full listing. Later
+        runs resume from the saved deltaLink and only fetch users added,
+        changed or removed since the last sync.
+        
+        Returns:
+            Every user in the cached table
+        """
+        store = UserDeltaStore.load(self.delta_state, self.tenant_id)
+        if store.delta_link:
+            print(f"   Resuming delta sync from {store.synced_at} ({len(store.users)} cached users)")
+        else:
+            store.reset()
+        
+        initial_url = f"{self.graph_endpoint}/users/delta?$select={USER_SELECT}"
+        url = store.delta_link or initial_url
+        upserted = removed = 0
+        
+        while url:
+            response = self.graph_request('GET', url)
+            
+            if response.status_code == 410 and store.delta_link:
+                # The sync state expired on the server; start a full sync
+                print("   ⚠️  Delta token expired. Running a full user sync...")
+                store.reset()
+                upserted = removed = 0
+                url = initial_url
+                continue
+            
+            self.check_users_response(response)
+            response.raise_for_status()
+            data = response.json()
+            
+            page_upserted, page_removed = store.apply(data.get('value', []))
+            upserted += page_upserted
+            removed += page_removed
+            
+            url = data.get('@odata.nextLink')
+            if not url:
+                store.delta_link = data.get('@odata.deltaLink')
+            
+            print(f"   Synced {upserted} changed and {removed} removed users...")
+        
+        store.synced_at = datetime.now().isoformat(timespec='seconds')
+        store.save()
+        return list(store.users.values())
+    
     def get_copilot_licensed_users(self) -> List[Dict]:
         """Get list of users licensed for Microsoft 365 Copilot."""
         print("🔍 Checking for Copilot-licensed users...")
         
         licensed_users = []
+        self.user_fetch_error = None
         
         try:
-            # Get all users (this requires User.Read.All permission)
-            url = f"{self.graph_endpoint}/users"
-            params = {
-                "$select": "id,displayName,userPrincipalName,assignedLicenses",
-                "$top": 999
-            }
+            # Listing users requires User.Read.All permission
+            if self.delta_state:
+                users = self.sync_users_delta()
+            else:
+                users = self.fetch_all_users()
             
-            headers = self.get_headers()
+            copilot_sku_ids = self.get_copilot_sku_ids()
             
-            while url:
-                response = requests.get(url, headers=headers, params=params if '?' not in url else None)
-                
-                if response.status_code == 401:
-                    print("❌ Authentication failed. Please check your credentials.")
-                    sys.exit(1)
-                elif response.status_code == 403:
-                    print("❌ Insufficient permissions. Ensure the app has 'User.Read.All' permission.")
-                    sys.exit(1)
+            for user in users:
+                assigned_licenses = user.get('assignedLicenses', [])
                 
-                response.raise_for_status()
-                data = response.json()
-                
-                users = data.get('value', [])
-                
-                # Check for Copilot licenses
-                # Copilot license SKU IDs (these may change - verify with Microsoft)
-                copilot_sku_ids = [
-                    "c17df3e0-3b78-4c93-a7e5-4a3b3d3d3d3d",  # Microsoft 365 Copilot (placeholder - verify actual SKU)
-                ]
-                
-                for user in users:
-                    assigned_licenses = user.get('assignedLicenses', [])
-                    
+                if copilot_sku_ids is None:
+                    copilot_licensed = 'Unknown'
+                else:
                     # Check if user has any Copilot-related license
-                    has_copilot = False
-                    for license in assigned_licenses:
-                        sku_id = license.get('skuId', '')
-                        # In production, you'd check against actual Copilot SKU IDs
-                        # This is a placeholder - you need to verify actual SKU IDs
-                        
-                    # For now, we'll check all users and flag for manual review
-                    # In production, filter by actual Copilot SKU IDs
-                    
-                    user_info = {
-                        'user_id': user.get('id'),
-                        'display_name': user.get('displayName'),
-                        'email': user.get('userPrincipalName'),
-                        'copilot_licensed': 'Unknown',  # Would be Yes/No with proper SKU checking
-                        'license_count': len(assigned_licenses)
-                    }
-                    licensed_users.append(user_info)
+                    user_sku_ids = {license.get('skuId') for license in assigned_licenses}
+                    copilot_licensed = 'No' if copilot_sku_ids.isdisjoint(user_sku_ids) else 'Yes'
                 
-                # Check for next page
-                url = data.get('@odata.nextLink')
-                params = None  # nextLink already has params
-                
-                print(f"   Processed {len(licensed_users)} users...")
+                user_info = {
+                    'user_id': user.get('id'),
+                    'display_name': user.get('displayName'),
+                    'email': user.get('userPrincipalName'),
+                    'copilot_licensed': copilot_licensed,
+                    'license_count': len(assigned_licenses)
+                }
+                licensed_users.append(user_info)
             
-            print(f"✅ Found {len(licensed_users)} users to check")
+            copilot_count = sum(1 for user in licensed_users if user['copilot_licensed'] == 'Yes')
+            print(f"✅ Found {len(licensed_users)} users, {copilot_count} with a Copilot license")
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching users: {e}")
+            self.user_fetch_error = e
             return []
         
         return licensed_users
     
-    def identify_data_exposure_points(self) -> List[Dict]:
-        """Identify potential data exposure points."""
+    @staticmethod
+    def site_exposure_point(site: Dict) -> Dict:
+        """Build the report row for a SharePoint site."""
+        return {
+            'type': 'SharePoint Site',
+            'name': site.get('displayName'),
+            'url': site.get('webUrl'),
+            'id': site.get('id'),
+            'risk_level': 'MEDIUM'
+        }
+    
+    @staticmethod
+    def team_exposure_point(team: Dict) -> Dict:
+        """Build the report row for a Microsoft Teams team."""
+        return {
+            'type': 'Microsoft Teams',
+            'name': team.get('displayName'),
+            'id': team.get('id'),
+            'risk_level': 'MEDIUM'
+        }
+    
+    def enable_site_scan(self, workers: int = DEFAULT_SCAN_WORKERS, max_depth: int = DEFAULT_MAX_DEPTH,
+                         cache_file: Optional[str] = None) -> None:
+        """
+        Score SharePoint sites by scanning their sharing and permissions
+        instead of reporting every site as MEDIUM.
+        
+        Args:
+            workers: Sites scanned, and permission lookups made, concurrently
+            max_depth: Deepest folder level whose items are inspected
+            cache_file: JSON file keeping drive deltas and findings between runs
+        """
+        cache = ExposureCache(cache_file) if cache_file else None
+        self.site_scanner = SiteExposureScanner(self.graph_request, self.graph_endpoint,
+                                                workers=workers, max_depth=max_depth, cache=cache)
+    
+    def site_rows(self, sites: Iterable[Dict]) -> Iterator[Dict]:
+        """Build report rows for sites, scanning them if enabled."""
+        if self.site_scanner:
+            return self.site_scanner.iter_scan(sites)
+        return map(self.site_exposure_point, sites)
+    
+    def team_rows(self, teams: Iterable[Dict]) -> Iterator[Dict]:
+        """Build report rows for teams."""
+        return map(self.team_exposure_point, teams)
+    
+    def iter_exposure_points(self) -> Iterator[Dict]:
+        """
+        Stream potential data exposure points as they are enumerated.
+        
+        The first pages of SharePoint sites (Sites.Read.All) and Teams
+        (Team.ReadBasic.All) are fetched together in a single $batch round
+        trip. Each collection's @odata.nextLink chain is then followed on its
+        own thread, and rows are yielded as soon as either thread has one.
+        At most EXPOSURE_QUEUE_ROWS rows are buffered, so memory stays flat
+        however many sites the tenant has.
+        
+        Yields:
+            Report rows for every site and team
+        """
         print("🔍 Identifying potential data exposure points...")
         
-        exposure_points = []
+        collections = [
+            ("SharePoint sites", f"/sites?$select=id,name,webUrl,displayName&$top={GRAPH_PAGE_SIZE}",
+             self.site_rows),
+            ("Teams", f"/teams?$select=id,displayName&$top={GRAPH_PAGE_SIZE}",
+             self.team_rows),
+        ]
         
         try:
-            headers = self.get_headers()
-            
-            # Check SharePoint sites (potential data sources)
-            # This requires Sites.Read.All permission
-            url = f"{self.graph_endpoint}/sites"
-            params = {"$select": "id,name,webUrl,displayName"}
+            first_pages = self.graph_batch([path for _, path, _ in collections])
+        except requests.exceptions.RequestException as e:
+            print(f"   ⚠️  Error identifying exposure points: {e}")
+            return
+        
+        rows: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=EXPOSURE_QUEUE_ROWS)
+        stop = threading.Event()
+        
+        def put(row: Optional[Dict]) -> None:
+            while not stop.is_set():
+                try:
+                    rows.put(row, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        
+        def follow(label: str, body: Dict, to_rows: Callable[[Iterable[Dict]], Iterator[Dict]]) -> None:
+            count = 0
             
-            try:
-                response = requests.get(url, headers=headers, params=params)
-                if response.status_code == 200:
-                    sites = response.json().get('value', [])
-                    print(f"   Found {len(sites)} SharePoint sites")
+            def items() -> Iterator[Dict]:
+                nonlocal body, count
+                while not stop.is_set():
+                    values = body.get('value', [])
+                    count += len(values)
+                    yield from values
                     
-                    for site in sites[:20]:  # Limit for performance
-                        exposure_points.append({
-                            'type': 'SharePoint Site',
-                            'name': site.get('displayName'),
-                            'url': site.get('webUrl'),
-                            'risk_level': 'MEDIUM'
-                        })
-            except:
-                print("   ⚠️  Could not access SharePoint sites (may require additional permissions)")
-            
-            # Check Teams (potential collaboration data)
-            # This requires Team.ReadBasic.All permission
-            url = f"{self.graph_endpoint}/teams"
+                    next_link = body.get('@odata.nextLink')
+                    if not next_link:
+                        break
+                    response = self.graph_request('GET', next_link)
+                    response.raise_for_status()
+                    body = response.json()
             
             try:
-                response = requests.get(url, headers=headers)
-                if response.status_code == 200:
-                    teams = response.json().get('value', [])
-                    print(f"   Found {len(teams)} Teams")
-                    
-                    for team in teams[:20]:  # Limit for performance
-                        exposure_points.append({
-                            'type': 'Microsoft Teams',
-                            'name': team.get('displayName'),
-                            'id': team.get('id'),
-                            'risk_level': 'MEDIUM'
-                        })
-            except:
-                print("   ⚠️  Could not access Teams (may require additional permissions)")
-                
-        except Exception as e:
-            print(f"   ⚠️  Error identifying exposure points: {e}")
+                for row in to_rows(items()):
+                    put(row)
+                    if stop.is_set():
+                        break
+                print(f"   Found {count} {label}")
+            except requests.exceptions.RequestException as e:
+                print(f"   ⚠️  Error listing {label} after {count} items: {e}")
+            finally:
+                put(None)
         
-        return exposure_points
+        producers = 0
+        executor = ThreadPoolExecutor(max_workers=len(collections))
+        try:
+            for (label, _, to_rows), first_page in zip(collections, first_pages):
+                if first_page.get('status') != 200:
+                    print(f"   ⚠️  Could not access {label} (may require additional permissions)")
+                    continue
+                executor.submit(follow, label, first_page.get('body', {}), to_rows)
+                producers += 1
+            
+            while producers:
+                row = rows.get()
+                if row is None:
+                    producers -= 1
+                    continue
+                yield row
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
     
-    def check(self) -> Dict:
-        """Perform complete check."""
+    def identify_data_exposure_points(self) -> List[Dict]:
+        """Identify potential data exposure points."""
+        return list(self.iter_exposure_points())
+    
+    def check(self, stream: bool = False) -> Dict:
+        """
+        Perform complete check.
+        
+        Args:
+            stream: Leave exposure points as a lazy iterator that
+                generate_report() consumes as pages arrive, instead of
+                collecting them into a list first
+        """
         print("=" * 60)
         print("Microsoft 365 Copilot Readiness Check")
         print("=" * 60)
@@ -222,48 +586,85 @@ class M365CopilotChecker:
         
         results = {
             'licensed_users': self.get_copilot_licensed_users(),
-            'exposure_points': self.identify_data_exposure_points()
+            'exposure_points': self.iter_exposure_points() if stream else self.identify_data_exposure_points()
         }
         
         self.results = results
         return results
     
-    def generate_report(self, output_file: str = None) -> None:
-        """Generate CSV report."""
-        if not output_file:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"m365_copilot_check_{self.tenant_id}_{timestamp}.csv"
-        
-        all_rows = []
-        
+    def iter_report_rows(self) -> Iterator[Dict]:
+        """Yield the report rows of the last check(): licensed users, then exposure points."""
         # Add licensed users
         for user in self.results.get('licensed_users', []):
-            all_rows.append({
+            yield {
                 'type': 'User',
                 'name': user.get('display_name'),
                 'email': user.get('email'),
                 'copilot_licensed': user.get('copilot_licensed'),
                 'license_count': user.get('license_count'),
                 'risk_level': 'MEDIUM' if user.get('copilot_licensed') == 'Yes' else 'LOW'
-            })
+            }
         
         # Add exposure points
-        for point in self.results.get('exposure_points', []):
-            all_rows.append(point)
+        yield from self.results.get('exposure_points', [])
+    
+    def generate_report(self, output_file: str = None, store: Optional[FindingsStore] = None,
+                        export_file: Optional[str] = None) -> None:
+        """
+        Generate CSV report, writing exposure points as they stream in.
         
-        if not all_rows:
-            print("⚠️  No results to report.")
-            return
+        Args:
+            output_file: Output CSV file path (default: auto-generated)
+            store: Optional findings store that also records the rows as one scan
+            export_file: Optional typed Parquet/Arrow copy of the report (needs pyarrow)
+        """
+        if not output_file:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"m365_copilot_check_{self.tenant_id}_{timestamp}.csv"
         
-        fieldnames = ['type', 'name', 'email', 'copilot_licensed', 'license_count', 'url', 'id', 'risk_level']
+        fieldnames = ['type', 'name', 'email', 'copilot_licensed', 'license_count', 'url', 'id',
+                      *FINDING_KEYS, 'risk_score', 'risk_level']
+        row_count = 0
+        # Every row also goes to these (add/complete/close)
+        recorder = store.open_scan(PLATFORM_M365, self.tenant_id) if store else None
+        sinks = [recorder] if recorder else []
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(all_rows)
+        try:
+            if export_file:
+                sinks.append(ColumnarWriter(export_file, PLATFORM_M365))
+            
+            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                
+                for row in self.iter_report_rows():
+                    writer.writerow(row)
+                    for sink in sinks:
+                        sink.add(row)
+                    row_count += 1
+            
+            # An empty or failed check must not become the latest complete scan
+            # that later scans are diffed against
+            if row_count and not self.user_fetch_error:
+                for sink in sinks:
+                    sink.complete()
+        finally:
+            for sink in sinks:
+                sink.close()
+        
+        if not row_count:
+            os.remove(output_file)
+            print("⚠️  No results to report.")
+            return
         
         print(f"\n✅ Report generated: {output_file}")
-        print(f"   Total items: {len(all_rows)}")
+        print(f"   Total items: {row_count}")
+        if recorder and self.user_fetch_error:
+            print(f"   ⚠️  Users could not be fetched; scan {recorder.scan_id} in {store.path} is not marked complete")
+        elif recorder:
+            print(f"   Recorded as scan {recorder.scan_id} in {store.path}")
+        if export_file:
+            print(f"   Exported to {export_file}")
 
 
 def main():
@@ -275,8 +676,13 @@ def main():
 Example usage:
     python m365_copilot_checker.py --tenant-id YOUR_TENANT_ID --client-id YOUR_CLIENT_ID --client-secret YOUR_SECRET
 
+    # Daily runs: only fetch users changed since the previous run
+    python m365_copilot_checker.py --tenant-id YOUR_TENANT_ID --client-id YOUR_CLIENT_ID --client-secret YOUR_SECRET \\
+        --delta-state m365_users.json
+
 Note: You need to register an Azure AD app with these API permissions:
     - User.Read.All
+    - Organization.Read.All (to resolve Copilot license SKUs)
     - Sites.Read.All (optional, for SharePoint check)
     - Team.ReadBasic.All (optional, for Teams check)
 
@@ -288,27 +694,66 @@ Required permissions must be granted by an admin.
     parser.add_argument('--client-id', required=True, help='Azure AD Application (Client) ID')
     parser.add_argument('--client-secret', required=True, help='Client secret value')
     parser.add_argument('--output', '-o', help='Output CSV file path')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f'Maximum pooled HTTP connections (default: {DEFAULT_POOL_SIZE})')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Upper bound for concurrent Graph requests; the actual level adapts '
+                             f'to throttling (default: {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--scan-sites', action='store_true',
+                        help='Scan every SharePoint site\'s drives and sharing permissions and score '
+                             'its exposure (Sites.Read.All or Files.Read.All)')
+    parser.add_argument('--scan-workers', type=int, default=DEFAULT_SCAN_WORKERS,
+                        help=f'Sites scanned concurrently with --scan-sites (default: {DEFAULT_SCAN_WORKERS})')
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH,
+                        help=f'Deepest folder level inspected with --scan-sites (default: {DEFAULT_MAX_DEPTH})')
+    parser.add_argument('--scan-cache', metavar='FILE',
+                        help='Keep drive deltas and findings in FILE so re-scans skip unchanged drives')
+    parser.add_argument('--token-cache', metavar='FILE',
+                        help='Keep access tokens in this encrypted file so later runs skip '
+                             're-authenticating (the key is derived from the client secret)')
+    parser.add_argument('--store', metavar='DB',
+                        help='Also record the findings in this SQLite findings store (see findings_store.py)')
+    parser.add_argument('--export', metavar='FILE',
+                        help='Also write a typed Parquet (.parquet) or Arrow IPC (.arrow) copy of the report '
+                             '(needs pyarrow)')
+    parser.add_argument('--delta-state', metavar='FILE',
+                        help='Sync users incrementally with Graph delta queries, caching the '
+                             'user table and deltaLink in FILE between runs')
     
-    args = parser.parse_args()
-    
-    checker = M365CopilotChecker(args.tenant_id, args.client_id, args.client_secret)
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Also write per-endpoint HTTP metrics to FILE (.json, otherwise Prometheus text format)')
     
-    try:
-        checker.check()
-        checker.generate_report(args.output)
-        
-        print("\n✅ Check complete!")
-        print("\n⚠️  Note: This tool provides basic checks. For comprehensive Copilot")
-        print("   auditing, verify actual SKU IDs and use Microsoft's admin tools.")
-        
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Check interrupted by user.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ Error during check: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    args = parser.parse_args()
+    with reporting_metrics(args.metrics_out):
+        if args.export and not columnar_export_available():
+            print("❌ Error: --export needs pyarrow. Run: pip install pyarrow")
+            sys.exit(1)
+        
+        limiter = AdaptiveConcurrencyLimiter(maximum=args.max_concurrency)
+        checker = M365CopilotChecker(args.tenant_id, args.client_id, args.client_secret,
+                                     pool_size=max(args.pool_size, args.max_concurrency),
+                                     delta_state=args.delta_state, token_cache=args.token_cache,
+                                     limiter=limiter)
+        if args.scan_sites:
+            checker.enable_site_scan(args.scan_workers, args.max_depth, args.scan_cache)
+        
+        try:
+            checker.check(stream=True)
+            checker.generate_report(args.output, store=FindingsStore(args.store) if args.store else None,
+                                    export_file=args.export)
+            
+            print("\n✅ Check complete!")
+            print("\n⚠️  Note: This tool provides basic checks. For comprehensive Copilot")
+            print("   auditing, use Microsoft's admin tools.")
+            
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Check interrupted by user.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ Error during check: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
 
 
 if __name__ == "__main__":
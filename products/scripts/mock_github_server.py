@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Mock GitHub API Server
+======================
+
+A local stand-in for the parts of the GitHub API the auditor uses, for
+benchmarks and offline testing:
+
+- GET  /orgs/{org}/repos        (page / per_page pagination)
+- POST /graphql                 (organization.repositories cursor pagination)
+- GET  /repos/{owner}/{repo}/copilot
+- GET  /rate_limit
+
+Repositories are generated from their index on demand, so organizations of
+100k repositories cost no memory. Latency, error rate and the rate limit
+are configurable. Successful GETs carry an ETag; a matching If-None-Match
+gets a 304 that, as on GitHub, does not count against the rate limit.
+GET /_stats returns request counts per endpoint.
+
+Usage:
+    python mock_github_server.py --port 8000 --repos 5000 --latency-ms 20
+
+Author: AI Governance Team
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+COPILOT_PATH = re.compile(r'^/repos/([^/]+)/([^/]+)/copilot$')
+ORG_REPOS_PATH = re.compile(r'^/orgs/([^/]+)/repos$')
+
+
+class MockGitHubConfig:
+    """Behaviour of the mock server."""
+
+    def __init__(self, org_size: int = 1000, latency: float = 0.0, error_rate: float = 0.0,
+                 copilot_rate: float = 0.3, private_rate: float = 0.7,
+                 rate_limit: int = 1_000_000, seed: int = 42, missing_orgs: Tuple[str, ...] = ()):
+        """
+        Args:
+            org_size: Number of repositories in every organization
+            latency: Seconds added to every response
+            error_rate: Fraction of Copilot checks answered with a 502
+            copilot_rate: Fraction of repositories with Copilot enabled
+            private_rate: Fraction of private repositories
+            rate_limit: Core rate limit per hour reported in response headers
+            seed: Random seed for repeatable error injection
+            missing_orgs: Organizations answered with 404, as if they did not exist
+        """
+        self.org_size = org_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.copilot_rate = copilot_rate
+        self.private_rate = private_rate
+        self.rate_limit = rate_limit
+        self.seed = seed
+        self.missing_orgs = tuple(missing_orgs)
+
+
+class MockGitHubState:
+    """Shared counters for one server instance."""
+
+    def __init__(self, config: MockGitHubConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.random = random.Random(config.seed)
+        self.requests: Dict[str, int] = {}
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.remaining = config.rate_limit
+        self.reset = int(time.time()) + 3600
+
+    def count(self, endpoint: str, size: int, charge: bool = True) -> Tuple[int, int]:
+        """Count a request and return the (remaining, reset) rate limit after it."""
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.bytes_sent += size
+            if time.time() >= self.reset:
+                self.remaining = self.config.rate_limit
+                self.reset = int(time.time()) + 3600
+            if charge:
+                self.remaining = max(0, self.remaining - 1)
+            else:
+                self.not_modified += 1
+            return self.remaining, self.reset
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.random.random() < self.config.error_rate
+
+
+def make_repo(org: str, index: int, config: MockGitHubConfig) -> Dict:
+    """Build a REST-shaped repository payload, padded like the real API."""
+    name = f"repo-{index:06d}"
+    return {
+        'id': index,
+        'name': name,
+        'full_name': f"{org}/{name}",
+        'private': (index * 7919) % 100 < config.private_rate * 100,
+        'html_url': f"https://github.com/{org}/{name}",
+        'description': f"Mock repository {index}",
+        'fork': False,
+        'created_at': '2021-01-01T00:00:00Z',
+        'updated_at': '2024-01-01T00:00:00Z',
+        'pushed_at': '2024-01-01T00:00:00Z',
+        'size': 1024,
+        'stargazers_count': index % 50,
+        'language': 'Python',
+        'default_branch': 'main',
+        'owner': {'login': org, 'type': 'Organization'},
+        'permissions': {'admin': False, 'push': True, 'pull': True},
+        'topics': [],
+        'visibility': 'private',
+    }
+
+
+def copilot_enabled(index: int, config: MockGitHubConfig) -> bool:
+    return (index * 104729) % 100 < config.copilot_rate * 100
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    """Request handler; the server's state is attached to the server object."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # plus delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    @property
+    def state(self) -> MockGitHubState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, endpoint: str, payload, status: int = 200) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        time.sleep(self.state.config.latency)
+        etag = None
+        if status == 200 and self.command == 'GET' and endpoint not in ('/_stats', '/rate_limit'):
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                status, body = 304, b''
+        remaining, reset = self.state.count(endpoint, len(body), charge=status != 304)
+
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if endpoint != '/_stats':
+            self.send_header('X-RateLimit-Limit', str(self.state.config.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(remaining))
+            self.send_header('X-RateLimit-Reset', str(reset))
+            self.send_header('X-RateLimit-Resource', 'graphql' if endpoint == '/graphql' else 'core')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        config = self.state.config
+
+        if url.path == '/_stats':
+            with self.state.lock:
+                stats = {'requests': dict(self.state.requests), 'not_modified': self.state.not_modified,
+                         'bytes_sent': self.state.bytes_sent}
+            self.send_json('/_stats', stats)
+            return
+
+        if url.path == '/rate_limit':
+            with self.state.lock:
+                core = {'limit': config.rate_limit, 'remaining': self.state.remaining,
+                        'reset': self.state.reset}
+            self.send_json('/rate_limit', {'resources': {'core': core}})
+            return
+
+        match = ORG_REPOS_PATH.match(url.path)
+        if match:
+            org = match.group(1)
+            if org in config.missing_orgs:
+                self.send_json('/orgs/{org}/repos', {'message': 'Not Found'}, status=404)
+                return
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['30'])[0])
+            start = (page - 1) * per_page
+            end = min(start + per_page, config.org_size)
+            repos = [make_repo(org, i, config) for i in range(start, end)]
+            self.send_json('/orgs/{org}/repos', repos)
+            return
+
+        match = COPILOT_PATH.match(url.path)
+        if match:
+            if self.state.should_fail():
+                self.send_json('/repos/{repo}/copilot', {'message': 'Server Error'}, status=502)
+                return
+            index = int(match.group(2).rsplit('-', 1)[-1])
+            enabled = copilot_enabled(index, config)
+            self.send_json('/repos/{repo}/copilot', {'enabled_for_org': enabled, 'enabled_for_repo': False})
+            return
+
+        self.send_json(url.path, {'message': 'Not Found'}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        config = self.state.config
+
+        if urlparse(self.path).path != '/graphql':
+            self.send_json(self.path, {'message': 'Not Found'}, status=404)
+            return
+
+        variables = payload.get('variables', {})
+        org = variables.get('org', 'org')
+        start = int(variables.get('cursor') or 0)
+        end = min(start + 100, config.org_size)
+        nodes = []
+        for i in range(start, end):
+            repo = make_repo(org, i, config)
+            nodes.append({
+                'nameWithOwner': repo['full_name'],
+                'isPrivate': repo['private'],
+                'url': repo['html_url'],
+                'createdAt': repo['created_at'],
+                'updatedAt': repo['updated_at'],
+                'pushedAt': repo['pushed_at'],
+            })
+        connection = {
+            'pageInfo': {'hasNextPage': end < config.org_size, 'endCursor': str(end)},
+            'nodes': nodes,
+        }
+        self.send_json('/graphql', {'data': {'organization': {'repositories': connection}}})
+
+
+class MockGitHubServer:
+    """Runs the mock API on a background thread."""
+
+    def __init__(self, config: Optional[MockGitHubConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), MockGitHubHandler)
+        self.server.daemon_threads = True
+        self.server.state = MockGitHubState(config or MockGitHubConfig())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHubServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description='Local mock of the GitHub API used by the auditor')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('--repos', type=int, default=1000, help='Repositories per organization (default: 1000)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added latency per response in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of Copilot checks that fail')
+    parser.add_argument('--rate-limit', type=int, default=1_000_000, help='Reported core rate limit per hour')
+    args = parser.parse_args()
+
+    config = MockGitHubConfig(org_size=args.repos, latency=args.latency_ms / 1000,
+                              error_rate=args.error_rate, rate_limit=args.rate_limit)
+    server = MockGitHubServer(config, port=args.port)
+    print(f"🧪 Mock GitHub API listening on {server.url} ({args.repos} repos per org)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️  Stopped.")
+
+
+if __name__ == "__main__":
+    main()
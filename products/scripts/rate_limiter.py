@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Rate Limit Budget
+=================
+
+Token-bucket scheduler that shares one GitHub API rate-limit budget across
+every request (and every worker thread) made by the auditor.
+
+Instead of calling GET /rate_limit before each request, the budget is kept
+up to date from the X-RateLimit-Remaining / X-RateLimit-Reset headers that
+GitHub returns on every response. While plenty of quota is left, requests
+go out unthrottled. Once the remaining quota drops below a pacing threshold,
+requests are spread evenly over the rest of the rate-limit window, and
+callers only block for the full reset when the budget is actually exhausted.
+
+Author: AI Governance Team
+"""
+
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+
+class RateLimitBudget:
+    """Thread-safe token bucket fed by GitHub rate-limit response headers."""
+
+    def __init__(self, reserve: int = 10, burst: int = 100, pace_below: int = 500,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the budget.
+
+        Args:
+            reserve: Requests to keep in hand; acquire() blocks until reset below this
+            burst: Maximum number of requests that may be sent back-to-back while pacing
+            pace_below: Start pacing once remaining quota (above the reserve) falls below this
+            clock: Time source (epoch seconds), injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self.reserve = reserve
+        self.burst = max(1, burst)
+        self.pace_below = pace_below
+        self.clock = clock
+        self.sleep = sleep
+
+        self.remaining: Optional[int] = None
+        self.reset: Optional[int] = None
+
+        self._tokens = float(self.burst)
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Update the budget from a response's rate-limit headers.
+
+        Responses from concurrent workers can arrive out of order, so within
+        the same window the lowest remaining count wins. A later reset time
+        means a new window has started. Headers for other rate limit
+        resources (e.g. GraphQL) are ignored.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining = int(remaining)
+            reset = int(reset)
+        except ValueError:
+            return
+
+        with self._lock:
+            if self.reset is None or reset > self.reset:
+                self.remaining = remaining
+                self.reset = reset
+            elif reset == self.reset and self.remaining is not None:
+                self.remaining = min(self.remaining, remaining)
+
+    def acquire(self) -> None:
+        """Block until one request may be sent, then consume it from the budget."""
+        while True:
+            with self._lock:
+                wait_time = self._try_consume()
+                exhausted = self.remaining is not None and self.remaining <= self.reserve
+
+            if wait_time <= 0:
+                return
+
+            if exhausted:
+                print(f"⚠️  Rate limit reached. Waiting {int(wait_time)} seconds...")
+            self.sleep(wait_time)
+
+    def refund(self) -> None:
+        """
+        Give back a request taken by acquire() that did not use quota.
+
+        Used for 304 Not Modified replies to conditional requests, which
+        GitHub does not count against the primary rate limit.
+        """
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + 1)
+            if self.remaining is not None:
+                self.remaining += 1
+
+    def _try_consume(self) -> float:
+        """
+        Try to take one token. Must be called with the lock held.
+
+        Returns:
+            0 if a token was taken, otherwise seconds to wait before retrying
+        """
+        now = self.clock()
+
+        rate = None
+        if self.remaining is not None and self.reset is not None:
+            window_left = self.reset - now
+            if window_left <= 0:
+                # Window rolled over; the next response will tell us the new budget
+                self.remaining = None
+                self.reset = None
+            elif self.remaining <= self.reserve:
+                return window_left + 1
+            elif self.remaining - self.reserve < self.pace_below:
+                rate = (self.remaining - self.reserve) / window_left
+
+        if rate is None:
+            self._tokens = float(self.burst)
+        else:
+            elapsed = max(0.0, now - self._last_refill)
+            self._tokens = min(float(self.burst), self._tokens + elapsed * rate)
+        self._last_refill = now
+
+        if self._tokens < 1:
+            return (1 - self._tokens) / rate
+
+        self._tokens -= 1
+        if self.remaining is not None:
+            self.remaining -= 1
+        return 0
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Request Metrics
+===============
+
+Per-endpoint instrumentation of every HTTP call the scanners make.
+
+Sessions from http_client.create_session() report each response to a
+metrics registry (by default the process-wide METRICS). Calls are grouped
+by method and endpoint template: URLs are reduced to their path with
+identifiers replaced by placeholders, e.g.
+
+    https://api.github.com/repos/acme/api/copilot     -> GET /repos/{repo}/copilot
+    https://graph.microsoft.com/v1.0/drives/b!x/items/01AB/permissions
+                                                      -> GET /v1.0/drives/{id}/items/{id}/permissions
+
+For each template the registry keeps histograms of latency (time to the
+response headers), response bytes (Content-Length, else the body size) and
+retries per logical request, plus a count per status code. A request counts
+as a retry when the previous response on the same thread was throttled
+(429/503, or 403 with X-RateLimit-Remaining: 0) and went to the same method
+and URL — which is how every scanner's retry loop behaves. A throttled
+request that is not retried (the caller gave up) ends with the thread's next
+request, or when the metrics are read.
+
+Wrapping a run in reporting_metrics() prints the busiest endpoints at the
+end, however the run ends, and can dump everything in the Prometheus text
+format (.prom/.txt) or as JSON (.json).
+
+Author: AI Governance Team
+"""
+
+import bisect
+import json
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+# Histogram bucket upper bounds (Prometheus 'le'); +Inf is implicit
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+RETRY_BUCKETS = (0, 1, 2, 3, 5, 10)
+
+THROTTLE_STATUSES = (429, 503)
+
+METRIC_PREFIX = 'ai_governance_http'
+
+# Path rewrites that turn concrete URLs into endpoint templates, applied in order
+ENDPOINT_RULES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r'^/repos/[^/]+/[^/]+'), '/repos/{repo}'),
+    (re.compile(r'^/orgs/[^/]+'), '/orgs/{org}'),
+    # Graph collections addressed by id (but not /users/delta, /drives/{id}/root/...)
+    (re.compile(r'/(drives|items|sites|groups|teams|users)/(?!(?:delta|root)(?:/|$))[^/]+'), r'/\1/{id}'),
+    # Any other purely numeric or UUID-like segment, except API versions (/rest/api/3)
+    (re.compile(r'(?<!/api)/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})(?=/|$)'), '/{id}'),
+]
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Reduce a request URL to its endpoint template.
+
+    Args:
+        url: Absolute request URL
+
+    Returns:
+        Path with query string dropped and identifiers replaced by placeholders
+    """
+    path = urlsplit(url).path or '/'
+    for pattern, replacement in ENDPOINT_RULES:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def escape_label(value) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def is_throttled(response: requests.Response) -> bool:
+    """Whether a response asks the client to back off and retry."""
+    if response.status_code in THROTTLE_STATUSES:
+        return True
+    return response.status_code == 403 and response.headers.get('X-RateLimit-Remaining') == '0'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf."""
+        pairs = []
+        total = 0
+        for bound, bucket_count in zip(list(self.bounds) + ['+Inf'], self.counts):
+            total += bucket_count
+            pairs.append((str(bound), total))
+        return pairs
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'sum': self.sum, 'max': self.max,
+                'buckets': dict(self.cumulative())}
+
+
+class EndpointStats:
+    """Metrics of one method and endpoint template."""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.bytes = Histogram(BYTES_BUCKETS)
+        self.retries = Histogram(RETRY_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+
+class RequestMetrics:
+    """Thread-safe registry of per-endpoint HTTP metrics."""
+
+    def __init__(self):
+        self.endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+        # Per thread: (method, url, attempts so far) of a throttled request awaiting its retry
+        self._pending: Dict[int, Tuple[str, str, int]] = {}
+
+    def instrument(self, session: requests.Session) -> requests.Session:
+        """Report every response of a session to this registry."""
+        session.hooks['response'].append(self._on_response)
+        return session
+
+    def _on_response(self, response: requests.Response, *args, **kwargs) -> None:
+        request = response.request
+        length = response.headers.get('Content-Length')
+        nbytes = int(length) if length and length.isdigit() else len(response.content or b'')
+        self.observe(request.method, request.url, response.status_code,
+                     response.elapsed.total_seconds(), nbytes, throttled=is_throttled(response))
+
+    def observe(self, method: str, url: str, status_code: int, seconds: float, nbytes: int,
+                throttled: bool = False) -> None:
+        """
+        Record one HTTP response.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            status_code: Response status
+            seconds: Time until the response headers arrived
+            nbytes: Response size in bytes
+            throttled: The response will be retried (429/503 or rate limited)
+        """
+        thread = threading.get_ident()
+        with self._lock:
+            stats = self._stats(method, url)
+            stats.latency.observe(seconds)
+            stats.bytes.observe(nbytes)
+            stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
+
+            attempts = 1
+            pending = self._pending.pop(thread, None)
+            if pending and pending[:2] == (method, url):
+                attempts = pending[2] + 1
+            elif pending:
+                # The thread moved on without retrying; that request ended throttled
+                self._finish(*pending)
+            if throttled:
+                self._pending[thread] = (method, url, attempts)
+            else:
+                # The logical request is over; record how many retries it took
+                stats.retries.observe(attempts - 1)
+
+    def _stats(self, method: str, url: str) -> EndpointStats:
+        """Stats of the endpoint a request belongs to (lock held)."""
+        key = (method, endpoint_template(url))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+        return stats
+
+    def _finish(self, method: str, url: str, attempts: int) -> None:
+        """Record the retries of a request whose last response was throttled (lock held)."""
+        self._stats(method, url).retries.observe(attempts - 1)
+
+    def _finish_pending(self) -> None:
+        """End every request still awaiting a retry, so reports account for it (lock held)."""
+        for pending in self._pending.values():
+            self._finish(*pending)
+        self._pending = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints = {}
+            self._pending = {}
+
+    def print_summary(self, limit: int = 15) -> None:
+        """Print the busiest endpoints with latency percentiles, volume, statuses and retries."""
+        with self._lock:
+            self._finish_pending()
+            items = sorted(self.endpoints.items(), key=lambda item: item[1].requests, reverse=True)
+        if not items:
+            return
+
+        total = sum(stats.requests for _, stats in items)
+        print("\n" + "=" * 60)
+        print(f"📈 HTTP Metrics ({total} requests, {len(items)} endpoints)")
+        print("=" * 60)
+        for (method, template), stats in items[:limit]:
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats.statuses.items()))
+            retried = stats.retries.count - stats.retries.counts[0]
+            print(f"   {method} {template}")
+            print(f"      {stats.requests} requests, p50 {stats.latency.quantile(0.5) * 1000:.0f} ms, "
+                  f"p95 {stats.latency.quantile(0.95) * 1000:.0f} ms, max {stats.latency.max * 1000:.0f} ms, "
+                  f"{stats.bytes.sum / 1048576:.1f} MB")
+            print(f"      status {statuses}; {retried} retried ({int(stats.retries.sum)} retries)")
+        if len(items) > limit:
+            print(f"   ... {len(items) - limit} more endpoints")
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            self._finish_pending()
+            items = sorted(self.endpoints.items())
+
+        def labels(method: str, template: str, **extra) -> str:
+            pairs = {'method': method, 'endpoint': template, **extra}
+            return ','.join(f'{key}="{escape_label(value)}"' for key, value in pairs.items())
+
+        lines = []
+        for name, attribute, help_text in (
+                ('request_duration_seconds', 'latency', 'Time until the response headers arrived'),
+                ('response_bytes', 'bytes', 'Response size in bytes'),
+                ('request_retries', 'retries', 'Retries per logical request')):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (method, template), stats in items:
+                histogram: Histogram = getattr(stats, attribute)
+                for le, count in histogram.cumulative():
+                    lines.append(f"{metric}_bucket{{{labels(method, template, le=le)}}} {count}")
+                lines.append(f"{metric}_sum{{{labels(method, template)}}} {histogram.sum:g}")
+                lines.append(f"{metric}_count{{{labels(method, template)}}} {histogram.count}")
+
+        metric = f"{METRIC_PREFIX}_responses_total"
+        lines.append(f"# HELP {metric} Responses by status code")
+        lines.append(f"# TYPE {metric} counter")
+        for (method, template), stats in items:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f"{metric}{{{labels(method, template, status=status)}}} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self) -> Dict:
+        """All metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            self._finish_pending()
+            items = sorted(self.endpoints.items())
+        return {'endpoints': [
+            {
+                'method': method,
+                'endpoint': template,
+                'requests': stats.requests,
+                'statuses': {str(status): count for status, count in sorted(stats.statuses.items())},
+                'latency_seconds': stats.latency.to_dict(),
+                'response_bytes': stats.bytes.to_dict(),
+                'retries': stats.retries.to_dict(),
+            }
+            for (method, template), stats in items
+        ]}
+
+    def write(self, path: str) -> None:
+        """Dump the metrics as JSON (.json) or in the Prometheus text format (anything else)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.lower().endswith('.json'):
+                json.dump(self.to_json(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+# Process-wide registry used by http_client.create_session()
+METRICS = RequestMetrics()
+
+
+def report_metrics(output_file: Optional[str] = None, metrics: RequestMetrics = METRICS) -> None:
+    """
+    Print the metrics summary and optionally dump the metrics at the end of a run.
+
+    Args:
+        output_file: .json for JSON, otherwise Prometheus text format; None to only print
+        metrics: Registry to report (default: the process-wide one)
+    """
+    metrics.print_summary()
+    if output_file:
+        try:
+            metrics.write(output_file)
+            print(f"   Metrics written to {output_file}")
+        except OSError as e:
+            print(f"⚠️  Could not write metrics to {output_file}: {e}")
+
+
+@contextmanager
+def reporting_metrics(output_file: Optional[str] = None, metrics: RequestMetrics = METRICS) -> Iterator[RequestMetrics]:
+    """
+    Report the metrics when the block ends, however it ends (errors and sys.exit included).
+
+    Args:
+        output_file: Passed to report_metrics()
+        metrics: Registry to report (default: the process-wide one)
+
+    Yields:
+        The registry
+    """
+    try:
+        yield metrics
+    finally:
+        report_metrics(output_file, metrics)
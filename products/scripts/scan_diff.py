@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Scan Diff
+=========
+
+Compares two scan outputs and reports only what changed between them:
+
+- added:        entities in the new scan only
+- removed:      entities in the old scan only
+- risk_changed: entities whose risk_level differs
+
+Entities are matched on repo_name (GitHub), email (Microsoft 365 users),
+key (Atlassian) or id (SharePoint sites, Teams), falling back to the URL and
+then the display name, together with the row's site and type. The old scan is loaded into a hash table once and the new scan is
+streamed against it, so a diff is a single pass over each input.
+
+Inputs are two report CSVs, or two scans from a findings store (by default
+the two most recent scans of a platform and scope). The change list is
+written as CSV or JSON Lines for alerting pipelines.
+
+Usage:
+    python scan_diff.py yesterday.csv today.csv
+    python scan_diff.py --store findings.db --platform github --scope my-org --format jsonl
+
+Author: AI Governance Team
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from findings_store import FindingsStore, PLATFORMS, entity_of
+
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_RISK = 'risk_changed'
+
+DIFF_FIELDNAMES = ['change', 'site', 'type', 'entity', 'name', 'old_risk_level', 'new_risk_level']
+
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+
+def diff_key(row: Dict) -> Tuple[str, str, str]:
+    """Join key of a report row: (site, type, repo_name/email/key/id/url/name)."""
+    return (row.get('site') or '', row.get('type') or '', entity_of(row))
+
+
+def iter_csv_rows(path: str) -> Iterator[Dict]:
+    """Stream the rows of a report CSV."""
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def diff_scans(old_rows: Iterable[Dict], new_rows: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Hash-join two scans and yield only the differences.
+
+    The old scan is held in memory; the new scan is streamed. Changes for
+    the new scan come in its order, followed by the removed entities.
+
+    Args:
+        old_rows: Report rows of the earlier scan
+        new_rows: Report rows of the later scan
+
+    Yields:
+        Change rows (DIFF_FIELDNAMES) with the new (or, if removed, old) report row under 'row'
+    """
+    old_by_key: Dict[Tuple[str, str, str], Dict] = {diff_key(row): row for row in old_rows}
+
+    for row in new_rows:
+        key = diff_key(row)
+        old = old_by_key.pop(key, None)
+        if old is None:
+            change = CHANGE_ADDED
+        elif old.get('risk_level') != row.get('risk_level'):
+            change = CHANGE_RISK
+        else:
+            continue
+        yield {
+            'change': change,
+            'site': key[0],
+            'type': key[1],
+            'entity': key[2],
+            'name': row.get('name'),
+            'old_risk_level': old.get('risk_level') if old else None,
+            'new_risk_level': row.get('risk_level'),
+            'row': row,
+        }
+
+    for key, old in old_by_key.items():
+        yield {
+            'change': CHANGE_REMOVED,
+            'site': key[0],
+            'type': key[1],
+            'entity': key[2],
+            'name': old.get('name'),
+            'old_risk_level': old.get('risk_level'),
+            'new_risk_level': None,
+            'row': old,
+        }
+
+
+def store_scan_rows(store: FindingsStore, platform: str, scope: str,
+                    old_scan: Optional[int] = None,
+                    new_scan: Optional[int] = None) -> Tuple[Iterator[Dict], Iterator[Dict]]:
+    """
+    Load two scans of one scope from a findings store.
+
+    Args:
+        store: Findings store
+        platform: One of PLATFORMS
+        scope: Organization, tenant or site
+        old_scan: scan_id of the earlier scan (default: second most recent)
+        new_scan: scan_id of the later scan (default: most recent)
+
+    Returns:
+        (old rows, new rows), both streamed from the store
+
+    Raises:
+        ValueError: If fewer than two completed scans are available
+    """
+    scan_ids = [scan['scan_id'] for scan in store.scans(platform, scope)]
+    if new_scan is None:
+        if not scan_ids:
+            raise ValueError(f"no completed {platform} scans of '{scope}'")
+        new_scan = scan_ids[-1]
+    if old_scan is None:
+        earlier = [scan_id for scan_id in scan_ids if scan_id < new_scan]
+        if not earlier:
+            raise ValueError(f"no completed {platform} scan of '{scope}' before scan {new_scan}")
+        old_scan = earlier[-1]
+    return store.scan_rows(old_scan), store.scan_rows(new_scan)
+
+
+def write_changes(changes: Iterable[Dict], output, output_format: str = 'csv') -> Dict[str, int]:
+    """
+    Write change rows to an open text stream.
+
+    Args:
+        changes: Rows from diff_scans()
+        output: Text stream (file or sys.stdout)
+        output_format: 'csv' (change columns only) or 'jsonl' (with the full report row)
+
+    Returns:
+        Number of changes per kind
+    """
+    counts = {CHANGE_ADDED: 0, CHANGE_REMOVED: 0, CHANGE_RISK: 0}
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=DIFF_FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+    for change in changes:
+        counts[change['change']] += 1
+        if writer:
+            writer.writerow(change)
+        else:
+            output.write(json.dumps(change, default=str) + '\n')
+    return counts
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Report only the entities added, removed or changed in risk between two scans',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+    # Two report CSVs (any scanner)
+    python scan_diff.py github_copilot_audit_my-org_20240601.csv github_copilot_audit_my-org_20240602.csv
+
+    # The two latest scans of an organization in a findings store, as JSON Lines
+    python scan_diff.py --store findings.db --platform github --scope my-org --format jsonl -o changes.jsonl
+        """
+    )
+    parser.add_argument('reports', nargs='*', metavar='CSV', help='Old and new report CSV')
+    parser.add_argument('--store', metavar='DB', help='Findings store to read the scans from')
+    parser.add_argument('--platform', choices=PLATFORMS, help='Platform of the stored scans')
+    parser.add_argument('--scope', help='Organization, tenant or site of the stored scans')
+    parser.add_argument('--old-scan', type=int, help='scan_id of the earlier scan (default: second latest)')
+    parser.add_argument('--new-scan', type=int, help='scan_id of the later scan (default: latest)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help='Output format (default: csv)')
+    parser.add_argument('--output', '-o', help='Output file (default: standard output)')
+
+    args = parser.parse_args()
+
+    try:
+        if args.store:
+            if args.reports or not (args.platform and args.scope):
+                parser.error("--store needs --platform and --scope, and no CSV arguments")
+            old_rows, new_rows = store_scan_rows(FindingsStore(args.store), args.platform, args.scope,
+                                                 args.old_scan, args.new_scan)
+        elif len(args.reports) == 2:
+            old_rows, new_rows = iter_csv_rows(args.reports[0]), iter_csv_rows(args.reports[1])
+        else:
+            parser.error("give two report CSVs, or --store with --platform and --scope")
+
+        changes = diff_scans(old_rows, new_rows)
+        if args.output:
+            with open(args.output, 'w', newline='', encoding='utf-8') as output:
+                counts = write_changes(changes, output, args.format)
+        else:
+            counts = write_changes(changes, sys.stdout, args.format)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not diff scans: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Summary on stderr, so stdout stays machine-readable
+    print(f"📊 {counts[CHANGE_ADDED]} added, {counts[CHANGE_REMOVED]} removed, "
+          f"{counts[CHANGE_RISK]} risk changed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+SharePoint Site Exposure Scanner
+================================
+
+Scores how widely each SharePoint site's content is shared, which is what
+Microsoft 365 Copilot can surface to users.
+
+For every site, each document library (drive) is listed with a driveItem
+delta query and every shared item's permissions are inspected for:
+
+- anonymous ("Anyone with the link") sharing links
+- organization-wide sharing links
+- grants to "Everyone" / "Everyone except external users"
+
+Findings are weighted into a per-site risk score. Sites are scanned on a
+bounded thread pool and permission lookups on a second one; items deeper
+than the crawl-depth limit are skipped. Delta responses do not include
+parentReference.path, so depth is counted along parentReference.id links
+through the drive's folders.
+
+With a cache file, each drive's deltaLink and findings are kept between
+runs. Re-scans then only fetch items added, changed or re-shared since the
+last scan (delta queries are sent with "Prefer: deltashowsharingchanges"),
+so unchanged drives cost a single request.
+
+Author: AI Governance Team
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from concurrent_map import ordered_map
+
+DEFAULT_SCAN_WORKERS = 8
+DEFAULT_MAX_DEPTH = 3
+
+# Weight of each finding in a site's risk score
+RISK_WEIGHTS = {
+    'anonymous_links': 10,
+    'everyone_grants': 5,
+    'organization_links': 2,
+}
+HIGH_RISK_SCORE = 10
+
+FINDING_KEYS = tuple(RISK_WEIGHTS)
+
+EVERYONE_NAMES = {'everyone', 'everyone except external users'}
+# SharePoint claims for the "Everyone" and "Everyone except external users" principals
+EVERYONE_CLAIMS = ('c:0(.s|true', 'spo-grid-all-users')
+
+DELTA_SELECT = "id,name,root,folder,file,shared,deleted,parentReference"
+DELTA_PREFER = "deltashowsharingchanges, hierarchicalsharing"
+
+
+def item_depth(item: Dict, folders: Dict[str, Optional[str]]) -> Optional[int]:
+    """
+    Folder depth of a driveItem below the drive root (the root itself is 0).
+
+    Args:
+        item: driveItem from a delta response
+        folders: Folder id -> parent folder id for the whole drive (the root maps to None)
+
+    Returns:
+        Depth, or None when a folder on the way to the root is unknown
+    """
+    if 'root' in item:
+        return 0
+    depth = 0
+    folder_id = (item.get('parentReference') or {}).get('id')
+    while folder_id is not None:
+        # Unknown folder, or a loop in inconsistent data
+        if folder_id not in folders or depth > len(folders):
+            return None
+        folder_id = folders[folder_id]
+        depth += 1
+    return depth or None
+
+
+def classify_permissions(permissions: List[Dict]) -> Dict[str, int]:
+    """
+    Count risky sharing in a driveItem's permissions.
+
+    Args:
+        permissions: Values from GET /drives/{drive}/items/{item}/permissions
+
+    Returns:
+        Counts per finding key (only non-zero keys)
+    """
+    findings: Dict[str, int] = {}
+
+    def add(key: str) -> None:
+        findings[key] = findings.get(key, 0) + 1
+
+    for permission in permissions:
+        scope = (permission.get('link') or {}).get('scope')
+        if scope == 'anonymous':
+            add('anonymous_links')
+        elif scope == 'organization':
+            add('organization_links')
+
+        grantees = [permission.get('grantedToV2')] + list(permission.get('grantedToIdentitiesV2') or [])
+        for grantee in grantees:
+            for identity in (grantee or {}).values():
+                if not isinstance(identity, dict):
+                    continue
+                name = (identity.get('displayName') or '').lower()
+                login = (identity.get('loginName') or '').lower()
+                if name in EVERYONE_NAMES or any(claim in login for claim in EVERYONE_CLAIMS):
+                    add('everyone_grants')
+                    break
+
+    return findings
+
+
+def risk_score(findings: Dict[str, int]) -> int:
+    """Weighted sum of a site's findings."""
+    return sum(RISK_WEIGHTS[key] * findings.get(key, 0) for key in FINDING_KEYS)
+
+
+def risk_level_for_score(score: int) -> str:
+    """Map a site risk score onto the report's risk levels."""
+    if score >= HIGH_RISK_SCORE:
+        return 'HIGH'
+    if score > 0:
+        return 'MEDIUM'
+    return 'LOW'
+
+
+class ExposureCache:
+    """Per-drive deltaLinks and findings kept between scans."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the cache and load it from disk if present.
+
+        Args:
+            path: Path of the JSON cache file
+        """
+        self.path = path
+        self.drives: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.drives = json.load(f).get('drives', {})
+
+    def get(self, drive_id: str) -> Dict:
+        """Return the cached state of a drive (empty if never scanned)."""
+        with self._lock:
+            return self.drives.get(drive_id, {})
+
+    def put(self, drive_id: str, state: Dict) -> None:
+        """Replace the cached state of a drive."""
+        with self._lock:
+            self.drives[drive_id] = state
+
+    def save(self) -> None:
+        """Write the cache to disk atomically."""
+        with self._lock:
+            data = json.dumps({'drives': self.drives})
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+class SiteExposureScanner:
+    """Parallel sharing/permission scan of SharePoint sites."""
+
+    def __init__(self, graph_request: Callable[..., requests.Response], graph_endpoint: str,
+                 workers: int = DEFAULT_SCAN_WORKERS, max_depth: int = DEFAULT_MAX_DEPTH,
+                 cache: Optional[ExposureCache] = None):
+        """
+        Initialize the scanner.
+
+        Args:
+            graph_request: Function sending a Graph request, (method, url, **kwargs) -> Response
+            graph_endpoint: Graph base URL including the API version
+            workers: Sites scanned, and permission lookups made, concurrently
+            max_depth: Deepest folder level whose items are inspected (root is 0)
+            cache: Deltas and findings from earlier scans
+        """
+        self.graph_request = graph_request
+        self.graph_endpoint = graph_endpoint
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.cache = cache
+        # Shared by every site scan; created by iter_scan()
+        self._permission_pool: Optional[ThreadPoolExecutor] = None
+
+    def get_json(self, url: str, **kwargs) -> Dict:
+        """GET a Graph URL and return its JSON body."""
+        response = self.graph_request('GET', url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def item_findings(self, drive_id: str, item_id: str) -> Dict[str, int]:
+        """Fetch and classify every permission of one driveItem."""
+        findings: Dict[str, int] = {}
+        url = f"{self.graph_endpoint}/drives/{drive_id}/items/{item_id}/permissions"
+        while url:
+            data = self.get_json(url)
+            for key, count in classify_permissions(data.get('value', [])).items():
+                findings[key] = findings.get(key, 0) + count
+            url = data.get('@odata.nextLink')
+        return findings
+
+    def scan_drive(self, drive_id: str) -> Dict[str, int]:
+        """
+        Bring one drive's findings up to date and return their totals.
+
+        Uses the cached deltaLink when there is one, so only changed items
+        are fetched. Permissions of shared items within the crawl-depth
+        limit are then looked up in parallel. Depths are computed once the
+        delta is complete, from the folders seen in it and (on re-scans)
+        the folders cached from earlier scans.
+        """
+        state = self.cache.get(drive_id) if self.cache else {}
+        findings: Dict[str, Dict[str, int]] = dict(state.get('findings', {}))
+        folders: Dict[str, Optional[str]] = dict(state.get('folders', {}))
+        initial_url = f"{self.graph_endpoint}/drives/{drive_id}/root/delta?$select={DELTA_SELECT}"
+        url = state.get('delta_link') or initial_url
+        headers = {'Prefer': DELTA_PREFER}
+
+        shared_items: List[Dict] = []
+        delta_link = None
+        while url:
+            response = self.graph_request('GET', url, headers=headers)
+            if response.status_code == 410 and state.get('delta_link'):
+                # The delta token expired on the server; rescan the drive from scratch
+                state = {}
+                findings = {}
+                folders = {}
+                shared_items = []
+                url = initial_url
+                continue
+            response.raise_for_status()
+            data = response.json()
+            for item in data.get('value', []):
+                item_id = item.get('id')
+                findings.pop(item_id, None)
+                if 'deleted' in item:
+                    folders.pop(item_id, None)
+                    continue
+                if 'root' in item:
+                    folders[item_id] = None
+                elif 'folder' in item:
+                    folders[item_id] = (item.get('parentReference') or {}).get('id')
+                if 'root' in item or 'shared' in item or '@microsoft.graph.sharedChanged' in item:
+                    shared_items.append(item)
+            url = data.get('@odata.nextLink')
+            if not url:
+                delta_link = data.get('@odata.deltaLink')
+
+        to_check = []
+        for item in shared_items:
+            depth = item_depth(item, folders)
+            # An unknown depth is inspected rather than risk missing shared content
+            if depth is None or depth <= self.max_depth:
+                to_check.append(item['id'])
+
+        results = self._permission_pool.map(lambda item_id: self.item_findings(drive_id, item_id), to_check)
+        for item_id, item_findings in zip(to_check, results):
+            if item_findings:
+                findings[item_id] = item_findings
+
+        if self.cache and delta_link:
+            self.cache.put(drive_id, {'delta_link': delta_link, 'findings': findings, 'folders': folders})
+
+        totals: Dict[str, int] = {}
+        for item_findings in findings.values():
+            for key, count in item_findings.items():
+                totals[key] = totals.get(key, 0) + count
+        return totals
+
+    def scan_site(self, site: Dict) -> Dict:
+        """
+        Scan every drive of a site and build its scored report row.
+
+        Args:
+            site: Site resource with id, displayName and webUrl
+
+        Returns:
+            Report row with per-finding counts, risk_score and risk_level
+        """
+        row = {
+            'type': 'SharePoint Site',
+            'name': site.get('displayName'),
+            'url': site.get('webUrl'),
+            'id': site.get('id'),
+        }
+
+        totals = {key: 0 for key in FINDING_KEYS}
+        try:
+            url = f"{self.graph_endpoint}/sites/{site.get('id')}/drives?$select=id"
+            while url:
+                data = self.get_json(url)
+                for drive in data.get('value', []):
+                    for key, count in self.scan_drive(drive['id']).items():
+                        totals[key] += count
+                url = data.get('@odata.nextLink')
+        except requests.exceptions.RequestException as e:
+            print(f"   ⚠️  Could not scan site {site.get('displayName')}: {e}")
+            row['risk_level'] = 'MEDIUM'
+            return row
+
+        score = risk_score(totals)
+        row.update(totals)
+        row['risk_score'] = score
+        row['risk_level'] = risk_level_for_score(score)
+        return row
+
+    def iter_scan(self, sites: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Scan sites concurrently and yield their rows in the original order.
+
+        Sites are pulled lazily with a bounded window of in-flight scans,
+        so a streaming site listing is consumed only as fast as scans
+        complete. Scans not yet started are cancelled if the caller stops
+        early.
+
+        Args:
+            sites: Site resources (any iterable, including a generator)
+
+        Yields:
+            Scored report rows
+        """
+        self._permission_pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            yield from ordered_map(self.scan_site, sites, self.workers)
+        finally:
+            self._permission_pool.shutdown(wait=False)
+            if self.cache:
+                self.cache.save()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Atlassian Scanner Test
+======================
+
+Runs the Atlassian AI scanner against recorded Confluence and Jira
+responses. No Atlassian site, credentials or network access are required.
+
+Usage:
+    python test_atlassian_scanner.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from email.utils import formatdate
+
+import requests
+
+from ai_catalog import AICatalog, KeywordMatcher
+from atlassian_ai_scanner import AtlassianAIScanner
+from atlassian_client import AtlassianClient
+from findings_store import FindingsStore, PLATFORM_ATLASSIAN
+from http_cache import HTTPCache
+from test_support import RecordedResponse
+
+BASE = "https://example.atlassian.net"
+
+
+class ConfluenceSession:
+    """
+    Serves a paged space listing and answers CQL searches from a
+    (space key, query kind) -> page count map.
+    """
+
+    def __init__(self, space_count, page_size, hits):
+        self.space_count = space_count
+        self.page_size = page_size
+        self.hits = hits
+        self.searches = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None):
+        if url.startswith(f"{BASE}/wiki/rest/api/space"):
+            start = int(url.split('start=')[1]) if 'start=' in url else 0
+            end = min(start + self.page_size, self.space_count)
+            body = {
+                "results": [{"key": f"S{i}", "name": f"Space {i}"} for i in range(start, end)],
+                "_links": {"base": f"{BASE}/wiki"}
+            }
+            if end < self.space_count:
+                body["_links"]["next"] = f"/rest/api/space?limit={self.page_size}&start={end}"
+            return RecordedResponse(body)
+
+        if url == f"{BASE}/wiki/rest/api/search":
+            cql = params['cql']
+            with self.lock:
+                self.searches.append(cql)
+            space_key = cql.split('"')[1]
+            kind = 'macro' if 'macro in' in cql else 'content'
+            return RecordedResponse({"results": [], "size": 0, "totalSize": self.hits.get((space_key, kind), 0)})
+
+        raise AssertionError(f"unexpected request: {url}")
+
+
+def make_scanner(session, **kwargs):
+    scanner = AtlassianAIScanner('example.atlassian.net', 'user@example.com', 'token', **kwargs)
+    scanner.client.session = session
+    return scanner
+
+
+def test_confluence_pages_through_all_spaces():
+    """Every space on every page is scanned, not just the first ten."""
+    session = ConfluenceSession(space_count=250, page_size=100,
+                                hits={('S7', 'macro'): 3, ('S7', 'content'): 1, ('S212', 'content'): 4})
+    results = make_scanner(session, workers=8).check_confluence_ai_features()
+
+    assert len(session.searches) == 500
+    assert {cql.split('"')[1] for cql in session.searches} == {f"S{i}" for i in range(250)}
+    assert [r['key'] for r in results] == ['S7', 'S212']
+    assert results[0]['risk_level'] == 'HIGH' and results[1]['risk_level'] == 'MEDIUM'
+    assert results[0]['status'].startswith('3 pages with AI macros')
+
+
+def test_confluence_space_failure_does_not_stop_the_crawl():
+    """A space whose search fails is reported and skipped; every other space is still scanned."""
+    session = ConfluenceSession(space_count=120, page_size=50,
+                                hits={('S2', 'content'): 1, ('S90', 'macro'): 2, ('S40', 'macro'): 5})
+    get = session.get
+
+    def flaky_get(url, params=None):
+        if '"S40"' in (params or {}).get('cql', ''):
+            raise requests.exceptions.ConnectionError("connection reset")
+        return get(url, params)
+
+    session.get = flaky_get
+    results = make_scanner(session, workers=4).check_confluence_ai_features()
+
+    assert [r['key'] for r in results] == ['S2', 'S90']
+    assert {cql.split('"')[1] for cql in session.searches} == {f"S{i}" for i in range(120)} - {'S40'}
+
+
+def test_confluence_cql_is_built_once():
+    """Configured macros and terms are quoted into the CQL for every space."""
+    session = ConfluenceSession(space_count=1, page_size=100, hits={})
+    catalog = AICatalog(confluence_macros=('chatgpt',), confluence_terms=('Say "hi"',))
+    make_scanner(session, catalog=catalog).check_confluence_ai_features()
+
+    macro_cql, content_cql = sorted(session.searches, key=lambda cql: 'macro in' not in cql)
+    assert macro_cql.endswith('macro in ("chatgpt")')
+    assert 'text ~ "\\"Say \\"hi\\"\\""' in content_cql
+
+
+class AppMetadataSession:
+    """Serves a recorded Jira installed-apps listing."""
+
+    def __init__(self, apps):
+        self.apps = apps
+
+    def get(self, url, params=None):
+        assert url == f"{BASE}/rest/api/3/app/metadata", url
+        return RecordedResponse({"installedApps": self.apps})
+
+
+RECORDED_APPS = [
+    {"key": "com.example.ai-summarizer", "name": "AI Summarizer for Jira", "vendor": {"name": "Example"}},
+    {"key": "com.example.maintenance", "name": "Maintenance Planner", "vendor": {"name": "Example"}},
+    {"key": "com.example.email", "name": "Email This Issue", "vendor": {"name": "Example"}},
+    {"key": "com.example.html", "name": "HTML Macro Pack", "vendor": {"name": "Example"}},
+    {"key": "com.vendor.helper", "name": "Ticket Helper", "vendor": {"name": "OpenAI"}},
+    {"key": "com.example.ml", "name": "Issue Triage with Machine   Learning", "vendor": {"name": "Example"}},
+]
+
+
+def test_jira_apps_match_whole_words():
+    """Keywords match whole words only, and the matched rule is reported."""
+    results = make_scanner(AppMetadataSession(RECORDED_APPS)).check_jira_ai_addons()
+    rules = {r['key']: r['matched_rule'] for r in results}
+
+    assert rules == {
+        'com.example.ai-summarizer': 'keyword:ai',
+        'com.vendor.helper': 'vendor:OpenAI',
+        'com.example.ml': 'keyword:machine learning',
+    }
+
+
+class PagedAppSession:
+    """Serves installed apps with Jira offset pagination (startAt/maxResults/total)."""
+
+    def __init__(self, apps, page_size):
+        self.apps = apps
+        self.page_size = page_size
+        self.requests = []
+
+    def get(self, url, params=None):
+        assert url == f"{BASE}/rest/api/3/app/metadata", url
+        start = (params or {}).get('startAt', 0)
+        self.requests.append(start)
+        page = self.apps[start:start + self.page_size]
+        return RecordedResponse({"installedApps": page, "startAt": start,
+                                 "maxResults": self.page_size, "total": len(self.apps)})
+
+
+def test_jira_apps_follow_offset_pagination():
+    """Apps on later startAt pages are classified too."""
+    session = PagedAppSession(RECORDED_APPS, page_size=4)
+    results = make_scanner(session).check_jira_ai_addons()
+
+    assert session.requests == [0, 4]
+    assert {r['key'] for r in results} == {'com.example.ai-summarizer', 'com.vendor.helper', 'com.example.ml'}
+
+
+def test_cursor_next_links_resolve_for_v1_and_v2():
+    """v1 next links are relative to _links.base; v2 links already include /wiki."""
+    url = f"{BASE}/wiki/api/v2/spaces"
+    assert AtlassianClient.resolve_next_link(url, {"next": "/wiki/api/v2/spaces?cursor=abc"}) == \
+        f"{BASE}/wiki/api/v2/spaces?cursor=abc"
+    assert AtlassianClient.resolve_next_link(url, {"next": "/rest/api/space?start=100", "base": f"{BASE}/wiki"}) == \
+        f"{BASE}/wiki/rest/api/space?start=100"
+
+
+class SiteSession:
+    """A whole site: Jira apps, a Confluence space listing and the license; can go offline."""
+
+    def __init__(self):
+        self.confluence = ConfluenceSession(space_count=5, page_size=100, hits={('S1', 'macro'): 2})
+        self.offline = False
+
+    def get(self, url, params=None):
+        if self.offline:
+            raise requests.exceptions.ConnectionError("site unreachable")
+        if url == f"{BASE}/rest/api/3/app/metadata":
+            return RecordedResponse({"installedApps": RECORDED_APPS})
+        if url == f"{BASE}/rest/api/3/instance/license":
+            return RecordedResponse({"applications": []})
+        return self.confluence.get(url, params)
+
+
+def test_failed_site_scan_is_not_recorded_as_complete():
+    """A scan of an unreachable site is not diffed against; the last good scan stays the latest."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = FindingsStore(os.path.join(tmp_dir, 'findings.db'))
+        session = SiteSession()
+        scanner = make_scanner(session)
+
+        scanner.scan()
+        first = scanner.record(store)
+        session.offline = True
+        scanner.scan()
+        failed = scanner.record(store)
+        assert scanner.fetch_error is not None and scanner.results == []
+
+        # Partly reachable: Confluence search fails for one space
+        session.offline = False
+        search = session.confluence.get
+
+        def flaky_search(url, params=None):
+            if '"S3"' in (params or {}).get('cql', ''):
+                raise requests.exceptions.ReadTimeout("timed out")
+            return search(url, params)
+
+        session.confluence.get = flaky_search
+        scanner.scan()
+        partial = scanner.record(store)
+
+        scans = store.scans(PLATFORM_ATLASSIAN, 'example.atlassian.net')
+        latest = store.latest_scan(PLATFORM_ATLASSIAN, 'example.atlassian.net')
+
+    assert failed != first and partial != first
+    assert [scan['scan_id'] for scan in scans] == [first]
+    assert latest['scan_id'] == first and latest['finding_count'] == 5
+
+
+def test_rate_limited_request_with_date_retry_after_is_retried():
+    """A 429 with an HTTP-date Retry-After is waited out and retried, not a crash."""
+    responses = [RecordedResponse({}, status_code=429, headers={'Retry-After': formatdate(usegmt=True)}),
+                 RecordedResponse({"key": "value"})]
+
+    class ThrottledSession:
+        def get(self, url, params=None):
+            return responses.pop(0)
+
+    client = AtlassianClient('user@example.com', 'token')
+    client.session = ThrottledSession()
+
+    assert client.get_json(f"{BASE}/rest/api/3/myself") == {"key": "value"}
+    assert client.request_count == 2
+
+
+def test_repeat_scan_within_ttl_is_served_from_cache():
+    """A second scan of the same site within the TTL makes no requests."""
+    hits = {('S3', 'macro'): 2}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = AtlassianClient('user@example.com', 'token', cache=HTTPCache(tmp_dir), cache_ttl=3600)
+        client.session = ConfluenceSession(space_count=150, page_size=100, hits=hits)
+        first = AtlassianAIScanner('example.atlassian.net', client=client).check_confluence_ai_features()
+        requests_made = client.request_count
+
+        client.session = ConfluenceSession(space_count=0, page_size=100, hits={})
+        second = AtlassianAIScanner('example.atlassian.net', client=client).check_confluence_ai_features()
+
+        assert requests_made == 2 + 300
+        assert client.request_count == requests_made
+        assert client.cache_hits == requests_made
+        assert second == first and first[0]['key'] == 'S3'
+
+        client.cache_ttl = 0
+        assert AtlassianAIScanner('example.atlassian.net', client=client).check_confluence_ai_features() == []
+
+
+def test_catalog_file_replaces_defaults():
+    """A catalog file replaces the lists it contains and keeps the other defaults."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'catalog.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"keywords": ["summarizer"], "vendors": []}, f)
+        catalog = AICatalog.load(path)
+
+    results = make_scanner(AppMetadataSession(RECORDED_APPS), catalog=catalog).check_jira_ai_addons()
+    assert [r['matched_rule'] for r in results] == ['keyword:summarizer']
+    assert catalog.confluence_macros and catalog.confluence_terms
+
+
+def test_large_catalog_matches_shared_prefixes():
+    """Thousands of terms with shared prefixes compile to one matcher that picks the right term."""
+    terms = [f"gpt-{i}" for i in range(5000)] + ['gpt', 'gpt-4o', 'c++ copilot']
+    matcher = KeywordMatcher(terms)
+
+    assert matcher.search("Powered by GPT-4o") == 'gpt-4o'
+    assert matcher.search("uses gpt-1234 models") == 'gpt-1234'
+    assert matcher.search("plain gpt here") == 'gpt'
+    assert matcher.search("C++  Copilot plugin") == 'c++ copilot'
+    assert matcher.search("gpt-12345") == 'gpt'
+    assert matcher.search("chatgptx") is None
+
+
+def main():
+    print("=" * 60)
+    print("Atlassian Scanner - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_confluence_pages_through_all_spaces,
+        test_confluence_space_failure_does_not_stop_the_crawl,
+        test_confluence_cql_is_built_once,
+        test_jira_apps_match_whole_words,
+        test_jira_apps_follow_offset_pagination,
+        test_cursor_next_links_resolve_for_v1_and_v2,
+        test_failed_site_scan_is_not_recorded_as_complete,
+        test_rate_limited_request_with_date_retry_after_is_retried,
+        test_repeat_scan_within_ttl_is_served_from_cache,
+        test_catalog_file_replaces_defaults,
+        test_large_catalog_matches_shared_prefixes,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Audit Checkpoint Test
+=====================
+
+Streams audits into CSV reports against the local mock GitHub API, kills
+or interrupts them part way and resumes them from their checkpoints. No
+token or network access is required.
+
+Usage:
+    python test_audit_checkpoint.py
+"""
+
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+
+import requests
+
+from audit_checkpoint import AuditCheckpoint
+from github_copilot_auditor import AuditAbortedError, GitHubCopilotAuditor, truncate_report
+from mock_github_server import MockGitHubConfig, MockGitHubServer
+from test_support import run_main
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Child process: audit into the report and die without any cleanup after kill_after rows
+CRASHING_AUDIT = """
+import os, sys
+from audit_checkpoint import AuditCheckpoint
+from github_copilot_auditor import GitHubCopilotAuditor
+
+base_url, checkpoint_path, output_file, kill_after = sys.argv[1:5]
+auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=4,
+                               checkpoint=AuditCheckpoint(checkpoint_path, 'acme', output_file))
+auditor.base_url = base_url
+
+def results():
+    for count, result in enumerate(auditor.iter_audit()):
+        if count == int(kill_after):
+            os._exit(9)
+        yield result
+
+auditor.generate_report(results(), output_file)
+"""
+
+
+def read_repo_names(path):
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        return [row['repo_name'] for row in csv.DictReader(csvfile)]
+
+
+def resume(base_url, checkpoint_path, workers=4):
+    """Resume the audit of 'acme' the way --resume does."""
+    checkpoint = AuditCheckpoint.load(checkpoint_path, 'acme')
+    auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=workers, checkpoint=checkpoint)
+    auditor.base_url = base_url
+    with redirect_stdout(io.StringIO()):
+        auditor.generate_report(auditor.iter_audit(), checkpoint.output_file, append=True)
+    return checkpoint
+
+
+def test_resume_after_hard_crash_writes_each_repo_once():
+    """Rows flushed after the last checkpoint save are not duplicated on resume."""
+    with MockGitHubServer(MockGitHubConfig(org_size=350)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_path = os.path.join(tmp_dir, 'acme.checkpoint.json')
+        output_file = os.path.join(tmp_dir, 'acme.csv')
+        crashed = subprocess.run([sys.executable, '-c', CRASHING_AUDIT, server.url, checkpoint_path,
+                                  output_file, '250'], cwd=SCRIPT_DIR, capture_output=True)
+
+        assert crashed.returncode == 9, crashed.stderr
+        assert len(read_repo_names(output_file)) == 250
+        assert AuditCheckpoint.load(checkpoint_path, 'acme').checked_count == 200
+
+        resume(server.url, checkpoint_path)
+        names = read_repo_names(output_file)
+
+    assert len(names) == 350 and len(set(names)) == 350
+    assert names == [f"acme/repo-{i:06d}" for i in range(350)]
+
+
+def test_resume_after_interruption_continues_from_checkpoint():
+    """An aborted audit saves its exact position; the resumed run checks only the rest."""
+    with MockGitHubServer(MockGitHubConfig(org_size=250)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_path = os.path.join(tmp_dir, 'acme.checkpoint.json')
+        output_file = os.path.join(tmp_dir, 'acme.csv')
+        # Sequential, so no check of the aborted run is still in flight when counting
+        auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=1,
+                                       checkpoint=AuditCheckpoint(checkpoint_path, 'acme', output_file))
+        auditor.base_url = server.url
+
+        def results():
+            for count, result in enumerate(auditor.iter_audit()):
+                if count == 130:
+                    raise AuditAbortedError("connection reset")
+                yield result
+
+        try:
+            with redirect_stdout(io.StringIO()):
+                auditor.generate_report(results(), output_file)
+            assert False, "audit should have been aborted"
+        except AuditAbortedError:
+            pass
+
+        saved = AuditCheckpoint.load(checkpoint_path, 'acme')
+        assert saved.checked_count == 130 and saved.output_file == output_file
+
+        copilot_checks_before = server.server.state.requests['/repos/{repo}/copilot']
+        resume(server.url, checkpoint_path)
+        copilot_checks = server.server.state.requests['/repos/{repo}/copilot'] - copilot_checks_before
+        names = read_repo_names(output_file)
+
+    assert names == [f"acme/repo-{i:06d}" for i in range(250)]
+    assert copilot_checks == 120
+
+
+def test_network_failure_mid_audit_can_be_resumed():
+    """A connection error during the Copilot checks ends main() with the --resume hint."""
+    original_api_get = GitHubCopilotAuditor.api_get
+    copilot_calls = []
+
+    def failing_api_get(self, url, params=None):
+        if url.endswith('/copilot'):
+            copilot_calls.append(url)
+            if len(copilot_calls) == 61:
+                raise requests.exceptions.ConnectionError("connection reset by peer")
+        return original_api_get(self, url, params)
+
+    with MockGitHubServer(MockGitHubConfig(org_size=150)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, 'acme.csv')
+        with mock.patch.object(GitHubCopilotAuditor, 'api_get', failing_api_get):
+            code, output = run_main(server.url, ['--org', 'acme', '--output', output_file], tmp_dir)
+
+        checkpoint_path = os.path.join(tmp_dir, 'github_copilot_audit_acme.checkpoint.json')
+        assert code == 1
+        assert "Error checking Copilot for acme/repo-000060" in output
+        assert "Re-run with --resume to continue" in output
+        assert AuditCheckpoint.load(checkpoint_path, 'acme').checked_count == 60
+
+        code, _ = run_main(server.url, ['--org', 'acme', '--resume'], tmp_dir)
+        names = read_repo_names(output_file)
+
+    assert code == 0
+    assert names == [f"acme/repo-{i:06d}" for i in range(150)]
+
+
+def test_checkpoint_rejects_other_organization_or_backend():
+    """A checkpoint is only resumed for the organization and backend it was taken with."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'state.json')
+        checkpoint = AuditCheckpoint(path, 'acme', 'acme.csv', enumeration='graphql')
+        checkpoint.record_page([{'full_name': 'acme/a'}], 'Y3Vyc29y')
+
+        for org, enumeration in (('other', 'graphql'), ('acme', 'rest')):
+            try:
+                AuditCheckpoint.load(path, org, enumeration)
+                assert False, f"loaded for {org}/{enumeration}"
+            except ValueError:
+                pass
+
+        restored = AuditCheckpoint.load(path, 'acme', 'graphql')
+
+    assert restored.next_page == 'Y3Vyc29y' and list(restored.pending_repos) == [{'full_name': 'acme/a'}]
+
+
+def test_truncate_report_drops_partial_last_row():
+    """Rows beyond the checkpoint, including a half-written last line, are cut."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'report.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write('repo_name,risk_level\r\norg/a,LOW\r\n"org/b, quoted",HIGH\r\norg/c,LOW\r\norg/d,HI')
+
+        dropped = truncate_report(path, 2)
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            content = f.read()
+
+    assert dropped == 2
+    assert content == 'repo_name,risk_level\r\norg/a,LOW\r\n"org/b, quoted",HIGH\r\n'
+
+
+def main():
+    print("=" * 60)
+    print("Audit Checkpoint - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_resume_after_hard_crash_writes_each_repo_once,
+        test_resume_after_interruption_continues_from_checkpoint,
+        test_network_failure_mid_audit_can_be_resumed,
+        test_checkpoint_rejects_other_organization_or_backend,
+        test_truncate_report_drops_partial_last_row,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
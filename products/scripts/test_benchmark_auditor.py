@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner Test
+=====================
+
+Runs the benchmark's audit process against the local mock GitHub API and
+checks that a run that dies or hangs fails the benchmark instead of
+blocking it. No token or network access is required.
+
+Usage:
+    python test_benchmark_auditor.py
+"""
+
+import multiprocessing
+import sys
+import time
+
+from benchmark_auditor import BenchmarkError, _wait_for_result, run_benchmark
+from mock_github_server import MockGitHubConfig
+
+
+def _hang():
+    time.sleep(60)
+
+
+def test_benchmark_measures_a_run():
+    """A successful run reports its throughput and the requests it made."""
+    result = run_benchmark(MockGitHubConfig(org_size=150), workers=4, timeout=60)
+
+    assert result['audited'] == 150
+    assert result['requests_by_endpoint']['/repos/{repo}/copilot'] == 150
+
+
+def test_audit_that_exits_fails_the_benchmark():
+    """The auditor exiting (unknown organization) raises instead of blocking on the result queue."""
+    start = time.monotonic()
+    try:
+        run_benchmark(MockGitHubConfig(org_size=10, missing_orgs=('bench-org',)), workers=2, timeout=60)
+        assert False, "benchmark should have failed"
+    except BenchmarkError as e:
+        assert 'status 1' in str(e), e
+    assert time.monotonic() - start < 30
+
+
+def test_hung_audit_times_out():
+    """An audit process that never reports is stopped after the timeout."""
+    result_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_hang, daemon=True)
+    process.start()
+    try:
+        _wait_for_result(process, result_queue, timeout=1)
+        assert False, "wait should have timed out"
+    except BenchmarkError as e:
+        assert 'did not finish' in str(e), e
+    assert not process.is_alive()
+
+
+def main():
+    print("=" * 60)
+    print("Benchmark Runner - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_benchmark_measures_a_run,
+        test_audit_that_exits_fails_the_benchmark,
+        test_hung_audit_times_out,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
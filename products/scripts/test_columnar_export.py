@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Columnar Export Test
+====================
+
+Writes recorded report rows to Parquet and Arrow IPC files and reads them
+back to check column types and row groups. Requires pyarrow; no network
+access is needed.
+
+Usage:
+    python test_columnar_export.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from columnar_export import ColumnarWriter, is_available, to_bool, to_timestamp
+from findings_store import PLATFORM_GITHUB, PLATFORM_M365
+from github_copilot_auditor import GitHubCopilotAuditor
+
+
+def github_row(i, risk='LOW', copilot='No'):
+    return {'repo_name': f'org/r{i}', 'is_private': 'Yes', 'copilot_enabled': copilot, 'risk_level': risk,
+            'url': f'https://github.com/org/r{i}', 'created_at': '2023-01-02T03:04:05Z',
+            'updated_at': '2024-06-01T00:00:00Z', 'pushed_at': ''}
+
+
+def test_parquet_columns_are_typed():
+    """Flags become booleans, risk_level is categorical and timestamps are UTC."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'audit.parquet')
+        with ColumnarWriter(path, PLATFORM_GITHUB) as writer:
+            writer.add(github_row(1, 'HIGH', 'Yes'))
+            writer.add(github_row(2, 'LOW', 'Error'))
+        table = pq.read_table(path)
+
+    assert table.schema.field('is_private').type == pa.bool_()
+    assert table.schema.field('copilot_enabled').type == pa.bool_()
+    assert pa.types.is_dictionary(table.schema.field('risk_level').type)
+    assert table.schema.field('created_at').type == pa.timestamp('ms', tz='UTC')
+    assert table.column('copilot_enabled').to_pylist() == [True, None]
+    assert table.column('risk_level').to_pylist() == ['HIGH', 'LOW']
+    assert table.column('pushed_at').to_pylist() == [None, None]
+    assert table.column('created_at')[0].as_py() == datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def test_rows_stream_into_row_groups():
+    """Rows are written a row group at a time as they arrive."""
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'audit.parquet')
+        writer = ColumnarWriter(path, PLATFORM_GITHUB, row_group_size=100)
+        for i in range(250):
+            writer.add(github_row(i))
+        assert writer.count == 200 and writer._pending_rows == 50
+        writer.close()
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.metadata.num_rows == 250
+
+
+def test_arrow_ipc_keeps_one_risk_dictionary():
+    """Arrow IPC batches share the fixed risk dictionary, whatever levels each batch holds."""
+    import pyarrow.ipc as ipc
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'check.arrow')
+        with ColumnarWriter(path, PLATFORM_M365, row_group_size=2) as writer:
+            writer.add({'type': 'User', 'email': 'a@example.com', 'copilot_licensed': 'Yes',
+                        'license_count': 3, 'risk_level': 'MEDIUM'})
+            writer.add({'type': 'User', 'email': 'b@example.com', 'copilot_licensed': 'No',
+                        'license_count': '1', 'risk_level': 'LOW'})
+            writer.add({'type': 'SharePoint Site', 'name': 'Finance', 'anonymous_links': 1,
+                        'risk_score': 10, 'risk_level': 'HIGH'})
+        table = ipc.open_file(path).read_all()
+
+    assert table.column('risk_level').to_pylist() == ['MEDIUM', 'LOW', 'HIGH']
+    assert table.column('copilot_licensed').to_pylist() == [True, False, None]
+    assert table.column('license_count').to_pylist() == [3, 1, None]
+    assert table.column('risk_score').to_pylist() == [None, None, 10]
+
+
+def test_generate_report_exports_alongside_csv():
+    """generate_report() writes the same rows to the CSV and the export."""
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        export_path = os.path.join(tmp_dir, 'audit.parquet')
+        results = [dict(github_row(i), is_private='No', copilot_enabled='Yes', risk_level='CRITICAL')
+                   for i in range(3)]
+        GitHubCopilotAuditor('token', 'org').generate_report(
+            iter(results), os.path.join(tmp_dir, 'audit.csv'), export_file=export_path)
+        table = pq.read_table(export_path)
+
+    assert table.num_rows == 3
+    assert table.column('is_private').to_pylist() == [False] * 3
+    assert table.column('risk_level').to_pylist() == ['CRITICAL'] * 3
+
+
+def test_value_conversions():
+    """Report strings map onto typed values; unknown values become null."""
+    assert [to_bool(v) for v in ('Yes', 'No', True, 'Error', 'Unknown', None)] == \
+        [True, False, True, None, None, None]
+    assert to_timestamp('2024-06-01T12:00:00+02:00') == datetime(2024, 6, 1, 10, tzinfo=timezone.utc)
+    assert to_timestamp('') is None
+
+
+def test_unknown_platform_is_rejected():
+    """Only the findings store platforms have export schemas."""
+    try:
+        ColumnarWriter(os.path.join(tempfile.gettempdir(), 'x.parquet'), 'slack')
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def main():
+    print("=" * 60)
+    print("Columnar Export - Tests")
+    print("=" * 60)
+
+    if not is_available():
+        print("   ⚠️  pyarrow not installed; skipping (pip install pyarrow)")
+        return
+
+    tests = [
+        test_parquet_columns_are_typed,
+        test_rows_stream_into_row_groups,
+        test_arrow_ipc_keeps_one_risk_dictionary,
+        test_generate_report_exports_alongside_csv,
+        test_value_conversions,
+        test_unknown_platform_is_rejected,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Concurrent Checks Test
+======================
+
+Runs the auditor's Copilot checks on a thread pool against the local mock
+GitHub API, with checks finishing out of order, and checks that results
+keep the input order and that no more than workers * 2 repositories are
+in flight at a time. No token or network access is required.
+
+Usage:
+    python test_concurrent_checks.py
+"""
+
+import io
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+
+from github_copilot_auditor import GitHubCopilotAuditor
+from mock_github_server import MockGitHubConfig, MockGitHubServer, make_repo
+
+
+class CheckTracker:
+    """Counts repositories pulled from the source and checks running at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pulled = 0
+        self.running = 0
+        self.max_running = 0
+
+    def source(self, repos):
+        for repo in repos:
+            with self.lock:
+                self.pulled += 1
+            yield repo
+
+    def wrap(self, audit_repo, delay):
+        def tracked(repo):
+            with self.lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(delay(repo))
+                return audit_repo(repo)
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return tracked
+
+
+def make_repos(count, config):
+    return [make_repo('acme', i, config) for i in range(count)]
+
+
+def repo_index(repo):
+    return int(repo['full_name'].rsplit('-', 1)[-1])
+
+
+def test_results_keep_input_order():
+    """Later repositories finishing first are still yielded in input order."""
+    config = MockGitHubConfig(org_size=60, latency=0.002)
+    with MockGitHubServer(config) as server:
+        auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=6)
+        auditor.base_url = server.url
+        tracker = CheckTracker()
+        # Within every window of 12, the earliest repositories take longest
+        auditor.audit_repo = tracker.wrap(auditor.audit_repo, lambda repo: (11 - repo_index(repo) % 12) * 0.003)
+
+        with redirect_stdout(io.StringIO()):
+            results = list(auditor.iter_checks(tracker.source(make_repos(60, config))))
+
+    assert [r['repo_name'] for r in results] == [f"acme/repo-{i:06d}" for i in range(60)]
+    assert all(r['copilot_enabled'] in ('Yes', 'No') for r in results)
+    assert tracker.max_running > 1
+
+
+def test_in_flight_checks_are_bounded():
+    """The source is read at most workers * 2 repositories ahead of the consumer."""
+    config = MockGitHubConfig(org_size=100, latency=0.005)
+    with MockGitHubServer(config) as server:
+        auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=4)
+        auditor.base_url = server.url
+        tracker = CheckTracker()
+        auditor.audit_repo = tracker.wrap(auditor.audit_repo, lambda repo: 0.001)
+
+        ahead = []
+        with redirect_stdout(io.StringIO()):
+            for consumed, _ in enumerate(auditor.iter_checks(tracker.source(make_repos(100, config))), 1):
+                with tracker.lock:
+                    ahead.append(tracker.pulled - consumed)
+                # A slow consumer must not let the pool run further ahead
+                time.sleep(0.002)
+
+    assert len(ahead) == 100
+    assert max(ahead) == 4 * 2 - 1
+    assert tracker.max_running <= 4
+
+
+def test_stopping_early_leaves_the_rest_unread():
+    """A consumer that stops early cancels queued checks; the rest of the source is not read."""
+    config = MockGitHubConfig(org_size=1000, latency=0.002)
+    with MockGitHubServer(config) as server:
+        auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=4)
+        auditor.base_url = server.url
+        tracker = CheckTracker()
+
+        checks = auditor.iter_checks(tracker.source(make_repos(1000, config)))
+        with redirect_stdout(io.StringIO()):
+            first = [next(checks) for _ in range(10)]
+            checks.close()
+        time.sleep(0.05)
+        copilot_checks = server.server.state.requests['/repos/{repo}/copilot']
+
+    assert [r['repo_name'] for r in first] == [f"acme/repo-{i:06d}" for i in range(10)]
+    assert tracker.pulled <= 10 + 4 * 2
+    assert copilot_checks <= tracker.pulled
+
+
+def main():
+    print("=" * 60)
+    print("Concurrent Checks - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_results_keep_input_order,
+        test_in_flight_checks_are_bounded,
+        test_stopping_early_leaves_the_rest_unread,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
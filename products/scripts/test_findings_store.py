@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Findings Store Test
+===================
+
+Records scans in a temporary SQLite findings store and checks the trend,
+change and history queries. No network access is required.
+
+Usage:
+    python test_findings_store.py
+"""
+
+import os
+import sys
+import tempfile
+
+from findings_store import FindingsStore, PLATFORM_ATLASSIAN, PLATFORM_GITHUB, PLATFORM_M365, entity_of
+from github_copilot_auditor import GitHubCopilotAuditor
+
+
+def repo(name, risk):
+    return {'repo_name': name, 'is_private': True, 'copilot_enabled': 'Yes', 'risk_level': risk}
+
+
+def make_store(tmp_dir):
+    return FindingsStore(os.path.join(tmp_dir, 'findings.db'))
+
+
+def test_changes_between_first_and_last_scan():
+    """Only entities whose risk differs between the period's first and last scan are reported."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = make_store(tmp_dir)
+        store.record(PLATFORM_GITHUB, 'org', [repo('org/a', 'LOW'), repo('org/b', 'LOW'), repo('org/c', 'HIGH')],
+                     scan_time='2024-05-20T00:00:00Z')
+        store.record(PLATFORM_GITHUB, 'org', [repo('org/a', 'LOW'), repo('org/b', 'LOW'), repo('org/c', 'HIGH')],
+                     scan_time='2024-06-01T00:00:00Z')
+        store.record(PLATFORM_GITHUB, 'org', [repo('org/a', 'CRITICAL'), repo('org/b', 'HIGH'), repo('org/c', 'HIGH')],
+                     scan_time='2024-06-15T00:00:00Z')
+
+        changes = store.risk_changes(PLATFORM_GITHUB, since='2024-06-01')
+        assert [(c['entity'], c['old_risk'], c['new_risk']) for c in changes] == \
+            [('org/a', 'LOW', 'CRITICAL'), ('org/b', 'LOW', 'HIGH')]
+
+        critical = store.risk_changes(PLATFORM_GITHUB, since='2024-06-01', from_risk='LOW', to_risk='CRITICAL')
+        assert [c['entity'] for c in critical] == ['org/a']
+
+        history = store.entity_history(PLATFORM_GITHUB, 'org/a')
+        assert [h['risk_level'] for h in history] == ['LOW', 'LOW', 'CRITICAL']
+
+
+def test_trend_counts_and_incomplete_scans():
+    """Trends count findings per risk level; scans that never completed are ignored."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = make_store(tmp_dir)
+        store.record(PLATFORM_ATLASSIAN, 'x.atlassian.net',
+                     [{'key': 'S1', 'risk_level': 'HIGH'}, {'key': 'S2', 'risk_level': 'MEDIUM'},
+                      {'name': 'Built-in AI Features', 'risk_level': 'MEDIUM'}])
+
+        try:
+            with store.open_scan(PLATFORM_ATLASSIAN, 'x.atlassian.net') as recorder:
+                recorder.add({'key': 'S9', 'risk_level': 'HIGH'})
+                recorder.flush()
+                raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+
+        trend = store.risk_trend(PLATFORM_ATLASSIAN)
+        assert {(t['risk_level'], t['count']) for t in trend} == {('HIGH', 1), ('MEDIUM', 2)}
+        assert len(store.scans()) == 1 and store.scans()[0]['finding_count'] == 3
+
+
+def test_generate_report_records_scan():
+    """The GitHub report rows land in the store as one completed scan."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = make_store(tmp_dir)
+        auditor = GitHubCopilotAuditor('token', 'org')
+        results = [dict(repo('org/a', 'HIGH'), url='', created_at='', updated_at='', pushed_at=''),
+                   dict(repo('org/b', 'LOW'), url='', created_at='', updated_at='', pushed_at='')]
+        auditor.generate_report(iter(results), os.path.join(tmp_dir, 'report.csv'), store=store)
+
+        scans = store.scans(PLATFORM_GITHUB, 'org')
+        assert len(scans) == 1 and scans[0]['finding_count'] == 2
+        assert store.snapshot(scans[0]['scan_id'])['org/a']['risk_level'] == 'HIGH'
+
+
+def test_bulk_insert_and_indexed_queries():
+    """Large scans insert in bulk, and entity lookups and change joins use their indexes."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = make_store(tmp_dir)
+        rows = [repo(f"org/r{i}", 'LOW') for i in range(50000)]
+        store.record(PLATFORM_GITHUB, 'org', rows, scan_time='2024-06-01T00:00:00Z')
+        rows[123] = repo('org/r123', 'CRITICAL')
+        store.record(PLATFORM_GITHUB, 'org', rows, scan_time='2024-06-02T00:00:00Z')
+        changes = store.risk_changes(PLATFORM_GITHUB, since='2024-06-01')
+
+        assert [c['entity'] for c in changes] == ['org/r123']
+        assert [scan['finding_count'] for scan in store.scans()] == [50000, 50000]
+
+        conn = store.connect()
+        plan = ' '.join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT scan_time, risk_level FROM findings WHERE platform = ? AND entity = ?",
+            (PLATFORM_GITHUB, 'org/r123')))
+        join_plan = ' '.join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT a.entity FROM findings a JOIN findings b "
+            "ON b.scan_id = ? AND b.entity = a.entity AND b.type IS a.type WHERE a.scan_id = ?", (2, 1)))
+        conn.close()
+        assert 'idx_findings_platform_entity_time_risk' in plan, plan
+        assert 'SCAN' not in join_plan and 'idx_findings_scan_entity' in join_plan, join_plan
+
+
+def test_changes_join_on_id_and_type():
+    """Sites sharing a display name, and rows of different types, are not joined together."""
+    def site(site_id, risk, type_='SharePoint Site'):
+        return {'type': type_, 'name': 'Project', 'id': site_id, 'risk_level': risk}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = make_store(tmp_dir)
+        store.record(PLATFORM_M365, 'tenant', [site('s1', 'HIGH'), site('s2', 'LOW'), site('x', 'LOW', 'Microsoft Teams')],
+                     scan_time='2024-06-01T00:00:00Z')
+        store.record(PLATFORM_M365, 'tenant', [site('s1', 'HIGH'), site('s2', 'LOW'), site('x', 'MEDIUM')],
+                     scan_time='2024-06-02T00:00:00Z')
+
+        changes = store.risk_changes(PLATFORM_M365, since='2024-06-01')
+
+    assert changes == []
+
+
+def test_entity_of_prefers_report_keys():
+    """Entities are identified by repo_name, email or key before display name."""
+    assert entity_of({'repo_name': 'org/a', 'name': 'a'}) == 'org/a'
+    assert entity_of({'type': 'User', 'name': 'Ann', 'email': 'ann@example.com'}) == 'ann@example.com'
+    assert entity_of({'type': 'Jira Add-on', 'name': 'AI Helper', 'key': 'com.x.ai'}) == 'com.x.ai'
+    assert entity_of({'type': 'SharePoint Site', 'name': 'Finance', 'id': 'site-1'}) == 'site-1'
+    assert entity_of({'type': 'Built-in AI Features', 'name': 'Atlassian Intelligence'}) == 'Atlassian Intelligence'
+
+
+def main():
+    print("=" * 60)
+    print("Findings Store - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_changes_between_first_and_last_scan,
+        test_trend_counts_and_incomplete_scans,
+        test_generate_report_records_scan,
+        test_bulk_insert_and_indexed_queries,
+        test_changes_join_on_id_and_type,
+        test_entity_of_prefers_report_keys,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Governance Scan Test
+====================
+
+Runs the combined scan orchestrator against stand-in platform scans. No
+GitHub, Microsoft 365 or Atlassian access is required.
+
+Usage:
+    python test_governance_scan.py
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from governance_scan import (GovernanceScanner, PlatformScan, atlassian_finding,
+                             github_finding, m365_finding)
+
+
+def slow_scan(platform, rows, delay):
+    """A blocking scan that takes delay seconds, like a real platform's API calls."""
+    def run():
+        for row in rows:
+            time.sleep(delay / len(rows))
+            yield row
+    return PlatformScan(platform, run)
+
+
+def meeting_scan(platform, rows, barrier):
+    """A scan that cannot get past barrier unless every other scan is running at the same time."""
+    def run():
+        barrier.wait()
+        yield from rows
+    return PlatformScan(platform, run)
+
+
+def read_report(path):
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def test_platforms_run_concurrently():
+    """All three platforms are scanned at once: each waits for the other two before finishing."""
+    # Run one after another, the first scan would time out at the barrier and break it
+    barrier = threading.Barrier(3, timeout=10)
+    scans = [
+        meeting_scan('GitHub', [github_finding('org', {'repo_name': f'org/r{i}', 'risk_level': 'LOW'})
+                                for i in range(5)], barrier),
+        meeting_scan('Microsoft 365', [m365_finding('tenant', {'type': 'User', 'email': 'a@example.com',
+                                                               'risk_level': 'MEDIUM'})], barrier),
+        meeting_scan('Atlassian', [atlassian_finding({'type': 'Jira Add-on', 'key': 'k', 'site': 'x',
+                                                      'risk_level': 'MEDIUM'})], barrier),
+    ]
+    orchestrator = GovernanceScanner(scans)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'combined.csv')
+        total = orchestrator.run(path)
+        rows = read_report(path)
+
+    assert total == 7 and len(rows) == 7
+    assert {row['platform'] for row in rows} == {'GitHub', 'Microsoft 365', 'Atlassian'}
+    assert all(scan.error is None for scan in scans), [scan.error for scan in scans]
+    assert not barrier.broken
+    assert scans[0].risk_counts == {'LOW': 5}
+
+
+def test_failed_platform_does_not_stop_others():
+    """A platform that raises is recorded; the others still reach the report."""
+    def broken():
+        yield github_finding('org', {'repo_name': 'org/first', 'risk_level': 'HIGH'})
+        raise RuntimeError("403 Forbidden")
+
+    scans = [PlatformScan('GitHub', broken),
+             slow_scan('Atlassian', [atlassian_finding({'type': 'Confluence Space', 'key': 'S1',
+                                                        'site': 'x', 'risk_level': 'HIGH'})], 0.1)]
+    orchestrator = GovernanceScanner(scans)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'combined.csv')
+        orchestrator.run(path)
+        entities = [row['entity'] for row in read_report(path)]
+
+    assert sorted(entities) == ['S1', 'org/first']
+    assert isinstance(scans[0].error, RuntimeError) and scans[1].error is None
+
+
+def test_exiting_platform_does_not_stop_others():
+    """A scanner calling sys.exit() on a fatal error fails only its own platform."""
+    def unauthorized():
+        yield github_finding('org', {'repo_name': 'org/first', 'risk_level': 'HIGH'})
+        sys.exit(1)
+
+    users = [m365_finding('tenant', {'type': 'User', 'email': f'u{i}@example.com', 'risk_level': 'LOW'})
+             for i in range(5)]
+    scans = [PlatformScan('GitHub', unauthorized), slow_scan('Microsoft 365', users, 0.2)]
+    orchestrator = GovernanceScanner(scans)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'combined.csv')
+        total = orchestrator.run(path)
+        platforms = [row['platform'] for row in read_report(path)]
+
+    assert total == 6 and platforms.count('Microsoft 365') == 5
+    assert 'status 1' in str(scans[0].error) and scans[1].error is None
+    assert scans[1].row_count == 5
+
+
+def test_writer_backpressure_keeps_all_rows():
+    """More rows than the queue holds are all written, in each platform's order."""
+    rows = [m365_finding('tenant', {'type': 'User', 'email': f'u{i}@example.com', 'risk_level': 'LOW'})
+            for i in range(500)]
+    orchestrator = GovernanceScanner([PlatformScan('Microsoft 365', lambda: iter(rows))], queue_size=8)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'combined.csv')
+        orchestrator.run(path)
+        written = [row['entity'] for row in read_report(path)]
+
+    assert written == [row['entity'] for row in rows]
+
+
+def test_findings_keep_platform_details():
+    """Platform-specific fields end up in the details column."""
+    row = github_finding('org', {'repo_name': 'org/app', 'is_private': True, 'copilot_enabled': 'Yes',
+                                 'risk_level': 'HIGH', 'url': 'https://github.com/org/app', 'pushed_at': None})
+    assert row['entity'] == 'org/app' and row['url'] == 'https://github.com/org/app'
+    assert row['details'] == 'is_private=True; copilot_enabled=Yes'
+
+    site = m365_finding('tenant', {'type': 'SharePoint Site', 'name': 'Finance', 'anonymous_links': 1,
+                                   'risk_score': 10, 'risk_level': 'HIGH'})
+    assert site['entity'] == 'Finance' and site['details'] == 'anonymous_links=1; risk_score=10'
+
+
+def main():
+    print("=" * 60)
+    print("Governance Scan - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_platforms_run_concurrently,
+        test_failed_platform_does_not_stop_others,
+        test_exiting_platform_does_not_stop_others,
+        test_writer_backpressure_keeps_all_rows,
+        test_findings_keep_platform_details,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+GraphQL Enumeration Test
+========================
+
+Runs the auditor's GraphQL repository enumeration against recorded GitHub
+GraphQL responses. No token or network access is required.
+
+Usage:
+    python test_graphql_enumeration.py
+"""
+
+import sys
+
+from github_copilot_auditor import GitHubCopilotAuditor, REPO_FIELDS, AuditAbortedError
+from test_support import RecordedSession
+
+# Responses recorded from POST /graphql for a two-page organization
+RECORDED_PAGES = [
+    {
+        "data": {
+            "organization": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": True, "endCursor": "Y3Vyc29yOjE="},
+                    "nodes": [
+                        {
+                            "nameWithOwner": "example-org/public-api",
+                            "isPrivate": False,
+                            "url": "https://github.com/example-org/public-api",
+                            "createdAt": "2021-03-04T10:00:00Z",
+                            "updatedAt": "2024-05-01T08:30:00Z",
+                            "pushedAt": "2024-05-01T08:29:00Z"
+                        },
+                        {
+                            "nameWithOwner": "example-org/private-backend",
+                            "isPrivate": True,
+                            "url": "https://github.com/example-org/private-backend",
+                            "createdAt": "2020-11-20T12:00:00Z",
+                            "updatedAt": "2024-04-28T16:00:00Z",
+                            "pushedAt": "2024-04-28T15:59:00Z"
+                        }
+                    ]
+                }
+            }
+        }
+    },
+    {
+        "data": {
+            "organization": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": "Y3Vyc29yOjI="},
+                    "nodes": [
+                        {
+                            "nameWithOwner": "example-org/docs",
+                            "isPrivate": False,
+                            "url": "https://github.com/example-org/docs",
+                            "createdAt": "2022-01-15T09:00:00Z",
+                            "updatedAt": "2023-12-01T11:00:00Z",
+                            "pushedAt": "2023-12-01T10:58:00Z"
+                        }
+                    ]
+                }
+            }
+        }
+    }
+]
+
+RECORDED_NOT_FOUND = {
+    "data": {"organization": None},
+    "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to an Organization with the login of 'missing-org'."}]
+}
+
+RECORDED_RATE_LIMITED = {
+    "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]
+}
+
+
+class GraphQLSession(RecordedSession):
+    """Replays recorded GraphQL responses; any REST call fails the test."""
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        raise AssertionError(f"REST call made in GraphQL mode: {url}")
+
+
+def make_auditor(payloads):
+    auditor = GitHubCopilotAuditor('fake-token', 'example-org', enumeration='graphql')
+    auditor.session = GraphQLSession(payloads)
+    # Skip the GET /rate_limit seed call
+    auditor.budget.update_from_headers({'X-RateLimit-Remaining': '5000', 'X-RateLimit-Reset': '9999999999'})
+    return auditor
+
+
+def test_maps_fields_and_follows_cursor():
+    """Nodes map onto REPO_FIELDS and the endCursor is sent for the next page."""
+    auditor = make_auditor(RECORDED_PAGES)
+    repos = auditor.get_all_repos()
+
+    assert [r['full_name'] for r in repos] == [
+        'example-org/public-api', 'example-org/private-backend', 'example-org/docs'
+    ]
+    assert all(set(r) == set(REPO_FIELDS) for r in repos)
+    assert repos[0]['private'] is False and repos[1]['private'] is True
+    assert repos[2]['html_url'] == 'https://github.com/example-org/docs'
+
+    cursors = [payload['variables']['cursor'] for _, _, payload in auditor.session.requests]
+    assert cursors == [None, 'Y3Vyc29yOjE=']
+
+
+def test_resumes_from_cursor():
+    """Starting from a saved cursor sends it as the first 'after' value."""
+    auditor = make_auditor(RECORDED_PAGES[1:])
+    pages = list(auditor.iter_repo_pages_graphql('Y3Vyc29yOjE='))
+
+    assert len(pages) == 1 and pages[0][1] == 'Y3Vyc29yOjI='
+    assert auditor.session.requests[0][2]['variables']['cursor'] == 'Y3Vyc29yOjE='
+
+
+def test_missing_org_exits():
+    """A NOT_FOUND error exits like the REST 404 path."""
+    auditor = make_auditor([RECORDED_NOT_FOUND])
+    try:
+        auditor.get_all_repos()
+    except SystemExit:
+        return
+    raise AssertionError("expected SystemExit")
+
+
+def test_rate_limited_aborts():
+    """Other GraphQL errors abort the audit so it can be resumed."""
+    auditor = make_auditor([RECORDED_RATE_LIMITED])
+    try:
+        auditor.get_all_repos()
+    except AuditAbortedError:
+        return
+    raise AssertionError("expected AuditAbortedError")
+
+
+def main():
+    print("=" * 60)
+    print("GraphQL Enumeration - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_maps_fields_and_follows_cursor,
+        test_resumes_from_cursor,
+        test_missing_org_exits,
+        test_rate_limited_aborts,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache Test
+===============
+
+Checks the conditional request cache: ETag revalidation against the local
+mock GitHub API (304 replies served from disk and refunded to the rate
+limit budget) and least-recently-used eviction at the size limit. No token
+or network access is required.
+
+Usage:
+    python test_http_cache.py
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from github_copilot_auditor import GitHubCopilotAuditor
+from http_cache import HTTPCache
+from mock_github_server import MockGitHubConfig, MockGitHubServer
+
+
+def make_response(url, body, etag='"v1"'):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+    if etag:
+        response.headers['ETag'] = etag
+    response.encoding = 'utf-8'
+    response._content = body.encode('utf-8')
+    return response
+
+
+def audit(server_url, cache):
+    auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=4, cache=cache)
+    auditor.base_url = server_url
+    with redirect_stdout(io.StringIO()):
+        results = auditor.audit_organization()
+    return auditor, results
+
+
+def test_not_modified_replies_come_from_cache_and_are_refunded():
+    """A re-run revalidates every cached response; 304s are served from disk and cost no quota."""
+    with MockGitHubServer(MockGitHubConfig(org_size=150)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        state = server.server.state
+        cache = HTTPCache(os.path.join(tmp_dir, 'cache'))
+        _, first_results = audit(server.url, cache)
+        assert state.not_modified == 0
+
+        remaining_before = state.remaining
+        auditor, second_results = audit(server.url, HTTPCache(os.path.join(tmp_dir, 'cache')))
+
+        # Two repository pages and 150 Copilot checks, all answered with 304
+        assert state.not_modified == 152
+        assert second_results == first_results
+        # Only GET /rate_limit (never conditional) drew on the server's quota...
+        assert state.remaining == remaining_before - 1
+        # ...and the local budget was refunded for every 304
+        assert auditor.budget.remaining == state.remaining
+
+
+def test_cached_response_keeps_fresh_rate_limit_headers():
+    """A 304 is turned into the cached 200, with the 304's current headers."""
+    with MockGitHubServer(MockGitHubConfig(org_size=5)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        auditor = GitHubCopilotAuditor('mock-token', 'acme', cache=HTTPCache(tmp_dir))
+        auditor.base_url = server.url
+        url = f"{server.url}/repos/acme/repo-000001/copilot"
+
+        first = auditor.api_get(url)
+        second = auditor.api_get(url)
+
+    assert not getattr(first, 'from_cache', False)
+    assert second.from_cache and second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers['Content-Type'] == first.headers['Content-Type']
+    assert 'X-RateLimit-Remaining' in second.headers
+
+
+def test_least_recently_used_entries_are_evicted():
+    """At the size limit the entry used longest ago goes first; reading an entry renews it."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        body = 'x' * 1000
+        probe = HTTPCache(os.path.join(tmp_dir, 'probe'))
+        probe.store('probe', make_response('https://api.github.com/probe', body))
+        entry_size = os.path.getsize(os.path.join(tmp_dir, 'probe', 'probe.json'))
+
+        cache = HTTPCache(os.path.join(tmp_dir, 'cache'), max_bytes=entry_size * 2 + 100)
+        keys = {name: cache.make_key(f"https://api.github.com/{name}") for name in ('a', 'b', 'c')}
+        cache.store(keys['a'], make_response('https://api.github.com/a', body))
+        cache.store(keys['b'], make_response('https://api.github.com/b', body))
+        assert cache.get(keys['a']) is not None
+        cache.store(keys['c'], make_response('https://api.github.com/c', body))
+
+        assert cache.get(keys['b']) is None
+        assert cache.get(keys['a'])['etag'] == '"v1"' and cache.get(keys['c']) is not None
+        assert sorted(os.listdir(cache.cache_dir)) == sorted(f"{keys[name]}.json" for name in ('a', 'c'))
+
+        # The index is rebuilt from disk by the next run
+        reopened = HTTPCache(cache.cache_dir, max_bytes=cache.max_bytes)
+        assert reopened._total_bytes == cache._total_bytes
+
+
+def test_uncacheable_responses_are_skipped():
+    """Responses without validators, errors and entries larger than the cache are not stored."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = HTTPCache(tmp_dir, max_bytes=2000)
+        no_validator = make_response('https://api.github.com/a', '{}', etag=None)
+        error = make_response('https://api.github.com/b', '{}')
+        error.status_code = 500
+
+        cache.store('a', no_validator)
+        cache.store('b', error)
+        cache.store('c', make_response('https://api.github.com/c', 'x' * 5000))
+        cache.store('d', no_validator, require_validator=False)
+
+        assert os.listdir(tmp_dir) == ['d.json']
+        assert cache.is_fresh(cache.get('d'), ttl=60) and not cache.is_fresh(cache.get('d'), ttl=0)
+
+
+def main():
+    print("=" * 60)
+    print("HTTP Cache - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_not_modified_replies_come_from_cache_and_are_refunded,
+        test_cached_response_keeps_fresh_rate_limit_headers,
+        test_least_recently_used_entries_are_evicted,
+        test_uncacheable_responses_are_skipped,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Incremental Audit Test
+======================
+
+Re-runs audits with --incremental against the local mock GitHub API and a
+previous report, and checks which repositories are carried forward and
+which are checked again. No token or network access is required.
+
+Usage:
+    python test_incremental_audit.py
+"""
+
+import csv
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from github_copilot_auditor import GitHubCopilotAuditor, REPORT_FIELDNAMES, load_previous_results
+from mock_github_server import MockGitHubConfig, MockGitHubServer, copilot_enabled
+
+
+def previous_row(name, **overrides):
+    row = {'repo_name': name, 'is_private': 'Yes', 'copilot_enabled': 'Yes', 'risk_level': 'HIGH',
+           'url': f"https://github.com/{name}", 'created_at': '2021-01-01T00:00:00Z',
+           'updated_at': '2024-01-01T00:00:00Z', 'pushed_at': '2024-01-01T00:00:00Z'}
+    row.update(overrides)
+    return row
+
+
+def trimmed_repo(name, **overrides):
+    """Repository as iter_repos() yields it (see REPO_FIELDS)."""
+    repo = {'full_name': name, 'private': True, 'html_url': f"https://github.com/{name}",
+            'created_at': '2021-01-01T00:00:00Z', 'updated_at': '2024-01-01T00:00:00Z',
+            'pushed_at': '2024-01-01T00:00:00Z'}
+    repo.update(overrides)
+    return repo
+
+
+def read_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def write_report(path, rows, fieldnames=REPORT_FIELDNAMES):
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def auditor_with_previous(tmp_dir, rows, fieldnames=REPORT_FIELDNAMES):
+    """An auditor whose previous results went through a CSV report, as with --incremental."""
+    path = os.path.join(tmp_dir, 'previous.csv')
+    write_report(path, rows, fieldnames)
+    return GitHubCopilotAuditor('token', 'org', previous_results=load_previous_results(path))
+
+
+def test_never_pushed_repo_is_carried_forward():
+    """pushedAt: null from GraphQL matches the empty pushed_at of the previous report."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auditor = auditor_with_previous(tmp_dir, [previous_row('org/empty', pushed_at='')])
+
+    result = auditor.carry_forward(trimmed_repo('org/empty', pushed_at=None))
+
+    assert result is not None and result['risk_level'] == 'HIGH'
+    assert result['pushed_at'] == ''
+
+
+def test_changed_repos_are_checked_again():
+    """New pushes, updates and visibility changes are not carried forward."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auditor = auditor_with_previous(tmp_dir, [
+            previous_row('org/same'),
+            previous_row('org/pushed'),
+            previous_row('org/updated'),
+            previous_row('org/public'),
+        ])
+
+    assert auditor.carry_forward(trimmed_repo('org/same')) is not None
+    assert auditor.carry_forward(trimmed_repo('org/pushed', pushed_at='2024-06-01T00:00:00Z')) is None
+    assert auditor.carry_forward(trimmed_repo('org/updated', updated_at='2024-06-01T00:00:00Z')) is None
+    assert auditor.carry_forward(trimmed_repo('org/public', private=False)) is None
+    assert auditor.carry_forward(trimmed_repo('org/new')) is None
+
+
+def test_failed_checks_are_written_as_error_and_checked_again():
+    """Copilot checks answered with a 502 are reported as Error, never Yes, and re-checked next time."""
+    with MockGitHubServer(MockGitHubConfig(org_size=250, error_rate=0.05)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        first_report = os.path.join(tmp_dir, 'first.csv')
+        second_report = os.path.join(tmp_dir, 'second.csv')
+
+        auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=4)
+        auditor.base_url = server.url
+        with redirect_stdout(io.StringIO()):
+            auditor.generate_report(auditor.iter_audit(), first_report)
+        first_rows = read_rows(first_report)
+        failed = {row['repo_name'] for row in first_rows if row['copilot_enabled'] == 'Error'}
+
+        # One check per repository; those answered with a 502 are Error rows, the rest match the mock
+        assert server.server.state.requests['/repos/{repo}/copilot'] == 250
+        assert 0 < len(failed) < 50
+        for row in first_rows:
+            if row['repo_name'] in failed:
+                assert row['risk_level'] == 'LOW', row
+            else:
+                expected = copilot_enabled(int(row['repo_name'].rsplit('-', 1)[-1]), server.server.state.config)
+                assert row['copilot_enabled'] == ('Yes' if expected else 'No'), row
+
+        server.server.state.config.error_rate = 0.0
+        checks_before = server.server.state.requests['/repos/{repo}/copilot']
+        incremental = GitHubCopilotAuditor('mock-token', 'acme', workers=4,
+                                           previous_results=load_previous_results(first_report))
+        incremental.base_url = server.url
+        with redirect_stdout(io.StringIO()):
+            incremental.generate_report(incremental.iter_audit(), second_report)
+        second_rows = {row['repo_name']: row for row in read_rows(second_report)}
+
+    assert server.server.state.requests['/repos/{repo}/copilot'] - checks_before == len(failed)
+    assert incremental.unchanged_count == 250 - len(failed)
+    assert all(second_rows[name]['copilot_enabled'] in ('Yes', 'No') for name in failed)
+
+
+def test_old_report_without_pushed_at_compares_updated_at():
+    """Reports written before pushed_at was added are compared on updated_at only."""
+    fieldnames = [field for field in REPORT_FIELDNAMES if field != 'pushed_at']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auditor = auditor_with_previous(tmp_dir, [previous_row('org/a')], fieldnames)
+
+    result = auditor.carry_forward(trimmed_repo('org/a', pushed_at='2024-06-01T00:00:00Z'))
+
+    assert result is not None and result['pushed_at'] == '2024-06-01T00:00:00Z'
+
+
+def test_unchanged_audit_makes_no_copilot_checks():
+    """A second audit of an unchanged organization carries every repository forward."""
+    with MockGitHubServer(MockGitHubConfig(org_size=120)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        first_report = os.path.join(tmp_dir, 'first.csv')
+        second_report = os.path.join(tmp_dir, 'second.csv')
+
+        for enumeration in ('rest', 'graphql'):
+            auditor = GitHubCopilotAuditor('mock-token', 'acme', workers=4, enumeration=enumeration)
+            auditor.base_url = server.url
+            with redirect_stdout(io.StringIO()):
+                auditor.generate_report(auditor.iter_audit(), first_report)
+
+            checks_before = server.server.state.requests['/repos/{repo}/copilot']
+            incremental = GitHubCopilotAuditor('mock-token', 'acme', workers=4, enumeration=enumeration,
+                                               previous_results=load_previous_results(first_report))
+            incremental.base_url = server.url
+            with redirect_stdout(io.StringIO()):
+                incremental.generate_report(incremental.iter_audit(), second_report)
+
+            assert server.server.state.requests['/repos/{repo}/copilot'] == checks_before, enumeration
+            assert incremental.unchanged_count == 120, enumeration
+            with open(first_report, 'r', encoding='utf-8') as f1, open(second_report, 'r', encoding='utf-8') as f2:
+                assert f1.read() == f2.read(), enumeration
+
+
+def main():
+    print("=" * 60)
+    print("Incremental Audit - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_never_pushed_repo_is_carried_forward,
+        test_changed_repos_are_checked_again,
+        test_failed_checks_are_written_as_error_and_checked_again,
+        test_old_report_without_pushed_at_compares_updated_at,
+        test_unchanged_audit_makes_no_copilot_checks,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,729 @@
+#!/usr/bin/env python3
+"""
+Microsoft 365 Checker Test
+==========================
+
+Runs the Microsoft 365 checker against recorded Microsoft Graph responses.
+No tenant, credentials or network access are required.
+
+Usage:
+    python test_m365_checker.py
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from adaptive_concurrency import AdaptiveConcurrencyLimiter
+from findings_store import FindingsStore, PLATFORM_M365
+from http_client import retry_after_seconds
+from m365_copilot_checker import M365CopilotChecker
+from site_exposure_scanner import SiteExposureScanner, ExposureCache
+from test_support import RecordedResponse, RecordedSession
+from token_cache import EncryptedTokenCache
+from user_delta_store import UserDeltaStore
+
+DELTA_LINK_1 = "https://graph.microsoft.com/v1.0/users/delta?$deltatoken=token-1"
+DELTA_LINK_2 = "https://graph.microsoft.com/v1.0/users/delta?$deltatoken=token-2"
+NEXT_LINK = "https://graph.microsoft.com/v1.0/users/delta?$skiptoken=page-2"
+
+# Initial /users/delta sync, recorded as two pages
+RECORDED_INITIAL_SYNC = [
+    {
+        "@odata.nextLink": NEXT_LINK,
+        "value": [
+            {"id": "u1", "displayName": "Ada", "userPrincipalName": "ada@example.com",
+             "assignedLicenses": [{"skuId": "sku-e5"}]},
+            {"id": "u2", "displayName": "Grace", "userPrincipalName": "grace@example.com",
+             "assignedLicenses": []}
+        ]
+    },
+    {
+        "@odata.deltaLink": DELTA_LINK_1,
+        "value": [
+            {"id": "u3", "displayName": "Linus", "userPrincipalName": "linus@example.com",
+             "assignedLicenses": [{"skuId": "sku-e3"}]}
+        ]
+    }
+]
+
+# Follow-up sync from DELTA_LINK_1: one license change, one removal
+RECORDED_CHANGES = [
+    {
+        "@odata.deltaLink": DELTA_LINK_2,
+        "value": [
+            {"id": "u2", "assignedLicenses": [{"skuId": "sku-e5"}]},
+            {"id": "u3", "@removed": {"reason": "changed"}}
+        ]
+    }
+]
+
+RECORDED_SUBSCRIBED_SKUS = {
+    "value": [
+        {"skuId": "sku-e5", "skuPartNumber": "SPE_E5"},
+        {"skuId": "sku-e3", "skuPartNumber": "SPE_E3"},
+        {"skuId": "sku-copilot", "skuPartNumber": "Microsoft_365_Copilot"},
+        {"skuId": "sku-copilot-edu", "skuPartNumber": "Microsoft_365_Copilot_EDU"}
+    ]
+}
+
+RECORDED_USERS = {
+    "value": [
+        {"id": "u1", "displayName": "Ada", "userPrincipalName": "ada@example.com",
+         "assignedLicenses": [{"skuId": "sku-e5"}, {"skuId": "sku-copilot"}]},
+        {"id": "u2", "displayName": "Grace", "userPrincipalName": "grace@example.com",
+         "assignedLicenses": [{"skuId": "sku-e3"}]},
+        {"id": "u3", "displayName": "Linus", "userPrincipalName": "linus@example.com",
+         "assignedLicenses": [{"skuId": "sku-copilot-edu"}]},
+        {"id": "u4", "displayName": "Barbara", "userPrincipalName": "barbara@example.com",
+         "assignedLicenses": []}
+    ]
+}
+
+
+class FakeConfidentialClient:
+    """Stand-in for msal.ConfidentialClientApplication issuing short-lived tokens."""
+
+    def __init__(self, expires_in):
+        self.expires_in = expires_in
+        self.calls = 0
+
+    def acquire_token_for_client(self, scopes):
+        self.calls += 1
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+
+
+class UserPageSession(RecordedSession):
+    """
+    Replays recorded user pages in order.
+
+    /subscribedSkus is answered separately and not recorded, so the user
+    pages can be replayed in order.
+    """
+
+    def __init__(self, responses, subscribed_skus=None):
+        super().__init__(responses)
+        self.subscribed_skus = subscribed_skus or RecordedResponse(RECORDED_SUBSCRIBED_SKUS)
+
+    def request(self, method, url, **kwargs):
+        if url.endswith('/subscribedSkus'):
+            return self.subscribed_skus
+        return super().request(method, url, **kwargs)
+
+
+class RoutedSession:
+    """
+    Answers Graph GETs and $batch sub-requests from a URL -> payload map.
+
+    Relative URLs in a $batch are looked up as-is; absolute URLs (such as
+    @odata.nextLink values) are looked up in full.
+    """
+
+    def __init__(self, routes, statuses=None):
+        self.routes = routes
+        self.statuses = statuses or {}
+        self.urls = []
+
+    def request(self, method, url, **kwargs):
+        return getattr(self, method.lower())(url, **kwargs)
+
+    def get(self, url, params=None, headers=None):
+        self.urls.append(url)
+        return RecordedResponse(self.routes[url], self.statuses.get(url, 200), url=url)
+
+    def post(self, url, headers=None, json=None):
+        responses = []
+        for request in json['requests']:
+            self.urls.append(request['url'])
+            status = self.statuses.get(request['url'], 200)
+            body = self.routes.get(request['url'], {}) if status == 200 else {"error": {"code": "Forbidden"}}
+            responses.append({"id": request['id'], "status": status, "headers": {}, "body": body})
+        return RecordedResponse({"responses": responses})
+
+
+def paged_collection(first_url, base, pages, size, make_item):
+    """Build routes for a collection split into pages linked by @odata.nextLink."""
+    routes = {}
+    url = first_url
+    for page in range(pages):
+        next_link = f"{base}?$skiptoken={page + 1}" if page + 1 < pages else None
+        body = {"value": [make_item(page * size + i) for i in range(size)]}
+        if next_link:
+            body["@odata.nextLink"] = next_link
+        routes[url] = body
+        url = next_link
+    return routes
+
+
+SITES_URL = "/sites?$select=id,name,webUrl,displayName&$top=999"
+TEAMS_URL = "/teams?$select=id,displayName&$top=999"
+
+
+def exposure_routes():
+    routes = paged_collection(
+        SITES_URL, "https://graph.microsoft.com/v1.0/sites", pages=3, size=25,
+        make_item=lambda i: {"id": f"site-{i}", "displayName": f"Site {i}",
+                             "webUrl": f"https://example.sharepoint.com/sites/s{i}"})
+    routes.update(paged_collection(
+        TEAMS_URL, "https://graph.microsoft.com/v1.0/teams", pages=2, size=30,
+        make_item=lambda i: {"id": f"team-{i}", "displayName": f"Team {i}"}))
+    return routes
+
+
+class ThrottlingSession:
+    """Answers with the given (status, headers) sequence and tracks requests in flight."""
+
+    def __init__(self, statuses, delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, headers=None, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            status, response_headers = self.statuses.pop(0) if self.statuses else (200, {})
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return RecordedResponse({"value": []}, status_code=status, headers=response_headers, url=url)
+
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+DRIVE_DELTA_LINK = f"{GRAPH}/drives/d1/root/delta?token=1"
+
+
+def delta_url(drive_id):
+    return f"{GRAPH}/drives/{drive_id}/root/delta?$select=id,name,root,folder,file,shared,deleted,parentReference"
+
+
+def permissions_url(drive_id, item_id):
+    return f"{GRAPH}/drives/{drive_id}/items/{item_id}/permissions"
+
+
+def exposure_scan_routes():
+    return {
+        f"{GRAPH}/sites/s1/drives?$select=id": {"value": [{"id": "d1"}]},
+        f"{GRAPH}/sites/s2/drives?$select=id": {"value": [{"id": "d2"}]},
+        delta_url("d1"): {
+            "@odata.deltaLink": DRIVE_DELTA_LINK,
+            # As returned by Graph: parentReference has the parent's id but no path
+            "value": [
+                {"id": "root1", "root": {}, "folder": {}, "parentReference": {"driveId": "d1"}},
+                {"id": "f1", "file": {}, "shared": {"scope": "anonymous"},
+                 "parentReference": {"driveId": "d1", "id": "root1"}},
+                # Children may come before their folders; depth is resolved after the delta
+                {"id": "f2", "file": {}, "shared": {"scope": "anonymous"},
+                 "parentReference": {"driveId": "d1", "id": "folder-d"}},
+                {"id": "folder-a", "folder": {}, "parentReference": {"driveId": "d1", "id": "root1"}},
+                {"id": "folder-b", "folder": {}, "parentReference": {"driveId": "d1", "id": "folder-a"}},
+                {"id": "folder-c", "folder": {}, "parentReference": {"driveId": "d1", "id": "folder-b"}},
+                {"id": "folder-d", "folder": {}, "parentReference": {"driveId": "d1", "id": "folder-c"}},
+                {"id": "f3", "file": {}, "parentReference": {"driveId": "d1", "id": "folder-a"}},
+                {"id": "f4", "file": {}, "shared": {"scope": "users"},
+                 "parentReference": {"driveId": "d1", "id": "folder-b"}}
+            ]
+        },
+        delta_url("d2"): {"@odata.deltaLink": f"{GRAPH}/drives/d2/root/delta?token=1",
+                          "value": [{"id": "root2", "root": {}}]},
+        permissions_url("d1", "root1"): {"value": [
+            {"roles": ["read"], "grantedToV2": {"siteGroup": {"displayName": "Everyone except external users"}}}
+        ]},
+        permissions_url("d1", "f1"): {"value": [
+            {"roles": ["read"], "link": {"scope": "anonymous", "type": "view"}}
+        ]},
+        permissions_url("d1", "f4"): {"value": [
+            {"roles": ["write"], "grantedToV2": {"user": {"displayName": "Ada"}}}
+        ]},
+        permissions_url("d2", "root2"): {"value": [
+            {"roles": ["owner"], "grantedToV2": {"siteGroup": {"displayName": "Site Owners"}}}
+        ]},
+    }
+
+
+class RoutedGraph:
+    """graph_request stand-in answering from a URL -> payload map."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, method, url, headers=None, **kwargs):
+        with self.lock:
+            self.urls.append(url)
+        return RecordedResponse(self.routes[url])
+
+
+SCAN_SITES = [{"id": "s1", "displayName": "Finance"}, {"id": "s2", "displayName": "Engineering"}]
+
+
+def make_checker(responses, delta_state=None, subscribed_skus=None):
+    checker = M365CopilotChecker('tenant-1', 'client', 'secret', delta_state=delta_state)
+    checker.access_token = 'fake-token'
+    checker.token_expires_at = time.time() + 3600
+    checker.session = UserPageSession(responses, subscribed_skus)
+    return checker
+
+
+def test_classifies_by_subscribed_skus():
+    """Users are Copilot-licensed when they hold any SKU whose part number mentions Copilot."""
+    checker = make_checker([RECORDED_USERS])
+    users = {u['user_id']: u['copilot_licensed'] for u in checker.get_copilot_licensed_users()}
+
+    assert checker.copilot_sku_ids == frozenset({'sku-copilot', 'sku-copilot-edu'})
+    assert users == {'u1': 'Yes', 'u2': 'No', 'u3': 'Yes', 'u4': 'No'}
+
+
+def test_unreadable_skus_report_unknown():
+    """Without access to subscribed SKUs, licensing is reported as Unknown."""
+    forbidden = RecordedResponse({"error": {"code": "Authorization_RequestDenied"}}, status_code=403)
+    checker = make_checker([RECORDED_USERS], subscribed_skus=forbidden)
+    users = checker.get_copilot_licensed_users()
+
+    assert {u['copilot_licensed'] for u in users} == {'Unknown'}
+
+
+def test_exposure_points_follow_next_links():
+    """Every page of sites and teams is enumerated, with no truncation."""
+    checker = make_checker([])
+    checker.session = RoutedSession(exposure_routes())
+    points = checker.identify_data_exposure_points()
+
+    sites = [p for p in points if p['type'] == 'SharePoint Site']
+    teams = [p for p in points if p['type'] == 'Microsoft Teams']
+    assert len(sites) == 75 and len(teams) == 60
+    assert [s['id'] for s in sites] == [f"site-{i}" for i in range(75)]
+    # First pages share one $batch; only the nextLinks are fetched separately
+    assert sum(1 for url in checker.session.urls if url.startswith('https://')) == 3
+
+
+def test_exposure_points_stream_into_report():
+    """With stream=True, generate_report consumes exposure points lazily."""
+    checker = make_checker([RECORDED_USERS])
+    checker.session = RoutedSession(exposure_routes(), statuses={TEAMS_URL: 403})
+    routes = checker.session.routes
+    routes[f"{checker.graph_endpoint}/users"] = RECORDED_USERS
+    routes[f"{checker.graph_endpoint}/subscribedSkus"] = RECORDED_SUBSCRIBED_SKUS
+
+    results = checker.check(stream=True)
+    assert not isinstance(results['exposure_points'], list)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, 'report.csv')
+        checker.generate_report(output_file)
+        with open(output_file, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+    assert sum(1 for r in rows if r['type'] == 'User') == 4
+    assert sum(1 for r in rows if r['type'] == 'SharePoint Site') == 75
+    assert not any(r['type'] == 'Microsoft Teams' for r in rows)
+
+
+class ThrottlingBatchSession:
+    """
+    Answers $batch POSTs, throttling sub-requests with a 429.
+
+    URLs in throttle_once get a 429 the first time they are sent; URLs in
+    throttle_always get one every time. Every batch sent is recorded.
+    """
+
+    def __init__(self, throttle_once=(), throttle_always=()):
+        self.throttle_once = set(throttle_once)
+        self.throttle_always = set(throttle_always)
+        self.batches = []
+
+    def request(self, method, url, json=None, **kwargs):
+        assert method == 'POST' and url.endswith('/$batch')
+        urls = [request['url'] for request in json['requests']]
+        self.batches.append(urls)
+        responses = []
+        for request in json['requests']:
+            if request['url'] in self.throttle_always or request['url'] in self.throttle_once:
+                self.throttle_once.discard(request['url'])
+                responses.append({"id": request['id'], "status": 429, "headers": {"Retry-After": "0"},
+                                  "body": {"error": {"code": "TooManyRequests"}}})
+            else:
+                responses.append({"id": request['id'], "status": 200, "headers": {},
+                                  "body": {"value": [request['url']]}})
+        # Graph does not keep sub-responses in request order
+        return RecordedResponse({"responses": responses[::-1]})
+
+
+def test_batch_retries_only_throttled_sub_requests():
+    """Requests go out in chunks of 20; only the 429 sub-requests are sent again."""
+    urls = [f"/sites/site-{i}/drives" for i in range(45)]
+    checker = make_checker([])
+    checker.session = ThrottlingBatchSession(throttle_once=[urls[3], urls[25], urls[44]],
+                                             throttle_always=[urls[7]])
+
+    responses = checker.graph_batch(urls)
+    batches = checker.session.batches
+
+    assert [len(batch) for batch in batches[:3]] == [20, 20, 5]
+    assert batches[3] == [urls[3], urls[7], urls[25], urls[44]]
+    # urls[7] is retried BATCH_MAX_RETRIES times, then its last 429 is returned
+    assert batches[4:] == [[urls[7]], [urls[7]]]
+    assert [r['status'] for r in responses] == [429 if i == 7 else 200 for i in range(45)]
+    assert all(r['body'] == {"value": [url]} for url, r in zip(urls, responses) if r['status'] == 200)
+    assert checker.limiter.throttle_count == 6
+
+
+def test_failed_batch_sub_response_is_returned_without_retry():
+    """A 403 sub-response is returned in place and not retried; its collection is skipped."""
+    checker = make_checker([])
+    checker.session = RoutedSession(exposure_routes(), statuses={SITES_URL: 403})
+
+    responses = checker.graph_batch([SITES_URL, TEAMS_URL])
+    assert [r['status'] for r in responses] == [403, 200]
+    assert responses[0]['body'] == {"error": {"code": "Forbidden"}}
+    assert checker.session.urls == [SITES_URL, TEAMS_URL]
+    assert checker.limiter.throttle_count == 0
+
+    points = checker.identify_data_exposure_points()
+    assert {p['type'] for p in points} == {'Microsoft Teams'}
+    assert checker.session.urls.count(SITES_URL) == 2
+
+
+def test_failed_next_link_keeps_earlier_pages():
+    """An HTTP error on a nextLink page stops that collection but keeps what was listed."""
+    checker = make_checker([])
+    routes = exposure_routes()
+    failing_page = "https://graph.microsoft.com/v1.0/sites?$skiptoken=2"
+    checker.session = RoutedSession(routes, statuses={failing_page: 500})
+
+    points = checker.identify_data_exposure_points()
+
+    assert sum(1 for p in points if p['type'] == 'SharePoint Site') == 50
+    assert sum(1 for p in points if p['type'] == 'Microsoft Teams') == 60
+
+
+def test_failed_user_fetch_is_not_a_complete_scan():
+    """A failed user listing still writes the report, but the stored scan is not marked complete."""
+    class UsersUnreachable(RoutedSession):
+        def get(self, url, params=None, headers=None):
+            if url.endswith('/users'):
+                raise requests.exceptions.ConnectionError("connection reset")
+            return super().get(url, params, headers)
+
+    checker = make_checker([])
+    checker.session = UsersUnreachable(exposure_routes())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = FindingsStore(os.path.join(tmp_dir, 'findings.db'))
+        output_file = os.path.join(tmp_dir, 'report.csv')
+        checker.check()
+        checker.generate_report(output_file, store=store)
+        with open(output_file, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+        assert checker.user_fetch_error is not None
+        assert len(rows) == 135 and not any(r['type'] == 'User' for r in rows)
+        assert store.scans(PLATFORM_M365) == []
+
+        # An empty check records nothing either
+        checker.results = {'licensed_users': [], 'exposure_points': []}
+        checker.user_fetch_error = None
+        checker.generate_report(output_file, store=store)
+        assert not os.path.exists(output_file)
+        assert store.scans(PLATFORM_M365) == []
+
+        checker.session = RoutedSession(dict(exposure_routes(), **{
+            f"{checker.graph_endpoint}/users": RECORDED_USERS,
+            f"{checker.graph_endpoint}/subscribedSkus": RECORDED_SUBSCRIBED_SKUS}))
+        checker.check()
+        checker.generate_report(output_file, store=store)
+        assert [scan['finding_count'] for scan in store.scans(PLATFORM_M365)] == [139]
+
+
+def test_site_scan_scores_exposure():
+    """Anonymous links and Everyone grants within the depth limit drive the site score."""
+    graph = RoutedGraph(exposure_scan_routes())
+    scanner = SiteExposureScanner(graph, GRAPH, workers=4, max_depth=3)
+    rows = list(scanner.iter_scan(SCAN_SITES))
+
+    assert [r['id'] for r in rows] == ['s1', 's2']
+    finance, engineering = rows
+    assert finance['anonymous_links'] == 1 and finance['everyone_grants'] == 1
+    assert finance['risk_score'] == 15 and finance['risk_level'] == 'HIGH'
+    assert engineering['risk_score'] == 0 and engineering['risk_level'] == 'LOW'
+    # f4 (depth 3) is at the limit, f2 (depth 5) below it, and f3 is not shared
+    assert permissions_url("d1", "f4") in graph.urls
+    assert permissions_url("d1", "f2") not in graph.urls
+    assert permissions_url("d1", "f3") not in graph.urls
+
+
+def test_site_rescan_skips_unchanged_drives():
+    """With a cache, unchanged drives cost one delta request and no permission lookups."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'exposure.json')
+        routes = exposure_scan_routes()
+        list(SiteExposureScanner(RoutedGraph(routes), GRAPH, cache=ExposureCache(cache_path)).iter_scan(SCAN_SITES))
+
+        # Nothing changed in d1; f1's anonymous link was removed
+        routes[DRIVE_DELTA_LINK] = {"@odata.deltaLink": DRIVE_DELTA_LINK, "value": []}
+        routes[f"{GRAPH}/drives/d2/root/delta?token=1"] = {
+            "@odata.deltaLink": f"{GRAPH}/drives/d2/root/delta?token=1", "value": []
+        }
+        graph = RoutedGraph(routes)
+        rows = list(SiteExposureScanner(graph, GRAPH, cache=ExposureCache(cache_path)).iter_scan(SCAN_SITES))
+        assert rows[0]['risk_score'] == 15
+        assert not any('/permissions' in url for url in graph.urls)
+
+        # Changed items' folders come from the cache: f5 in folder-d stays below the limit
+        routes[DRIVE_DELTA_LINK] = {"@odata.deltaLink": DRIVE_DELTA_LINK, "value": [
+            {"id": "f1", "file": {}, "@microsoft.graph.sharedChanged": "True",
+             "parentReference": {"driveId": "d1", "id": "root1"}},
+            {"id": "f5", "file": {}, "shared": {"scope": "anonymous"},
+             "parentReference": {"driveId": "d1", "id": "folder-d"}}
+        ]}
+        routes[permissions_url("d1", "f1")] = {"value": []}
+        graph = RoutedGraph(routes)
+        rows = list(SiteExposureScanner(graph, GRAPH, cache=ExposureCache(cache_path)).iter_scan(SCAN_SITES))
+        assert rows[0]['anonymous_links'] == 0 and rows[0]['risk_level'] == 'MEDIUM'
+        assert permissions_url("d1", "f5") not in graph.urls
+
+
+def test_delta_initial_sync_saves_state():
+    """The first delta run pages through every user and saves the deltaLink."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'users.json')
+        checker = make_checker(RECORDED_INITIAL_SYNC, state_path)
+        users = checker.get_copilot_licensed_users()
+
+        assert [u['email'] for u in users] == ['ada@example.com', 'grace@example.com', 'linus@example.com']
+        assert checker.session.urls[0].startswith(f"{checker.graph_endpoint}/users/delta?$select=")
+        assert checker.session.urls[1] == NEXT_LINK
+
+        store = UserDeltaStore.load(state_path, 'tenant-1')
+        assert store.delta_link == DELTA_LINK_1
+        assert set(store.users) == {'u1', 'u2', 'u3'}
+
+
+def test_delta_merges_changes():
+    """Later runs call the saved deltaLink and merge updates and removals."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'users.json')
+        make_checker(RECORDED_INITIAL_SYNC, state_path).get_copilot_licensed_users()
+
+        checker = make_checker(RECORDED_CHANGES, state_path)
+        users = {u['user_id']: u for u in checker.get_copilot_licensed_users()}
+
+        assert checker.session.urls == [DELTA_LINK_1]
+        assert set(users) == {'u1', 'u2'}
+        # Properties missing from the change keep their cached values
+        assert users['u2']['email'] == 'grace@example.com'
+        assert users['u2']['license_count'] == 1
+        assert UserDeltaStore.load(state_path, 'tenant-1').delta_link == DELTA_LINK_2
+
+
+def test_expired_delta_link_resyncs():
+    """A 410 Gone for the saved deltaLink falls back to a full sync."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'users.json')
+        make_checker(RECORDED_INITIAL_SYNC, state_path).get_copilot_licensed_users()
+
+        expired = RecordedResponse({"error": {"code": "syncStateNotFound"}}, status_code=410)
+        checker = make_checker([expired] + RECORDED_INITIAL_SYNC, state_path)
+        users = checker.get_copilot_licensed_users()
+
+        assert len(users) == 3
+        assert checker.session.urls[0] == DELTA_LINK_1
+        assert '/users/delta?$select=' in checker.session.urls[1]
+
+
+def test_token_refreshed_before_expiry():
+    """A token inside the refresh margin is replaced before it is used."""
+    checker = M365CopilotChecker('tenant-1', 'client', 'secret')
+    checker.app = FakeConfidentialClient(expires_in=3600)
+
+    assert checker.get_headers()['Authorization'] == 'Bearer token-1'
+    assert checker.get_headers()['Authorization'] == 'Bearer token-1'
+    assert checker.app.calls == 1
+
+    checker.token_expires_at = time.time() + 60
+    assert checker.get_headers()['Authorization'] == 'Bearer token-2'
+
+
+def test_token_refresh_is_thread_safe():
+    """Concurrent workers share one token instead of each authenticating."""
+    checker = M365CopilotChecker('tenant-1', 'client', 'secret')
+    checker.app = FakeConfidentialClient(expires_in=3600)
+
+    threads = [threading.Thread(target=checker.get_headers) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert checker.app.calls == 1
+
+
+def test_token_cache_encrypted_at_rest():
+    """The token cache round-trips with the right secret and is unreadable without it."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'tokens.bin')
+        cache = EncryptedTokenCache(path, 'client-secret')
+        cache.deserialize('{"AccessToken": {"k": {"secret": "plaintext-access-token"}}}')
+        cache.has_state_changed = True
+        cache.save()
+
+        with open(path, encoding='utf-8') as f:
+            assert 'plaintext-access-token' not in f.read()
+        assert os.stat(path).st_mode & 0o077 == 0
+
+        restored = EncryptedTokenCache(path, 'client-secret')
+        assert 'plaintext-access-token' in restored.serialize()
+
+        rotated = EncryptedTokenCache(path, 'new-secret')
+        assert 'plaintext-access-token' not in rotated.serialize()
+
+
+def test_limiter_additive_increase_multiplicative_decrease():
+    """Healthy responses grow the limit by ~1 per round; throttling halves it once per cooldown."""
+    now = [0.0]
+    limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=8, cooldown=1.0, clock=lambda: now[0])
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+    assert int(limiter.limit) == 4 and limiter.limit > 4.9
+
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=30)
+    assert limiter.limit < 2.5 and limiter.blocked_until == 30
+    # Throttling from requests already in flight counts as the same signal
+    limiter.throttled(retry_after=10)
+    assert limiter.limit < 2.5 and limiter.limit > 2.4
+
+    now[0] = 31.0
+    limiter.throttled()
+    assert 1.2 < limiter.limit < 1.3
+
+
+def test_graph_request_retries_after_throttling():
+    """A 429 is retried after Retry-After and lowers the concurrency limit."""
+    checker = make_checker([])
+    checker.limiter = AdaptiveConcurrencyLimiter(initial=8, maximum=8)
+    checker.session = ThrottlingSession([(429, {'Retry-After': '0'}), (503, {'Retry-After': '0'})])
+
+    response = checker.graph_request('GET', f"{checker.graph_endpoint}/users")
+
+    assert response.status_code == 200
+    assert checker.session.calls == 3
+    assert checker.limiter.throttle_count == 2
+    assert int(checker.limiter.limit) < 8
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    """Retry-After may be a delay or an HTTP date, under any header case; otherwise the default applies."""
+    assert retry_after_seconds({'Retry-After': '7'}, default=1) == 7
+    assert retry_after_seconds(CaseInsensitiveDict({'retry-after': '7'}), default=1) == 7
+    assert retry_after_seconds({'retry-after': '7'}, default=1) == 7
+    assert retry_after_seconds(None, default=4) == 4
+    assert retry_after_seconds({'Retry-After': 'soon'}, default=4) == 4
+    assert retry_after_seconds({'Retry-After': formatdate(time.time() - 60, usegmt=True)}, default=4) == 0
+    assert 25 < retry_after_seconds({'Retry-After': formatdate(time.time() + 30, usegmt=True)}, default=4) <= 30
+    assert 25 < retry_after_seconds({'Retry-After': formatdate(time.time() + 30)}, default=4) <= 30
+
+
+def test_graph_honours_http_date_retry_after():
+    """A Graph 429 whose Retry-After is an HTTP date waits until that date, not the default backoff."""
+    checker = make_checker([])
+    checker.limiter = AdaptiveConcurrencyLimiter(initial=8, maximum=8)
+    checker.session = ThrottlingSession([(429, {'Retry-After': formatdate(time.time() - 5, usegmt=True)})])
+
+    response = checker.graph_request('GET', f"{checker.graph_endpoint}/users")
+
+    assert response.status_code == 200 and checker.session.calls == 2
+    # The date has passed, so nothing is held back (the default would have paused for a second)
+    assert checker.limiter.throttle_count == 1 and checker.limiter.blocked_until == 0
+
+
+def test_limiter_bounds_concurrent_graph_requests():
+    """Worker threads never have more requests in flight than the limiter allows."""
+    checker = make_checker([])
+    checker.limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=2)
+    checker.session = ThrottlingSession([], delay=0.02)
+
+    threads = [threading.Thread(target=checker.graph_request, args=('GET', checker.graph_endpoint))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert checker.session.calls == 8
+    assert checker.session.max_in_flight == 2
+
+
+def test_delta_state_tenant_mismatch():
+    """A state file from another tenant is rejected."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'users.json')
+        UserDeltaStore(state_path, 'other-tenant').save()
+        try:
+            UserDeltaStore.load(state_path, 'tenant-1')
+        except ValueError:
+            return
+    raise AssertionError("expected ValueError")
+
+
+def main():
+    print("=" * 60)
+    print("Microsoft 365 Checker - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_classifies_by_subscribed_skus,
+        test_unreadable_skus_report_unknown,
+        test_exposure_points_follow_next_links,
+        test_exposure_points_stream_into_report,
+        test_failed_user_fetch_is_not_a_complete_scan,
+        test_batch_retries_only_throttled_sub_requests,
+        test_failed_batch_sub_response_is_returned_without_retry,
+        test_failed_next_link_keeps_earlier_pages,
+        test_site_scan_scores_exposure,
+        test_site_rescan_skips_unchanged_drives,
+        test_delta_initial_sync_saves_state,
+        test_delta_merges_changes,
+        test_expired_delta_link_resyncs,
+        test_delta_state_tenant_mismatch,
+        test_limiter_additive_increase_multiplicative_decrease,
+        test_graph_request_retries_after_throttling,
+        test_retry_after_accepts_seconds_and_http_dates,
+        test_graph_honours_http_date_retry_after,
+        test_limiter_bounds_concurrent_graph_requests,
+        test_token_refreshed_before_expiry,
+        test_token_refresh_is_thread_safe,
+        test_token_cache_encrypted_at_rest,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
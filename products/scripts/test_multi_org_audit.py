@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Multi-Organization Audit Test
+=============================
+
+Checks how several organizations are audited in one run: parsing of --org
+and --org-file, merging of the per-organization reports, and main() carrying
+on past an organization that fails. main() runs against the local mock
+GitHub API, so no token or network access is required.
+
+Usage:
+    python test_multi_org_audit.py
+"""
+
+import csv
+import os
+import sys
+import tempfile
+
+from github_copilot_auditor import REPORT_FIELDNAMES, merge_reports, parse_org_list
+from mock_github_server import MockGitHubConfig, MockGitHubServer
+from test_support import run_main
+
+
+def read_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def test_org_list_from_arguments_and_file():
+    """Comma- and space-separated names and an org file are combined, de-duplicated, in order."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        org_file = os.path.join(tmp_dir, 'orgs.txt')
+        with open(org_file, 'w', encoding='utf-8') as f:
+            f.write("# platform teams\nacme-infra\n\n  acme-web  # frontend\nacme\n")
+
+        orgs = parse_org_list(['acme,acme-data', ' acme-ml ', 'acme-data,'], org_file)
+
+    assert orgs == ['acme', 'acme-data', 'acme-ml', 'acme-infra', 'acme-web']
+    assert parse_org_list(None) == []
+
+
+def test_merge_reports_concatenates_in_order():
+    """Per-organization reports are merged under one header, in the order given."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        reports = []
+        for org, count in (('one', 3), ('two', 0), ('three', 2)):
+            path = os.path.join(tmp_dir, f"{org}.csv")
+            with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDNAMES)
+                writer.writeheader()
+                for i in range(count):
+                    writer.writerow({'repo_name': f"{org}/repo-{i}", 'risk_level': 'LOW'})
+            reports.append(path)
+
+        merged_file = os.path.join(tmp_dir, 'merged.csv')
+        rows = merge_reports(reports, merged_file)
+        merged = read_rows(merged_file)
+        with open(merged_file, 'r', encoding='utf-8') as f:
+            header = f.readline().strip()
+
+    assert rows == 5
+    assert [row['repo_name'] for row in merged] == ['one/repo-0', 'one/repo-1', 'one/repo-2',
+                                                     'three/repo-0', 'three/repo-1']
+    assert header == ','.join(REPORT_FIELDNAMES)
+
+
+def test_main_continues_after_failed_organization():
+    """An organization that cannot be audited is reported; the others are still merged."""
+    with MockGitHubServer(MockGitHubConfig(org_size=40, missing_orgs=('ghost',))) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        merged_file = os.path.join(tmp_dir, 'merged.csv')
+        code, output = run_main(server.url, ['--org', 'acme,ghost', 'globex', '--workers', '4',
+                                             '--parallel-orgs', '2', '--output', merged_file], tmp_dir)
+        names = [row['repo_name'] for row in read_rows(merged_file)]
+        leftovers = sorted(name for name in os.listdir(tmp_dir) if name.endswith('.checkpoint.json'))
+
+    assert code == 1
+    assert names == [f"acme/repo-{i:06d}" for i in range(40)] + [f"globex/repo-{i:06d}" for i in range(40)]
+    assert "ghost: ❌" in output and "1 organization(s) did not finish" in output
+    assert "Total repositories audited: 80" in output
+    # The HTTP metrics are reported even though main() exits with an error
+    assert "📈 HTTP Metrics" in output
+    # Finished organizations clear their checkpoints
+    assert 'github_copilot_audit_acme.checkpoint.json' not in leftovers
+    assert 'github_copilot_audit_globex.checkpoint.json' not in leftovers
+
+
+def test_main_merges_all_organizations():
+    """With every organization audited, main() exits normally after writing the merged report."""
+    with MockGitHubServer(MockGitHubConfig(org_size=25)) as server, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        org_file = os.path.join(tmp_dir, 'orgs.txt')
+        with open(org_file, 'w', encoding='utf-8') as f:
+            f.write("globex\ninitech\n")
+        merged_file = os.path.join(tmp_dir, 'merged.csv')
+        code, output = run_main(server.url, ['--org', 'acme', '--org-file', org_file,
+                                             '--output', merged_file], tmp_dir)
+        rows = read_rows(merged_file)
+
+    assert code == 0 and "✅ Audit complete!" in output
+    assert len(rows) == 75
+    assert [row['repo_name'].split('/')[0] for row in rows[::25]] == ['acme', 'globex', 'initech']
+
+
+def main():
+    print("=" * 60)
+    print("Multi-Organization Audit - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_org_list_from_arguments_and_file,
+        test_merge_reports_concatenates_in_order,
+        test_main_continues_after_failed_organization,
+        test_main_merges_all_organizations,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Rate Limit Budget Test
+======================
+
+Exercises the shared rate limit budget against a local fake GitHub API
+server. No token or network access is required.
+
+Usage:
+    python test_rate_limiter.py
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rate_limiter import RateLimitBudget
+from github_copilot_auditor import GitHubCopilotAuditor
+
+
+class FakeClock:
+    """Manually advanced clock; sleep() just moves time forward."""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+        self.slept = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Serves /repos/{repo}/copilot and counts requests per path."""
+
+    remaining = 5000
+    reset = int(time.time()) + 3600
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            path = self.path.split('?')[0]
+            self.hits[path] = self.hits.get(path, 0) + 1
+            FakeGitHubHandler.remaining -= 1
+            remaining = FakeGitHubHandler.remaining
+
+        body = json.dumps({'enabled_for_org': True}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Reset', str(self.reset))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_headers_update_budget():
+    """Lowest remaining wins within a window; a later reset starts a new one."""
+    budget = RateLimitBudget()
+    budget.update_from_headers({'X-RateLimit-Remaining': '100', 'X-RateLimit-Reset': '500'})
+    budget.update_from_headers({'X-RateLimit-Remaining': '120', 'X-RateLimit-Reset': '500'})
+    assert budget.remaining == 100
+    budget.update_from_headers({'X-RateLimit-Remaining': '4999', 'X-RateLimit-Reset': '900'})
+    assert (budget.remaining, budget.reset) == (4999, 900)
+
+
+def test_blocks_until_reset_when_exhausted():
+    """acquire() waits for the reset only once the reserve is reached."""
+    clock = FakeClock()
+    budget = RateLimitBudget(reserve=10, clock=clock.time, sleep=clock.sleep)
+    budget.update_from_headers({
+        'X-RateLimit-Remaining': '10',
+        'X-RateLimit-Reset': str(int(clock.now) + 60)
+    })
+    budget.acquire()
+    assert clock.slept and clock.slept[0] >= 60
+
+
+def test_paces_after_burst():
+    """After the burst is spent, requests are spread over the window."""
+    clock = FakeClock()
+    budget = RateLimitBudget(reserve=0, burst=5, clock=clock.time, sleep=clock.sleep)
+    budget.update_from_headers({
+        'X-RateLimit-Remaining': '100',
+        'X-RateLimit-Reset': str(int(clock.now) + 100)
+    })
+    for _ in range(5):
+        budget.acquire()
+    assert not clock.slept
+    budget.acquire()
+    assert clock.slept and 0 < clock.slept[0] <= 2
+
+
+def test_auditor_skips_rate_limit_endpoint():
+    """Copilot checks against the fake server never call GET /rate_limit."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        auditor = GitHubCopilotAuditor('fake-token', 'fake-org', workers=4)
+        auditor.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        repos = [
+            {'full_name': f'fake-org/repo-{i}', 'private': True, 'html_url': ''}
+            for i in range(20)
+        ]
+        results = [auditor.audit_repo(repo) for repo in repos]
+
+        assert all(r['risk_level'] == 'HIGH' for r in results)
+        assert '/rate_limit' not in FakeGitHubHandler.hits
+        assert auditor.budget.remaining == FakeGitHubHandler.remaining
+    finally:
+        server.shutdown()
+
+
+def main():
+    print("=" * 60)
+    print("Rate Limit Budget - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_headers_update_budget,
+        test_blocks_until_reset_when_exhausted,
+        test_paces_after_burst,
+        test_auditor_skips_rate_limit_endpoint,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
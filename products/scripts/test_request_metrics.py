@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Request Metrics Test
+====================
+
+Sends requests through instrumented sessions to a local HTTP server and
+checks the per-endpoint latency, byte, status and retry metrics and their
+Prometheus / JSON dumps. No external network access is required.
+
+Usage:
+    python test_request_metrics.py
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_client import create_session
+from request_metrics import Histogram, RequestMetrics, endpoint_template, reporting_metrics
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers with a fixed body; the first request to each /repos/... path gets a 429."""
+
+    throttled_paths = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            throttle = self.path.startswith('/repos/') and self.path not in self.throttled_paths
+            self.throttled_paths.add(self.path)
+        body = b'{"slow down": true}' if throttle else b'{"value": [' + b'1,' * 500 + b'1]}'
+        self.send_response(429 if throttle else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if throttle:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_server():
+    ThrottlingHandler.throttled_paths = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def get_with_retry(session, url):
+    """Minimal copy of the scanners' retry loops."""
+    for _ in range(3):
+        response = session.get(url)
+        if response.status_code != 429:
+            return response
+    return response
+
+
+def test_endpoint_templates():
+    """Identifiers in URLs are replaced so calls group per endpoint."""
+    assert endpoint_template("https://api.github.com/repos/acme/api/copilot") == '/repos/{repo}/copilot'
+    assert endpoint_template("https://api.github.com/orgs/acme/repos?per_page=100&page=7") == '/orgs/{org}/repos'
+    assert endpoint_template("https://graph.microsoft.com/v1.0/users/delta?$select=id") == '/v1.0/users/delta'
+    assert endpoint_template("https://graph.microsoft.com/v1.0/drives/b!Xy-z/items/01AB/permissions") == \
+        '/v1.0/drives/{id}/items/{id}/permissions'
+    assert endpoint_template("https://graph.microsoft.com/v1.0/drives/b!Xy-z/root/delta") == \
+        '/v1.0/drives/{id}/root/delta'
+    assert endpoint_template("https://graph.microsoft.com/v1.0/sites/contoso.sharepoint.com,1,2/drives") == \
+        '/v1.0/sites/{id}/drives'
+    assert endpoint_template("https://x.atlassian.net/rest/api/3/app/metadata?startAt=50") == \
+        '/rest/api/3/app/metadata'
+
+
+def test_sessions_record_latency_bytes_status_and_retries():
+    """Every response is timed per endpoint; throttled attempts count as retries of one request."""
+    server, base = run_server()
+    metrics = RequestMetrics()
+    session = create_session(pool_size=4, metrics=metrics)
+    try:
+        for name in ('a', 'b', 'c'):
+            assert get_with_retry(session, f"{base}/repos/acme/{name}/copilot").status_code == 200
+        for page in range(5):
+            session.get(f"{base}/users?page={page}")
+    finally:
+        server.shutdown()
+
+    copilot = metrics.endpoints[('GET', '/repos/{repo}/copilot')]
+    assert copilot.requests == 6
+    assert copilot.statuses == {200: 3, 429: 3}
+    assert copilot.retries.count == 3 and copilot.retries.sum == 3
+
+    users = metrics.endpoints[('GET', '/users')]
+    assert users.requests == 5 and users.statuses == {200: 5}
+    assert users.retries.sum == 0
+    assert users.bytes.sum == 5 * len(b'{"value": [' + b'1,' * 500 + b'1]}')
+    assert 0 < users.latency.max < 5
+
+
+def test_concurrent_workers_share_one_registry():
+    """Retries are tracked per thread, so parallel workers do not mix up attempts."""
+    server, base = run_server()
+    metrics = RequestMetrics()
+    session = create_session(pool_size=8, metrics=metrics)
+    try:
+        threads = [threading.Thread(target=get_with_retry, args=(session, f"{base}/repos/acme/r{i}/copilot"))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.shutdown()
+
+    copilot = metrics.endpoints[('GET', '/repos/{repo}/copilot')]
+    assert copilot.requests == 16
+    assert copilot.retries.count == 8 and copilot.retries.counts[1] == 8
+
+
+def test_prometheus_and_json_dumps():
+    """Dumps carry cumulative buckets, sums, counts and status counters."""
+    metrics = RequestMetrics()
+    metrics.observe('GET', 'https://api.github.com/repos/acme/api/copilot', 429, 0.02, 40, throttled=True)
+    metrics.observe('GET', 'https://api.github.com/repos/acme/api/copilot', 200, 0.3, 2000)
+
+    text = metrics.to_prometheus()
+    labels = 'method="GET",endpoint="/repos/{repo}/copilot"'
+    assert f'ai_governance_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'ai_governance_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'ai_governance_http_request_duration_seconds_count{{{labels}}} 2' in text
+    assert f'ai_governance_http_response_bytes_sum{{{labels}}} 2040' in text
+    assert f'ai_governance_http_request_retries_bucket{{{labels},le="0"}} 0' in text
+    assert f'ai_governance_http_responses_total{{{labels},status="429"}} 1' in text
+    assert '# TYPE ai_governance_http_request_duration_seconds histogram' in text
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'metrics.json')
+        metrics.write(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            endpoint = json.load(f)['endpoints'][0]
+
+    assert endpoint['endpoint'] == '/repos/{repo}/copilot' and endpoint['requests'] == 2
+    assert endpoint['statuses'] == {'200': 1, '429': 1}
+    assert endpoint['retries']['sum'] == 1
+
+
+def test_throttled_request_given_up_is_finished():
+    """A throttled response nobody retries ends its request, with its retries recorded."""
+    metrics = RequestMetrics()
+    url = 'https://api.atlassian.example/rest/api/3/app/metadata'
+    for _ in range(3):
+        metrics.observe('GET', url, 429, 0.01, 10, throttled=True)
+    # The caller gave up after three attempts and moved on
+    metrics.observe('GET', 'https://api.atlassian.example/rest/api/3/myself', 200, 0.01, 10)
+
+    apps = metrics.endpoints[('GET', '/rest/api/3/app/metadata')]
+    assert apps.retries.count == 1 and apps.retries.sum == 2
+    assert not metrics._pending
+
+    # Still pending when the metrics are read: it counts as given up too
+    metrics.observe('GET', url, 429, 0.01, 10, throttled=True)
+    assert metrics.to_json()['endpoints'][0]['retries']['count'] == 2
+    assert not metrics._pending
+
+    # Threads come and go in the pools; no per-thread state is left behind
+    threads = [threading.Thread(target=metrics.observe, args=('GET', f"{url}?t={i}", 429, 0.01, 10, True))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with redirect_stdout(io.StringIO()):
+        metrics.print_summary()
+    assert not metrics._pending and apps.retries.count == 22
+
+
+def test_reporting_metrics_reports_however_the_run_ends():
+    """The summary is printed and the dump written even when the run exits with an error."""
+    metrics = RequestMetrics()
+    metrics.observe('GET', 'https://api.github.com/repos/acme/api/copilot', 200, 0.02, 40)
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'metrics.prom')
+        try:
+            with redirect_stdout(output), reporting_metrics(path, metrics):
+                sys.exit(1)
+        except SystemExit:
+            pass
+        written = os.path.exists(path)
+
+    assert written
+    assert 'HTTP Metrics (1 requests, 1 endpoints)' in output.getvalue()
+
+
+def test_histogram_quantiles():
+    """Quantiles are interpolated within buckets and never exceed the maximum."""
+    histogram = Histogram((0.1, 0.2, 0.5))
+    for value in [0.05] * 50 + [0.15] * 45 + [0.4] * 5:
+        histogram.observe(value)
+
+    assert 0 < histogram.quantile(0.5) <= 0.1
+    assert 0.1 < histogram.quantile(0.95) <= 0.2
+    assert histogram.quantile(1.0) == 0.4
+
+
+def main():
+    print("=" * 60)
+    print("Request Metrics - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_endpoint_templates,
+        test_sessions_record_latency_bytes_status_and_retries,
+        test_concurrent_workers_share_one_registry,
+        test_prometheus_and_json_dumps,
+        test_throttled_request_given_up_is_finished,
+        test_reporting_metrics_reports_however_the_run_ends,
+        test_histogram_quantiles,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Scan Diff Test
+==============
+
+Diffs recorded scan outputs (CSV reports and findings store scans) and
+checks that only added, removed and risk-changed entities are reported.
+No network access is required.
+
+Usage:
+    python test_scan_diff.py
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+
+from findings_store import FindingsStore, PLATFORM_ATLASSIAN, PLATFORM_GITHUB
+from github_copilot_auditor import REPORT_FIELDNAMES, report_changes
+from scan_diff import diff_scans, iter_csv_rows, store_scan_rows, write_changes
+
+
+def repo(name, risk, private='Yes'):
+    return {'repo_name': name, 'is_private': private, 'copilot_enabled': 'Yes', 'risk_level': risk,
+            'url': '', 'created_at': '', 'updated_at': '', 'pushed_at': ''}
+
+
+def write_report(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def summarize(changes):
+    return sorted((c['change'], c['entity'], c['old_risk_level'], c['new_risk_level']) for c in changes)
+
+
+def test_only_changes_are_reported():
+    """Unchanged entities are left out; other column changes do not count as risk changes."""
+    old = [repo('org/same', 'LOW'), repo('org/gone', 'HIGH'), repo('org/worse', 'LOW'),
+           repo('org/renamed-field', 'HIGH', private='Yes')]
+    new = [repo('org/same', 'LOW'), repo('org/new', 'CRITICAL'), repo('org/worse', 'CRITICAL'),
+           repo('org/renamed-field', 'HIGH', private='No')]
+
+    assert summarize(diff_scans(old, new)) == [
+        ('added', 'org/new', None, 'CRITICAL'),
+        ('removed', 'org/gone', 'HIGH', None),
+        ('risk_changed', 'org/worse', 'LOW', 'CRITICAL'),
+    ]
+
+
+def test_entities_join_on_email_and_key_per_site():
+    """M365 users join on email and Atlassian rows on key within their site."""
+    old = [{'type': 'User', 'name': 'Ann', 'email': 'ann@example.com', 'risk_level': 'LOW'},
+           {'site': 'a.atlassian.net', 'type': 'Jira Add-on', 'key': 'com.x.ai', 'risk_level': 'MEDIUM'}]
+    new = [{'type': 'User', 'name': 'Ann B.', 'email': 'ann@example.com', 'risk_level': 'MEDIUM'},
+           {'site': 'a.atlassian.net', 'type': 'Jira Add-on', 'key': 'com.x.ai', 'risk_level': 'MEDIUM'},
+           {'site': 'b.atlassian.net', 'type': 'Jira Add-on', 'key': 'com.x.ai', 'risk_level': 'MEDIUM'}]
+
+    changes = list(diff_scans(old, new))
+    assert summarize(changes) == [('added', 'com.x.ai', None, 'MEDIUM'),
+                                  ('risk_changed', 'ann@example.com', 'LOW', 'MEDIUM')]
+    assert [c['site'] for c in changes if c['change'] == 'added'] == ['b.atlassian.net']
+
+
+def test_sites_with_same_display_name_stay_apart():
+    """Sites and teams join on their id, not on a display name they may share."""
+    scan = [{'type': 'SharePoint Site', 'name': 'Project', 'id': 'site-1', 'url': 'https://x/sites/p1',
+             'risk_level': 'HIGH'},
+            {'type': 'SharePoint Site', 'name': 'Project', 'id': 'site-2', 'url': 'https://x/sites/p2',
+             'risk_level': 'LOW'},
+            {'type': 'Microsoft Teams', 'name': 'Project', 'id': 'team-1', 'risk_level': 'MEDIUM'}]
+    renamed = [dict(scan[0], name='Project (old)'), dict(scan[1], risk_level='HIGH'), scan[2]]
+
+    assert list(diff_scans(scan, [dict(row) for row in scan])) == []
+    changes = list(diff_scans(scan, renamed))
+    assert summarize(changes) == [('risk_changed', 'site-2', 'LOW', 'HIGH')]
+    assert changes[0]['name'] == 'Project'
+
+
+def test_store_snapshots_default_to_latest_two():
+    """Without scan ids, the two most recent scans of the scope are compared."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = FindingsStore(os.path.join(tmp_dir, 'findings.db'))
+        store.record(PLATFORM_GITHUB, 'org', [repo('org/a', 'LOW')], scan_time='2024-06-01T00:00:00Z')
+        store.record(PLATFORM_GITHUB, 'org', [repo('org/a', 'HIGH')], scan_time='2024-06-02T00:00:00Z')
+        store.record(PLATFORM_GITHUB, 'org', [repo('org/a', 'HIGH'), repo('org/b', 'LOW')],
+                     scan_time='2024-06-03T00:00:00Z')
+        store.record(PLATFORM_ATLASSIAN, 'org', [{'key': 'k', 'risk_level': 'HIGH'}])
+
+        latest = summarize(diff_scans(*store_scan_rows(store, PLATFORM_GITHUB, 'org')))
+        first_to_last = summarize(diff_scans(*store_scan_rows(store, PLATFORM_GITHUB, 'org', old_scan=1)))
+
+    assert latest == [('added', 'org/b', None, 'LOW')]
+    assert first_to_last == [('added', 'org/b', None, 'LOW'), ('risk_changed', 'org/a', 'LOW', 'HIGH')]
+
+
+def test_jsonl_output_carries_report_row():
+    """JSON Lines output includes the full report row for alerting."""
+    output = io.StringIO()
+    counts = write_changes(diff_scans([], [repo('org/new', 'CRITICAL')]), output, 'jsonl')
+    change = json.loads(output.getvalue())
+
+    assert counts == {'added': 1, 'removed': 0, 'risk_changed': 0}
+    assert change['change'] == 'added' and change['row']['is_private'] == 'Yes'
+
+
+def test_auditor_writes_change_report():
+    """report_changes() writes REPORT_changes.csv next to the new report."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        previous = os.path.join(tmp_dir, 'audit_old.csv')
+        current = os.path.join(tmp_dir, 'audit_new.csv')
+        write_report(previous, [repo('org/a', 'LOW'), repo('org/b', 'LOW')])
+        write_report(current, [repo('org/a', 'CRITICAL'), repo('org/b', 'LOW')])
+
+        changes_file = report_changes(previous, current)
+        rows = list(iter_csv_rows(changes_file))
+
+    assert changes_file.endswith('audit_new_changes.csv')
+    assert [(r['change'], r['entity'], r['new_risk_level']) for r in rows] == [('risk_changed', 'org/a', 'CRITICAL')]
+
+
+def test_large_diff_is_one_pass():
+    """Hundreds of thousands of rows diff in one pass over each input."""
+    reads = {'old': 0, 'new': 0}
+
+    def stream(name, rows):
+        for row in rows:
+            reads[name] += 1
+            yield row
+
+    old = stream('old', (repo(f"org/r{i}", 'LOW') for i in range(200000)))
+    new = stream('new', (repo(f"org/r{i}", 'HIGH' if i % 1000 == 0 else 'LOW') for i in range(1, 200001)))
+    counts = write_changes(diff_scans(old, new), io.StringIO())
+
+    assert counts == {'added': 1, 'removed': 1, 'risk_changed': 199}
+    assert reads == {'old': 200000, 'new': 200000}
+
+
+def main():
+    print("=" * 60)
+    print("Scan Diff - Tests")
+    print("=" * 60)
+
+    tests = [
+        test_only_changes_are_reported,
+        test_entities_join_on_email_and_key_per_site,
+        test_sites_with_same_display_name_stay_apart,
+        test_store_snapshots_default_to_latest_two,
+        test_jsonl_output_carries_report_row,
+        test_auditor_writes_change_report,
+        test_large_diff_is_one_pass,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        sys.exit(1)
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Support
+============
+
+Helpers shared by the test scripts: a stand-in for requests.Response, a
+session that replays recorded responses, and run_main() to run the
+auditor's command line against the local mock GitHub API.
+
+Author: AI Governance Team
+"""
+
+import io
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from unittest import mock
+
+import requests
+
+import github_copilot_auditor
+from github_copilot_auditor import GitHubCopilotAuditor
+
+
+class RecordedResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, payload, status_code=200, headers=None, url=''):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.url = url
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class RecordedSession:
+    """Replays recorded responses in order and remembers every request."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        # (method, url, json body) for every request made
+        self.requests = []
+
+    @property
+    def urls(self):
+        return [url for _, url, _ in self.requests]
+
+    def request(self, method, url, params=None, headers=None, json=None, **kwargs):
+        self.requests.append((method.upper(), url, json))
+        response = self.responses.pop(0)
+        if isinstance(response, RecordedResponse):
+            return response
+        return RecordedResponse(response, url=url)
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        return self.request('GET', url, params=params, headers=headers, **kwargs)
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        return self.request('POST', url, headers=headers, json=json, **kwargs)
+
+
+def run_main(server_url, argv, cwd):
+    """Run the auditor's main() with argv against the mock server; returns (exit code, output)."""
+    original_init = GitHubCopilotAuditor.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.base_url = server_url
+
+    output = io.StringIO()
+    previous_dir = os.getcwd()
+    os.chdir(cwd)
+    try:
+        with mock.patch.object(GitHubCopilotAuditor, '__init__', init), \
+                mock.patch.object(sys, 'argv', ['github_copilot_auditor.py', '--token', 'mock-token'] + argv), \
+                redirect_stdout(output):
+            try:
+                github_copilot_auditor.main()
+                code = 0
+            except SystemExit as e:
+                code = e.code
+    finally:
+        os.chdir(previous_dir)
+    return code, output.getvalue()
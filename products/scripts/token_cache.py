@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Encrypted Token Cache
+=====================
+
+Persistent MSAL token cache for the Microsoft 365 checker, encrypted at
+rest so access tokens never sit on disk in clear text.
+
+The cache is encrypted with Fernet (AES-128-CBC + HMAC-SHA256, from the
+cryptography package that msal already depends on). The key is derived from
+the app's client secret with HKDF and a random per-file salt, so only
+someone holding the client secret can read the cache, and rotating the
+secret simply invalidates it.
+
+The file is written atomically (temp file + rename) with owner-only
+permissions.
+
+Author: AI Governance Team
+"""
+
+import base64
+import json
+import os
+import sys
+import threading
+from typing import Optional
+
+from msal import SerializableTokenCache
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+except ImportError:
+    print("❌ Error: cryptography library not installed. Run: pip install cryptography")
+    sys.exit(1)
+
+SALT_BYTES = 16
+
+
+def derive_key(secret: str, salt: bytes) -> bytes:
+    """Derive a Fernet key from a client secret and salt."""
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"m365-token-cache")
+    return base64.urlsafe_b64encode(hkdf.derive(secret.encode('utf-8')))
+
+
+class EncryptedTokenCache(SerializableTokenCache):
+    """MSAL token cache persisted to an encrypted file."""
+
+    def __init__(self, path: str, secret: str):
+        """
+        Initialize the cache and load it from disk if present.
+
+        A file that cannot be decrypted (e.g. after the client secret was
+        rotated) is ignored, and the cache starts empty.
+
+        Args:
+            path: Path of the encrypted cache file
+            secret: Client secret the encryption key is derived from
+        """
+        super().__init__()
+        self.path = path
+        self.secret = secret
+        self._salt: Optional[bytes] = None
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def load(self) -> bool:
+        """
+        Load the cache from disk.
+
+        Returns:
+            True if a cache was loaded, False if missing or unreadable
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            salt = base64.b64decode(stored['salt'])
+            plaintext = Fernet(derive_key(self.secret, salt)).decrypt(stored['data'].encode('ascii'))
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, InvalidToken):
+            print("   ⚠️  Ignoring unreadable token cache; a new token will be requested")
+            return False
+
+        self._salt = salt
+        self.deserialize(plaintext.decode('utf-8'))
+        return True
+
+    def save(self) -> None:
+        """Write the cache to disk atomically if it changed since the last save."""
+        with self._save_lock:
+            if not self.has_state_changed:
+                return
+
+            if self._salt is None:
+                self._salt = os.urandom(SALT_BYTES)
+            token = Fernet(derive_key(self.secret, self._salt)).encrypt(self.serialize().encode('utf-8'))
+            stored = {
+                'salt': base64.b64encode(self._salt).decode('ascii'),
+                'data': token.decode('ascii')
+            }
+
+            tmp_path = f"{self.path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+            self.has_state_changed = False
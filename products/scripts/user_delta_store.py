@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+User Delta Store
+================
+
+Local cache of a tenant's Microsoft Graph user/license table, kept up to
+date with Graph delta queries (/users/delta).
+
+The first sync pages through every user and ends with a deltaLink. The
+deltaLink is saved alongside the user table, so later runs only fetch the
+users that were added, changed or removed since, and merge them in.
+
+The file is written atomically (temp file + rename) so a crash while saving
+never corrupts it.
+
+Author: AI Governance Team
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class UserDeltaStore:
+    """Cached user table and deltaLink for one tenant."""
+
+    def __init__(self, path: str, tenant_id: str):
+        """
+        Initialize an empty store.
+
+        Args:
+            path: Path of the JSON state file
+            tenant_id: Azure AD tenant the users belong to
+        """
+        self.path = path
+        self.tenant_id = tenant_id
+
+        self.delta_link: Optional[str] = None
+        self.users: Dict[str, Dict] = {}
+        self.synced_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: str, tenant_id: str) -> "UserDeltaStore":
+        """
+        Load the store saved by a previous run, or start an empty one.
+
+        Args:
+            path: Path of the JSON state file
+            tenant_id: Azure AD tenant; must match the saved state
+
+        Returns:
+            The restored (or empty) store
+
+        Raises:
+            ValueError: If the saved state belongs to a different tenant
+        """
+        store = cls(path, tenant_id)
+        if not os.path.exists(path):
+            return store
+
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        if state.get('tenant_id') != tenant_id:
+            raise ValueError(
+                f"delta state is for tenant '{state.get('tenant_id')}', not '{tenant_id}'"
+            )
+
+        store.delta_link = state.get('delta_link')
+        store.users = state.get('users', {})
+        store.synced_at = state.get('synced_at')
+        return store
+
+    def reset(self) -> None:
+        """Forget the deltaLink and user table so the next sync starts from scratch."""
+        self.delta_link = None
+        self.users = {}
+
+    def apply(self, changes: Iterable[Dict]) -> Tuple[int, int]:
+        """
+        Merge one page of delta results into the user table.
+
+        Removed users carry an '@removed' annotation and are dropped. Other
+        entries are upserted; a changed user may only include the properties
+        that changed, so they are merged over the cached record.
+
+        Args:
+            changes: User objects from a /users/delta response page
+
+        Returns:
+            (upserted, removed) counts
+        """
+        upserted = removed = 0
+        for user in changes:
+            user_id = user.get('id')
+            if not user_id:
+                continue
+
+            if '@removed' in user:
+                if self.users.pop(user_id, None) is not None:
+                    removed += 1
+                continue
+
+            record = self.users.setdefault(user_id, {})
+            record.update({k: v for k, v in user.items() if not k.startswith('@')})
+            upserted += 1
+
+        return upserted, removed
+
+    def save(self) -> None:
+        """Write the store to disk atomically."""
+        state = {
+            'tenant_id': self.tenant_id,
+            'delta_link': self.delta_link,
+            'synced_at': self.synced_at,
+            'users': self.users
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)